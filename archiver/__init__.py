@@ -0,0 +1,6 @@
+# One archiver engine for the daily, backup, historical and infinite runs;
+# the differences between them live in archiver.profiles.
+from archiver.engine import archive_tweets
+from archiver.profiles import PROFILES, get_profile
+
+__all__ = ["archive_tweets", "PROFILES", "get_profile"]
@@ -0,0 +1,29 @@
+import argparse
+
+from archiver.engine import archive_tweets
+from archiver.profiles import PROFILES
+
+# python -m archiver historical --hours 72 --db ../dbs/tweets_test.db
+def main():
+    parser = argparse.ArgumentParser(prog="python -m archiver", description="Archive the deck timeline")
+    parser.add_argument("profile", nargs="?", default="daily", choices=sorted(PROFILES))
+    parser.add_argument("--hours", type=float, dest="cutoff_hours", help="archive this many hours back")
+    parser.add_argument("--db", dest="db_path", help="archive DB path")
+    parser.add_argument("--url", help="deck/timeline URL")
+    parser.add_argument("--ingest", choices=["dom", "graphql"], help="read tweets from the DOM or the GraphQL responses")
+    parser.add_argument("--scroll-pixels", type=int)
+    parser.add_argument("--scroll-pause", type=float)
+    parser.add_argument("--fresh", dest="resume", action="store_false", default=None,
+                        help="ignore the saved checkpoint and archive from the top down to the cutoff")
+    parser.add_argument("--incremental", action=argparse.BooleanOptionalAction, default=None,
+                        help="stop after --stop-after-known consecutive already-archived tweets")
+    parser.add_argument("--stop-after-known", type=int)
+    parser.add_argument("--refresh-hours", type=float, help="refresh metrics of known tweets younger than this")
+    parser.add_argument("--shard-hours", type=float, help="backfill in windows this long, several at a time")
+    parser.add_argument("--parallel", type=int, dest="parallel_shards", help="windows archived at the same time")
+    parser.add_argument("--query", dest="search_query", help="search the shards run, e.g. 'list:123' or 'from:user'")
+    args = vars(parser.parse_args())
+    archive_tweets(args.pop("profile"), **args)
+
+if __name__ == "__main__":
+    main()
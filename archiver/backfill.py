@@ -0,0 +1,152 @@
+from datetime import datetime, timedelta, timezone
+import asyncio
+
+from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
+
+from dedup import RotatingBloomFilter, SeenIds
+from runtime import AsyncScroller, Runtime, extract_articles_async
+from archiver.extract import parse_tweet_time
+from archiver.log import get_logger
+from archiver.shards import Shard, plan_shards
+from archiver.store import archive_columns, init_db, is_archived, store_tweet
+from archiver.writer import ArchiveWriter
+
+log = get_logger("engine")
+
+# The one writer every shard hands its tweets to. Lives on the runtime's DB
+# thread (the connection is opened there), drops tweets another shard
+# already stored this run, and saves shard progress in each flush
+# transaction so a crash never leaves a shard ahead of its rows.
+class BackfillWriter:
+    def __init__(self, db_path, original_poster=False):
+        self.conn, _ = init_db(db_path, original_poster)
+        Shard.init_table(self.conn)
+        self.writer = ArchiveWriter(self.conn, archive_columns(original_poster), on_flush=self._save_shards)
+        # IDs that fell out of memory are confirmed against the rows already flushed
+        self.seen = SeenIds(max_size=50_000, bloom=RotatingBloomFilter(capacity=1_000_000),
+                            fallback=lambda tweet_id: is_archived(self.conn, tweet_id))
+        self.dirty = set()
+        self.duplicates = 0
+
+    def _save_shards(self, conn):
+        for shard in self.dirty:
+            shard.save(conn)
+        self.dirty.clear()
+
+    def add(self, shard, tweets):
+        """Queue one shard's tweets; returns how many were new to this run"""
+        added = 0
+        for tweet in tweets:
+            shard.extend(tweet["created_at"])
+            if tweet["id"] in self.seen:
+                self.duplicates += 1
+                continue
+            self.seen.add(tweet["id"])
+            store_tweet(self.writer, tweet)
+            added += 1
+        if tweets:
+            self.dirty.add(shard)
+        self.writer.tick()
+        return added
+
+    def finish(self, shard, done=True):
+        """Flush and save the shard's progress; `done` only once its scan
+        crossed the window start, so an unfinished window is retried"""
+        shard.done = done
+        self.dirty.add(shard)
+        if not self.writer.flush():
+            with self.conn:
+                self._save_shards(self.conn)
+
+    def close(self):
+        self.writer.close()
+        self.conn.close()
+
+# Archive one window from its search page until the scan scrolls past the
+# window's start. If the page stops loading first (rate limit, slow search,
+# or simply nothing older) the progress is saved but the window stays open
+# for the next run.
+async def archive_shard(runtime, writer, shard, settings):
+    page = await runtime.open_page("archiver", shard.url(settings["search_url"], settings["search_query"]),
+                                   storage_state=settings["session_file"] or None)
+    try:
+        try:
+            await page.wait_for_selector("article", timeout=15000)
+        except PlaywrightTimeoutError:
+            log.warning("%s: no results loaded; left for the next run", shard)
+            return
+
+        await page.mouse.move(400, 300)  # wheel events go to the results under the pointer
+        scroller = AsyncScroller(page, step=settings["scroll_pixels"], wait_ms=settings["scroll_pause"] * 1000,
+                                 max_wait_ms=settings["recovery_pause"] * 1000)
+        seen = set()
+        added = 0
+        past_window = False
+        while scroller.stalls < settings["stall_limit"]:
+            tweets = []
+            for tweet in await extract_articles_async(page):
+                if not tweet["id"] or tweet["id"] in seen:
+                    continue
+                seen.add(tweet["id"])
+                tweet_time = parse_tweet_time(tweet["created_at"])
+                if tweet_time is None or tweet_time >= shard.until:
+                    continue
+                if tweet_time < shard.since:
+                    past_window = True
+                    continue
+                tweet["created_at"] = tweet_time
+                tweets.append(tweet)
+            added += await runtime.db(writer.add, shard, tweets)
+            if past_window:
+                break
+            await scroller.scroll()
+
+        await runtime.db(writer.finish, shard, past_window)
+        if past_window:
+            log.info("%s: %d tweets (%d new)", shard, len(seen), added)
+        else:
+            log.warning("%s: results stopped loading before the window start; %d tweets (%d new) saved, "
+                        "left for the next run", shard, len(seen), added)
+    finally:
+        await runtime.close_page(page)
+
+async def run_backfill(settings):
+    profile = settings["profile"]
+    if not settings["cutoff_hours"]:
+        raise ValueError("A sharded backfill needs cutoff_hours")
+    end = datetime.now(timezone.utc)
+    start = end - timedelta(hours=settings["cutoff_hours"])
+
+    async with async_playwright() as p:
+        runtime = await Runtime.start(p)
+        writer = await runtime.db(BackfillWriter, settings["db_path"], settings["original_poster"])
+        try:
+            saved = await runtime.db(Shard.load_all, writer.conn, profile) if settings["resume"] else {}
+            shards = plan_shards(profile, start, end, settings["shard_hours"], saved)
+            todo = [shard for shard in shards if not shard.done]
+            log.info("Backfill %s: %d shards of %sh from %s, %d left, %d at a time",
+                     profile, len(shards), settings["shard_hours"], start, len(todo), settings["parallel_shards"])
+
+            slots = asyncio.Semaphore(settings["parallel_shards"])
+
+            async def run(shard):
+                async with slots:
+                    try:
+                        await archive_shard(runtime, writer, shard, settings)
+                    except Exception as e:
+                        # Progress so far is saved; the next run resumes the shard
+                        log.error("%s failed: %s", shard, e)
+
+            await asyncio.gather(*(run(shard) for shard in todo))
+        finally:
+            await runtime.db(writer.close)
+            await runtime.close()
+
+    finished = sum(shard.done for shard in shards)
+    log.info("Backfill finished: %d/%d shards done, %d tweets written, %d duplicates dropped",
+             finished, len(shards), writer.writer.written, writer.duplicates)
+    return shards
+
+def backfill(settings):
+    """Run a sharded backfill (profile with shard_hours set) to completion"""
+    return asyncio.run(run_backfill(settings))
@@ -0,0 +1,91 @@
+from datetime import datetime, timezone
+
+from db import TS_FORMAT
+
+# The contiguous stretch of timeline a profile has archived, newest to oldest,
+# plus the GraphQL bottom cursor at the oldest end when that path is in use.
+# Saved in the archive DB by the writer's flush (same transaction as the rows
+# it covers), so a crash never leaves the checkpoint ahead of the data.
+class Checkpoint:
+    def __init__(self, profile, newest_time=None, newest_id=None,
+                 oldest_time=None, oldest_id=None, cursor=None):
+        self.profile = profile
+        self.newest_time = newest_time
+        self.newest_id = newest_id
+        self.oldest_time = oldest_time
+        self.oldest_id = oldest_id
+        self.cursor = cursor
+
+    def __repr__(self):
+        return f"Checkpoint({self.profile}: {self.newest_time} .. {self.oldest_time})"
+
+    @staticmethod
+    def init_table(conn):
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS archive_checkpoints (
+                profile TEXT PRIMARY KEY,
+                newest_time TEXT,
+                newest_id TEXT,
+                oldest_time TEXT,
+                oldest_id TEXT,
+                cursor TEXT,
+                updated_at TEXT
+            )
+        """)
+        conn.commit()
+
+    @classmethod
+    def load(cls, conn, profile):
+        row = conn.execute("""
+            SELECT newest_time, newest_id, oldest_time, oldest_id, cursor
+            FROM archive_checkpoints WHERE profile = ?
+        """, (profile,)).fetchone()
+        if not row or not row[0] or not row[2]:
+            return None
+        return cls(profile, _parse(row[0]), row[1], _parse(row[2]), row[3], row[4])
+
+    @classmethod
+    def from_tweets(cls, conn, profile):
+        """The span of created_at already in the tweets table, taken as archived"""
+        oldest, newest = conn.execute("SELECT MIN(created_at), MAX(created_at) FROM tweets").fetchone()
+        if not newest:
+            return None
+        return cls(profile, _parse(newest), None, _parse(oldest), None)
+
+    def save(self, conn):
+        """Write the checkpoint; the caller owns the transaction"""
+        if self.newest_time is None:
+            return
+        conn.execute("""
+            INSERT OR REPLACE INTO archive_checkpoints
+                (profile, newest_time, newest_id, oldest_time, oldest_id, cursor, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, (self.profile, self.newest_time.strftime(TS_FORMAT), self.newest_id,
+              self.oldest_time.strftime(TS_FORMAT), self.oldest_id, self.cursor,
+              datetime.now(timezone.utc).strftime(TS_FORMAT)))
+
+    def extend(self, tweet_time, tweet_id, cursor=None):
+        """Widen the range to include one archived tweet"""
+        if self.newest_time is None or tweet_time > self.newest_time:
+            self.newest_time, self.newest_id = tweet_time, tweet_id
+        if self.oldest_time is None or tweet_time < self.oldest_time:
+            self.oldest_time, self.oldest_id = tweet_time, tweet_id
+            if cursor:
+                self.cursor = cursor
+
+    def overlaps(self, tweet_time, tweet_id=None):
+        """True once the timeline reaches this range from above"""
+        return tweet_id == self.newest_id or tweet_time <= self.newest_time
+
+    def covers(self, tweet_time):
+        return self.oldest_time <= tweet_time <= self.newest_time
+
+    def merge(self, newer):
+        """Join a range archived above this one (that ran into it) onto it"""
+        if newer.newest_time and newer.newest_time > self.newest_time:
+            self.newest_time, self.newest_id = newer.newest_time, newer.newest_id
+        return self
+
+# Stored times are canonical UTC strings
+def _parse(value):
+    return datetime.strptime(value, TS_FORMAT).replace(tzinfo=timezone.utc)
@@ -0,0 +1,298 @@
+from playwright.sync_api import sync_playwright
+from datetime import datetime, timezone, timedelta
+import logging
+
+from browser_host import DESKTOP_CONTEXT, open_page
+from config import INGEST_MODE
+from dedup import SeenIds
+from graphql import TimelineInterceptor, resume_at_cursor
+from scrolling import ScrollController
+from archiver.backfill import backfill
+from archiver.checkpoint import Checkpoint
+from archiver.extract import read_articles
+from archiver.log import configure, get_logger
+from archiver.profiles import get_profile
+from archiver.scroll import careful_scroll, force_load, scroll_past_last, scroll_to_top, seek_past
+from archiver.store import archive_columns, init_db, is_archived, store_tweet
+from archiver.writer import ArchiveWriter
+
+log = get_logger("engine")
+
+TIMELINE_SELECTORS = [
+    '[data-testid="cellInnerDiv"]',  # Standard timeline
+    'article',                        # Tweet articles
+    '[data-testid="tweet"]',         # Alternative tweet marker
+    'div[role="main"]',              # Main content area
+    '.timeline-item'                  # Another possible timeline class
+]
+
+AUTH_SELECTORS = [
+    'input[autocomplete="username"]',  # Login form
+    'input[name="text"]',             # Another login field
+    '[data-testid="login-button"]'    # Login button
+]
+
+def open_timeline(page, settings):
+    """Load the deck and wait for the timeline. Returns False if it never shows up."""
+    log.info("Loading timeline...")
+    if not settings["diagnose_load"]:
+        page.goto(settings["url"], timeout=60000)
+        page.wait_for_selector('[data-testid="cellInnerDiv"]', timeout=15000)
+        page.wait_for_selector('article', timeout=15000)
+        return True
+
+    page.set_default_timeout(60000)  # 60 seconds for all operations
+    try:
+        try:
+            response = page.goto(settings["url"], timeout=20000)
+            log.debug("Initial page load complete with status: %s", response.status)
+        except Exception as e:
+            log.debug("Initial page load timed out: %s", e)
+
+        # Wait for network to settle with a shorter timeout
+        try:
+            page.wait_for_load_state('networkidle', timeout=10000)
+            log.debug("Network is idle")
+        except Exception as e:
+            log.debug("Network not idle: %s", e)
+
+        # Wait a moment for any post-load JavaScript
+        page.wait_for_timeout(5000)
+        log.debug("Page title: %s", page.title())
+
+        if log.isEnabledFor(logging.DEBUG):
+            for selector in TIMELINE_SELECTORS + AUTH_SELECTORS:
+                log.debug("Found %d elements matching '%s'", page.locator(selector).count(), selector)
+
+        # Check if we're logged in
+        for selector in AUTH_SELECTORS:
+            if page.locator(selector).count() > 0:
+                log.error("Not authenticated - login form detected; please ensure your session file is valid")
+                return False
+
+        # Try to find timeline content
+        for selector in TIMELINE_SELECTORS:
+            try:
+                if page.wait_for_selector(selector, timeout=10000):
+                    log.debug("Successfully found timeline using selector: %s", selector)
+                    return True
+            except Exception:
+                continue
+
+        log.error("Could not find timeline content with any known selector")
+        log.debug("Current page HTML: %.1000s...", page.content())
+    except Exception as e:
+        log.error("Failed while checking authentication: %s", e)
+    return False
+
+def seek_past_checkpoint(page, scroller, interceptor, checkpoint):
+    """Jump below an already-archived range: replay its saved GraphQL cursor
+    when there is one, otherwise scroll down without extracting"""
+    if interceptor and checkpoint.cursor:
+        log.info("Resuming from the saved timeline cursor")
+        resume_at_cursor(page, checkpoint.cursor)
+        interceptor.drain()
+        page.reload(timeout=60000)
+        try:
+            page.wait_for_selector('article', timeout=15000)
+            return True
+        except Exception as e:
+            log.warning("Saved cursor did not load (%s); seeking by scrolling instead", e)
+            page.reload(timeout=60000)
+            page.wait_for_selector('article', timeout=15000)
+    return seek_past(scroller, checkpoint.oldest_time)
+
+def archive_tweets(profile="daily", **overrides):
+    """Archive the deck timeline according to a profile (see archiver.profiles)"""
+    settings = get_profile(profile, **overrides)
+    configure(defaults=settings["log_levels"])
+    if settings["shard_hours"]:
+        return backfill(settings)
+    ingest = settings.get("ingest") or INGEST_MODE
+    conn, c = init_db(settings["db_path"], settings["original_poster"])
+    Checkpoint.init_table(conn)
+    writer = ArchiveWriter(conn, archive_columns(settings["original_poster"]))
+    seen_ids = SeenIds(max_size=20_000)  # bounded: the timeline only re-renders recent articles
+
+    start_time = datetime.now(timezone.utc)
+    cutoff_hours = settings["cutoff_hours"]
+    cutoff_time = start_time - timedelta(hours=cutoff_hours) if cutoff_hours else None
+    log.info("Profile: %s (%s)", profile, settings["db_path"])
+    log.info("Current time: %s", start_time)
+    if cutoff_time:
+        log.info("Cutoff time: %s", cutoff_time)
+
+    # `previous` is what earlier runs already archived; `archived` is the
+    # range this run persists. Until the run reaches `previous` its rows sit
+    # above a gap, so only a fresh range is checkpointed as it grows.
+    previous = Checkpoint.load(conn, profile) if settings["resume"] else None
+    if previous is None and settings["incremental"]:
+        # No checkpoint yet (e.g. a DB from the old scripts): trust what is stored
+        previous = Checkpoint.from_tweets(conn, profile)
+    if previous and cutoff_time and previous.newest_time < cutoff_time:
+        log.info("Checkpoint %s is older than the cutoff; starting fresh", previous)
+        previous = None
+    if previous:
+        log.info("Already archived %s back to %s; will stop or seek on reaching it",
+                 previous.newest_time, previous.oldest_time)
+    archived = Checkpoint(profile)
+    merged = False
+
+    # The previous range only counts as reached after this many consecutive
+    # known tweets: a repost of an archived tweet keeps its original ID and
+    # created_at, so a single match can sit above new tweets. Known tweets
+    # younger than refresh_hours are re-stored to refresh their metrics and
+    # scrolled through regardless
+    stop_after_known = settings["stop_after_known"]
+    refresh_after = start_time - timedelta(hours=settings["refresh_hours"]) if settings["refresh_hours"] else None
+    consecutive_known = 0
+    refreshed = 0
+    new_tweets = 0
+    if previous is None:
+        writer.on_flush = archived.save
+
+    with sync_playwright() as p:
+        browser, context, page = open_page(p, storage_state=settings["session_file"] or None, tool="archiver", **DESKTOP_CONTEXT)
+        interceptor = TimelineInterceptor().attach(page) if ingest == "graphql" else None
+        if settings["log_requests"]:
+            def log_request(request):
+                if 'graphql' in request.url or 'api' in request.url:
+                    log.debug("Request: %s %s", request.method, request.url)
+            page.on('request', log_request)
+
+        try:
+            if not open_timeline(page, settings):
+                return
+
+            # Force scroll to top to ensure we start fresh
+            scroll_to_top(page)
+            scroller = ScrollController(
+                page, step=settings["scroll_pixels"], wait_ms=settings["scroll_pause"] * 1000,
+                max_wait_ms=settings["recovery_pause"] * 1000, scroll_fn=scroll_past_last)
+            scroller.wait_for_content(timeout_ms=3000)
+
+            log.info("Starting tweet collection...")
+            oldest_seen_time = datetime.now(timezone.utc)
+            oldest_archived_time = datetime.now(timezone.utc)
+            last_progress_time = oldest_seen_time
+            stalled_scrolls = 0
+            scroll_attempts = 0
+            hit_cutoff = False
+            reached_previous = False
+
+            while not hit_cutoff:
+                found_new_tweet = False
+                scroll_attempts += 1
+                log.debug("Scroll attempt %d", scroll_attempts)
+
+                # JSON ingestion gives exact counts with no DOM queries;
+                # otherwise read every loaded article in one evaluate call
+                tweets = interceptor.drain() if interceptor else read_articles(page, seen_ids)
+                for tweet in tweets:
+                    tweet_id = tweet["id"]
+                    tweet_time = tweet["created_at"]
+                    if not tweet_id or tweet_id in seen_ids:
+                        continue
+                    if not tweet_time:
+                        log.debug("Skipping tweet %s with no timestamp", tweet_id)
+                        continue
+
+                    # Always track the oldest tweet we've seen
+                    oldest_seen_time = min(oldest_seen_time, tweet_time)
+
+                    # Reposts carry their original created_at, so a time match
+                    # alone is not enough: the tweet must already be stored,
+                    # and it takes a streak of them to reach the previous run
+                    if previous and previous.overlaps(tweet_time, tweet_id) and is_archived(conn, tweet_id):
+                        consecutive_known += 1
+                        seen_ids.add(tweet_id)
+                        if refresh_after and tweet_time >= refresh_after:
+                            store_tweet(writer, tweet)
+                            refreshed += 1
+                        elif consecutive_known >= stop_after_known:
+                            reached_previous = True
+                        if not reached_previous:
+                            continue
+                    elif previous:
+                        consecutive_known = 0
+
+                    if reached_previous:
+                        # Reached the previous run: everything from here down
+                        # to its oldest tweet is already in the DB
+                        reached_previous = False
+                        archived = previous.merge(archived)
+                        previous = None
+                        merged = True
+                        writer.flush()
+                        with conn:
+                            archived.save(conn)
+                        writer.on_flush = archived.save
+                        if cutoff_time and archived.oldest_time <= cutoff_time:
+                            log.info("Caught up with the previous run at %s; done", tweet_time)
+                            hit_cutoff = True
+                        else:
+                            log.info("Reached the previous run at %s; seeking past %s",
+                                     tweet_time, archived.oldest_time)
+                            if not seek_past_checkpoint(page, scroller, interceptor, archived):
+                                hit_cutoff = True
+                        break
+                    if merged and archived.covers(tweet_time):
+                        continue  # inside the range we seeked past
+
+                    if cutoff_time and tweet_time < cutoff_time:
+                        if settings["on_cutoff"] == "stop":
+                            log.info("Success! Archived tweets back to %s", cutoff_time)
+                            hit_cutoff = True
+                            break
+                        log.debug("Tweet %s is too old (before %s)", tweet_id, cutoff_time)
+                        continue
+
+                    # Track this tweet as archived
+                    oldest_archived_time = min(oldest_archived_time, tweet_time)
+                    seen_ids.add(tweet_id)
+                    found_new_tweet = True
+                    archived.extend(tweet_time, tweet_id, interceptor.cursor if interceptor else None)
+                    store_tweet(writer, tweet)
+                    new_tweets += 1
+
+                if hit_cutoff:
+                    break
+
+                # Check if we're making progress
+                if found_new_tweet and oldest_seen_time < last_progress_time:
+                    if cutoff_time:
+                        hours_back = (last_progress_time - oldest_seen_time).total_seconds() / 3600
+                        hours_to_go = (oldest_seen_time - cutoff_time).total_seconds() / 3600
+                        log.info("Progress: went back %.1fh, %.1fh more to go", hours_back, hours_to_go)
+                    else:
+                        hours_back = (start_time - oldest_seen_time).total_seconds() / 3600
+                        log.info("Progress: archived back to %s (%.1fh ago)", oldest_seen_time, hours_back)
+                    last_progress_time = oldest_seen_time
+                    stalled_scrolls = 0
+                else:
+                    stalled_scrolls += 1
+                    reason = "No progress in time" if found_new_tweet else "No new tweets"
+                    log.info("%s (%d scrolls stalled)", reason, stalled_scrolls)
+
+                # If we're truly stuck (no scrolling progress AND no new tweets)
+                if stalled_scrolls >= settings["stall_limit"]:
+                    log.warning("Completely stuck, trying to force-load more content...")
+                    force_load(page)
+                    scroller.wait_for_content(timeout_ms=settings["recovery_pause"] * 1000)
+                    stalled_scrolls = 0
+
+                writer.tick()
+
+                # Scroll and wait for the next batch (or back off if none comes);
+                # in graphql mode the responses arrive while this waits
+                log.debug("Scrolling... (oldest seen: %s)", oldest_seen_time)
+                careful_scroll(scroller)
+
+            log.info("Finished archiving tweets")
+            log.info("Total tweets archived: %d new, %d known tweets refreshed", new_tweets, refreshed)
+            log.info("Oldest archived tweet: %s", oldest_archived_time)
+            log.info("Oldest seen tweet: %s", oldest_seen_time)
+        finally:
+            writer.close()
+            browser.close()
+            conn.close()
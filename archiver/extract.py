@@ -0,0 +1,121 @@
+from datetime import datetime
+import logging
+
+from archiver.log import get_logger
+from extraction import extract_articles
+from metrics import read_metrics
+
+log = get_logger("extract")
+
+def extract_tweet_id(article):
+    """Extract tweet ID from article"""
+    try:
+        # More efficient selector that only gets status links
+        link = article.locator('a[href*="/status/"]').first
+        if link:
+            href = link.get_attribute('href', timeout=5000)
+            if href:
+                return href.split('/')[-1]
+    except Exception:
+        pass
+    return None
+
+def extract_tweet_time(article):
+    """Extract timestamp from a tweet article (one round trip, no waiting)"""
+    try:
+        datetime_str = article.locator('time[datetime]').evaluate_all(
+            "els => els.length ? els[0].getAttribute('datetime') : null")
+    except Exception as e:
+        log.warning("Failed to read time[datetime]: %s", e)
+        return None
+    tweet_time = parse_tweet_time(datetime_str)
+    # The HTML dump costs another round trip, so only pay for it when asked
+    if tweet_time is None and log.isEnabledFor(logging.DEBUG):
+        log.debug("No valid timestamp (datetime=%r): %.500s", datetime_str, article.inner_html())
+    return tweet_time
+
+def extract_tweet_text(article):
+    """Extract tweet text content"""
+    try:
+        # Only get first text block with timeout
+        text = article.locator("div[lang]").first.inner_text(timeout=5000)
+        return text.strip()
+    except Exception:
+        return ""
+
+def extract_user_handle(article):
+    """Extract user handle from article"""
+    try:
+        handle_elem = article.locator("a[role='link'] span").first
+        return handle_elem.inner_text(timeout=5000) if handle_elem else "unknown"
+    except Exception:
+        return "unknown"
+
+def extract_original_poster(article):
+    """Extract original poster's handle for reposts"""
+    try:
+        # First check if this is a repost
+        repost_elem = article.locator('div[data-testid="socialContext"]:has-text("Reposted")').first
+        if not repost_elem:
+            return None
+
+        # Get the handle from the link in the User-Name section
+        handle = article.locator('div[data-testid="User-Name"] div[dir="ltr"] > span > span').first
+        if handle:
+            text = handle.text_content(timeout=1000)
+            if text and 'reposted' not in text.lower():
+                return text
+        return None
+    except Exception:
+        return None
+
+def parse_tweet_time(datetime_str):
+    """Parse a time[datetime] value into an aware UTC datetime"""
+    if not datetime_str:
+        return None
+    # Handle Twitter's timestamp format
+    if not datetime_str.endswith('Z') and not '+' in datetime_str:
+        datetime_str += '+00:00'
+    try:
+        return datetime.fromisoformat(datetime_str.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+
+def read_articles_per_locator(page, seen_ids):
+    """Fallback: extract unseen articles one locator call at a time"""
+    tweets = []
+    articles = page.locator("article")
+    for j in range(articles.count()):
+        try:
+            article = articles.nth(j)
+            tweet_id = extract_tweet_id(article)
+            if not tweet_id or tweet_id in seen_ids:
+                continue
+            tweet = {
+                "id": tweet_id,
+                "created_at": extract_tweet_time(article),
+                "user": extract_user_handle(article),
+                "original_poster": extract_original_poster(article),
+                "text": extract_tweet_text(article),
+                "metrics": read_metrics(article),
+            }
+            log.debug("Article %s by %s at %s: %s", tweet_id, tweet["user"], tweet["created_at"], tweet["metrics"])
+            tweets.append(tweet)
+        except Exception as e:
+            log.error("Failed to process article: %s", e)
+    return tweets
+
+def read_articles(page, seen_ids):
+    """All loaded, unseen articles as tweet dicts, in one evaluate call"""
+    try:
+        tweets = extract_articles(page)
+    except Exception as e:
+        log.warning("Batch extraction failed, falling back to locators: %s", e)
+        return read_articles_per_locator(page, seen_ids)
+    unseen = []
+    for tweet in tweets:
+        if not tweet["id"] or tweet["id"] in seen_ids:
+            continue
+        tweet["created_at"] = parse_tweet_time(tweet["created_at"])
+        unseen.append(tweet)
+    return unseen
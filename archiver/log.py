@@ -0,0 +1,78 @@
+import json
+import logging
+import os
+import sys
+
+# Leveled logging for the archiver, one logger per subsystem:
+#   archiver.engine   run progress, cutoff, stalls
+#   archiver.extract  per-article extraction (debug is per article, keep it off)
+#   archiver.scroll   scroll/recovery attempts
+#   archiver.writer   buffered flushes
+#
+# Levels come from config.ARCHIVER_LOG_LEVELS, then the profile's log_levels,
+# then the ARCHIVER_LOG env var, e.g. ARCHIVER_LOG="info,extract=debug" (a
+# bare level sets the default). ARCHIVER_LOG_FORMAT=json emits one JSON object per line.
+SUBSYSTEMS = ("engine", "extract", "scroll", "writer")
+ROOT = "archiver"
+
+class TagFormatter(logging.Formatter):
+    """[ENGINE] message, as the print-based logs looked; warnings and errors get the level too"""
+    def format(self, record):
+        tag = record.name.rsplit(".", 1)[-1].upper()
+        if record.levelno >= logging.WARNING:
+            tag = f"{tag} {record.levelname}"
+        message = f"[{tag}] {record.getMessage()}"
+        if record.exc_info:
+            message += "\n" + self.formatException(record.exc_info)
+        return message
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            "ts": self.formatTime(record, "%Y-%m-%d %H:%M:%S"),
+            "level": record.levelname.lower(),
+            "subsystem": record.name.rsplit(".", 1)[-1],
+            "msg": record.getMessage(),
+        }
+        entry.update(getattr(record, "fields", {}))
+        return json.dumps(entry, default=str)
+
+def get_logger(subsystem):
+    return logging.getLogger(f"{ROOT}.{subsystem}")
+
+def parse_levels(spec):
+    """'info,extract=debug' -> {'archiver': 'INFO', 'extract': 'DEBUG'}"""
+    levels = {}
+    for part in (spec or "").split(","):
+        part = part.strip()
+        if not part:
+            continue
+        name, _, level = part.rpartition("=")
+        levels[name.strip() or ROOT] = level.strip().upper()
+    return levels
+
+def configure(levels=None, defaults=None, stream=None, fmt=None):
+    """Install the archiver handler and apply per-subsystem levels; safe to call again"""
+    from config import ARCHIVER_LOG_LEVELS
+
+    merged = {ROOT: "INFO"}
+    merged.update(ARCHIVER_LOG_LEVELS)
+    merged.update(defaults or {})
+    merged.update(parse_levels(os.environ.get("ARCHIVER_LOG")))
+    merged.update(levels or {})
+
+    root = logging.getLogger(ROOT)
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    handler = logging.StreamHandler(stream or sys.stdout)
+    fmt = fmt or os.environ.get("ARCHIVER_LOG_FORMAT", "text")
+    handler.setFormatter(JsonFormatter() if fmt == "json" else TagFormatter())
+    root.addHandler(handler)
+    root.propagate = False
+
+    root.setLevel(merged.pop(ROOT))
+    for name in SUBSYSTEMS:
+        get_logger(name).setLevel(merged.pop(name, logging.NOTSET))
+    if merged:
+        root.warning("Unknown archiver log subsystems: %s", ", ".join(merged))
+    return root
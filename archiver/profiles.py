@@ -0,0 +1,109 @@
+import os
+
+from config import DECK_URL, LIST_URL, SESSION_FILE
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))  # repo root
+DBS_DIR = os.path.abspath(os.path.join(BASE_DIR, "..", "dbs"))
+
+
+# Settings shared by every profile; each profile below only lists what differs.
+#   cutoff_hours      how far back to archive (None = run until stopped)
+#   on_cutoff         "stop" ends the run at the first tweet older than the
+#                     cutoff, "skip" ignores old tweets and keeps scrolling
+#   scroll_pixels     initial scroll step (scrolling.ScrollController adapts it)
+#   scroll_pause      seconds to wait for new articles after a scroll before
+#                     backing off; returns early once they arrive
+#   recovery_pause    longest wait after backoff or a force-load
+#   original_poster   also capture the original author of reposts
+#   diagnose_load     run page/auth/timeline checks while loading (slow)
+#   log_requests      log every graphql/api request the page makes (debug)
+#   log_levels        per-subsystem log levels, see archiver/log.py
+#   resume            use the saved checkpoint to stop at / seek past what
+#                     earlier runs archived (see archiver/checkpoint.py)
+#   stop_after_known  consecutive already-stored tweets that count as reaching
+#                     the previous range (one alone may be a repost of an old
+#                     tweet near the top)
+#   incremental       with no checkpoint, take the span of created_at in the
+#                     DB as already archived
+#   refresh_hours     re-store known tweets younger than this to refresh
+#                     their metrics (None = leave them alone)
+#   ingest            "dom" or "graphql" (None = config.INGEST_MODE)
+#   session_file      saved login state new browser contexts start from
+#   shard_hours       split the cutoff range into windows this long and
+#                     archive each from its own search page, see
+#                     archiver/backfill.py (None = one scroll down the deck)
+#   parallel_shards   how many windows are archived at the same time
+#   search_url        search page the shards load
+#   search_query      what the shards search for, narrowed to each window
+DEFAULTS = {
+    "db_path": os.path.join(DBS_DIR, "tweets_overnight.db"),
+    "url": DECK_URL,
+    "cutoff_hours": 28,
+    "on_cutoff": "stop",
+    "scroll_pixels": 500,
+    "scroll_pause": 2,
+    "recovery_pause": 5,
+    "stall_limit": 20,
+    "original_poster": False,
+    "diagnose_load": False,
+    "log_requests": False,
+    "ingest": None,
+    "log_levels": {},
+    "resume": True,
+    "incremental": False,
+    "stop_after_known": 20,
+    "refresh_hours": None,
+    "session_file": SESSION_FILE,
+    "shard_hours": None,
+    "parallel_shards": 4,
+    "search_url": "https://x.com/search",
+    "search_query": f"list:{LIST_URL.rstrip('/').split('/')[-1]}",
+}
+
+PROFILES = {
+    # Nightly run over the last 28 hours (was daily_archiver.py)
+    "daily": {
+        "original_poster": True,
+        "incremental": True,
+    },
+    # 120-day backfill (was daily_archiver_historical.py)
+    "historical": {
+        "cutoff_hours": 24 * 120,
+        "on_cutoff": "skip",
+        "scroll_pixels": 1000,
+        "scroll_pause": 3,
+    },
+    # The same 120 days as historical, in one-day windows archived four at a time
+    "backfill": {
+        "cutoff_hours": 24 * 120,
+        "shard_hours": 24,
+        "scroll_pixels": 1500,
+        "scroll_pause": 2,
+        "recovery_pause": 10,
+        "stall_limit": 6,
+    },
+    # Archive continuously into a separate DB (was daily_archiver_one_off.py)
+    "infinite": {
+        "db_path": os.path.join(DBS_DIR, "tweets_infinite.db"),
+        "cutoff_hours": None,
+        "scroll_pixels": 1000,
+        "scroll_pause": 3,
+        "recovery_pause": 3,
+        "diagnose_load": True,
+        "log_requests": True,
+        "log_levels": {"engine": "DEBUG"},
+    },
+    # 25-hour fallback run (was daily_archiver_backup.py)
+    "backup": {
+        "cutoff_hours": 25,
+    },
+}
+
+# Resolve a profile name into a full settings dict; None overrides are ignored
+def get_profile(name, **overrides):
+    if name not in PROFILES:
+        raise ValueError(f"Unknown archiver profile '{name}' (choose from {', '.join(PROFILES)})")
+    settings = dict(DEFAULTS, **PROFILES[name])
+    settings.update({key: value for key, value in overrides.items() if value is not None})
+    settings["profile"] = name
+    return settings
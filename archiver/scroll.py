@@ -0,0 +1,85 @@
+from archiver.extract import parse_tweet_time
+from archiver.log import get_logger
+
+log = get_logger("scroll")
+
+# Bring the last loaded article into view; the wheel then nudges past it
+SCROLL_PAST_LAST_JS = """
+() => {
+    const articles = document.querySelectorAll('article');
+    if (!articles.length) return false;
+    articles[articles.length - 1].scrollIntoView({ block: 'end' });
+    return true;
+}
+"""
+
+def scroll_past_last(page, pixels):
+    """ScrollController scroll_fn for the deck timeline"""
+    if not page.evaluate(SCROLL_PAST_LAST_JS):
+        log.debug("No articles found to scroll to")
+    page.mouse.wheel(0, pixels)
+
+def careful_scroll(scroller):
+    """Scroll one step and wait for the timeline to load more; False on a stall"""
+    try:
+        result = scroller.scroll()
+    except Exception as e:
+        log.error("Failed to scroll: %s", e)
+        return False
+    if result:
+        log.debug("Scrolled %dpx: %d new articles after %.0fms", result.step, result.new_items, result.waited_ms)
+    else:
+        log.debug("No new articles after %.0fms (%d stalls)", result.waited_ms, scroller.stalls)
+    return bool(result)
+
+# Timestamp of the last loaded article, without extracting anything else
+LAST_ARTICLE_TIME_JS = """
+() => {
+    const times = document.querySelectorAll('article time[datetime]');
+    return times.length ? times[times.length - 1].getAttribute('datetime') : null;
+}
+"""
+
+def seek_past(scroller, target_time, pixels=3000, max_stalls=5):
+    """Scroll quickly, reading only the last article's time, until the timeline
+    is loaded back past target_time. Returns False if it stops loading first."""
+    oldest = None
+    scroller.reset()
+    while scroller.stalls < max_stalls:
+        oldest = parse_tweet_time(scroller.page.evaluate(LAST_ARTICLE_TIME_JS))
+        if oldest and oldest <= target_time:
+            log.info("Seeked past %s (now at %s)", target_time, oldest)
+            scroller.reset()
+            return True
+        log.debug("Seeking: at %s, target %s", oldest, target_time)
+        scroller.scroll(pixels)
+    log.warning("Timeline stopped loading at %s while seeking to %s", oldest, target_time)
+    return False
+
+def scroll_to_top(page):
+    """Force every candidate timeline container back to the top"""
+    page.evaluate("""
+        () => {
+            window.scrollTo(0, 0);
+            const containers = [
+                document.querySelector('[data-testid="primaryColumn"]'),
+                document.querySelector('div[aria-label*="Timeline"]'),
+                document.querySelector('div[role="main"]'),
+                document.querySelector('main')
+            ];
+            for (const container of containers) {
+                if (container) container.scrollTop = 0;
+            }
+        }
+    """)
+
+def force_load(page):
+    """Try to trigger Twitter's infinite scroll loader when we're stuck"""
+    page.evaluate("""
+        () => {
+            const timeline = document.querySelector('[data-testid="primaryColumn"]');
+            if (timeline) {
+                timeline.scrollTop = timeline.scrollHeight;
+            }
+        }
+    """)
@@ -0,0 +1,103 @@
+from datetime import datetime, timedelta, timezone
+from urllib.parse import urlencode
+
+from db import TS_FORMAT
+
+# One time window of a sharded backfill, archived newest to oldest from its
+# own search page. `oldest_time` is how far down the window the archived rows
+# reach; a resumed shard searches from there down. A shard is only done once
+# its scan reached a tweet older than `since`, so its search has no lower
+# bound. Saved in the archive DB by the writer's flush, in the same
+# transaction as the rows.
+class Shard:
+    def __init__(self, profile, since, until, oldest_time=None, archived=0, done=False):
+        self.profile = profile
+        self.since = since
+        self.until = until
+        self.oldest_time = oldest_time
+        self.archived = archived
+        self.done = done
+
+    def __repr__(self):
+        state = "done" if self.done else f"at {self.oldest_time}" if self.oldest_time else "new"
+        return f"Shard({self.since:%Y-%m-%d %H:%M} .. {self.until:%Y-%m-%d %H:%M}, {state})"
+
+    @property
+    def remaining_until(self):
+        return self.oldest_time or self.until
+
+    def contains(self, tweet_time):
+        return self.since <= tweet_time < self.until
+
+    def extend(self, tweet_time):
+        self.archived += 1
+        if self.oldest_time is None or tweet_time < self.oldest_time:
+            self.oldest_time = tweet_time
+
+    def url(self, base, query):
+        """Search URL for the part of the window not archived yet and what
+        lies below it (the first tweet older than the window ends the scan)"""
+        q = f"{query} until_time:{int(self.remaining_until.timestamp())}"
+        return f"{base}?{urlencode({'q': q, 'src': 'typed_query', 'f': 'live'})}"
+
+    @staticmethod
+    def init_table(conn):
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS archive_shards (
+                profile TEXT,
+                since TEXT,
+                until TEXT,
+                oldest_time TEXT,
+                archived INTEGER DEFAULT 0,
+                done INTEGER DEFAULT 0,
+                updated_at TEXT,
+                PRIMARY KEY (profile, since)
+            )
+        """)
+        conn.commit()
+
+    @classmethod
+    def load_all(cls, conn, profile):
+        """Saved shards of a profile, keyed by window start"""
+        rows = conn.execute("""
+            SELECT since, until, oldest_time, archived, done
+            FROM archive_shards WHERE profile = ?
+        """, (profile,)).fetchall()
+        return {_parse(row[0]): cls(profile, _parse(row[0]), _parse(row[1]),
+                                    _parse(row[2]) if row[2] else None, row[3], bool(row[4]))
+                for row in rows}
+
+    def save(self, conn):
+        """Write the shard state; the caller owns the transaction"""
+        conn.execute("""
+            INSERT OR REPLACE INTO archive_shards
+                (profile, since, until, oldest_time, archived, done, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, (self.profile, self.since.strftime(TS_FORMAT), self.until.strftime(TS_FORMAT),
+              self.oldest_time.strftime(TS_FORMAT) if self.oldest_time else None,
+              self.archived, int(self.done), datetime.now(timezone.utc).strftime(TS_FORMAT)))
+
+def plan_shards(profile, start, end, window_hours, saved=None):
+    """Windows of `window_hours` covering [start, end), newest first.
+
+    Window edges sit on a fixed UTC grid, so a later run lines up with the
+    shards an earlier one saved and picks those up. The newest window is cut
+    at `end`; once a later run extends it, it is archived again from scratch.
+    """
+    saved = saved or {}
+    window = timedelta(hours=window_hours)
+    epoch = datetime(1970, 1, 1, tzinfo=timezone.utc)
+    since = epoch + ((start - epoch) // window) * window
+    shards = []
+    while since < end:
+        until = min(since + window, end)
+        previous = saved.get(since)
+        if previous and previous.until == until:
+            shards.append(previous)
+        else:
+            shards.append(Shard(profile, since, until))
+        since += window
+    return list(reversed(shards))
+
+def _parse(value):
+    return datetime.strptime(value, TS_FORMAT).replace(tzinfo=timezone.utc)
@@ -0,0 +1,67 @@
+from datetime import datetime, timezone
+
+from archiver.log import get_logger
+from db import connect
+
+log = get_logger("writer")
+
+def init_db(db_path, original_poster=False):
+    """Open the archive DB and make sure the tweets table exists"""
+    conn = connect(db_path)
+    c = conn.cursor()
+
+    c.execute("""
+        CREATE TABLE IF NOT EXISTS tweets (
+            tweet_id TEXT PRIMARY KEY,
+            user_handle TEXT,
+            text TEXT,
+            created_at TEXT,
+            likes INTEGER DEFAULT 0,
+            reposts INTEGER DEFAULT 0,
+            replies INTEGER DEFAULT 0,
+            views INTEGER DEFAULT 0,
+            collected_at TEXT
+        );
+    """)
+
+    # created_at bounds incremental runs (MIN/MAX) and the refresh window
+    c.execute("CREATE INDEX IF NOT EXISTS idx_tweets_created_at ON tweets(created_at)")
+
+    # Add the original_poster column to tables created without it
+    if original_poster:
+        c.execute("PRAGMA table_info(tweets)")
+        columns = [col[1] for col in c.fetchall()]
+        if 'original_poster' not in columns:
+            c.execute("ALTER TABLE tweets ADD COLUMN original_poster TEXT")
+
+    conn.commit()
+    return conn, c
+
+def archive_columns(original_poster=False):
+    columns = ["tweet_id", "user_handle", "text", "created_at", "likes", "reposts", "replies", "views", "collected_at"]
+    if original_poster:
+        columns.insert(2, "original_poster")
+    return columns
+
+def is_archived(conn, tweet_id):
+    """Whether a tweet was stored by an earlier flush"""
+    return conn.execute("SELECT 1 FROM tweets WHERE tweet_id = ?", (tweet_id,)).fetchone() is not None
+
+def store_tweet(writer, tweet):
+    """Queue one archived tweet on the buffered writer"""
+    tweet_time = tweet["created_at"]
+    metrics = tweet["metrics"]
+    collected_at = datetime.now(timezone.utc)
+    writer.add({
+        "tweet_id": tweet["id"],
+        "user_handle": tweet["user"],
+        "original_poster": tweet.get("original_poster"),
+        "text": tweet["text"],
+        "created_at": tweet_time.strftime('%Y-%m-%d %H:%M:%S'),
+        "likes": metrics["likes"],
+        "reposts": metrics["retweets"],
+        "replies": metrics["replies"],
+        "views": metrics["views"],
+        "collected_at": collected_at.strftime('%Y-%m-%d %H:%M:%S'),
+    })
+    log.debug("Queued tweet %s from %s", tweet["id"], tweet_time)
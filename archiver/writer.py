@@ -0,0 +1,77 @@
+import atexit
+import time
+
+from archiver.log import get_logger
+
+log = get_logger("writer")
+
+# Buffers archived rows and writes them with executemany, one transaction per
+# flush. A flush happens every `flush_count` rows, when the oldest buffered row
+# is `flush_seconds` old, and on close / interpreter exit, so a crash loses at
+# most that bounded tail. `on_flush(conn)`, if set, runs inside each flush
+# transaction (e.g. to save a checkpoint alongside the rows it covers).
+class ArchiveWriter:
+    def __init__(self, conn, columns, table="tweets", flush_count=200, flush_seconds=5.0, on_flush=None):
+        self.conn = conn
+        self.on_flush = on_flush
+        self.columns = list(columns)
+        self.flush_count = flush_count
+        self.flush_seconds = flush_seconds
+        self.sql = (
+            f"INSERT OR REPLACE INTO {table} ({', '.join(self.columns)}) "
+            f"VALUES ({', '.join('?' * len(self.columns))})"
+        )
+        self.rows = []
+        self.first_buffered = None
+        self.written = 0
+        self.closed = False
+        atexit.register(self.close)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # Add one row, given as a dict keyed by column name
+    def add(self, row):
+        self.rows.append(tuple(row.get(column) for column in self.columns))
+        if self.first_buffered is None:
+            self.first_buffered = time.monotonic()
+        if self.due():
+            self.flush()
+
+    def due(self):
+        if not self.rows:
+            return False
+        return (len(self.rows) >= self.flush_count
+                or time.monotonic() - self.first_buffered >= self.flush_seconds)
+
+    # Flush if the time limit passed; call this from loops that may go quiet
+    def tick(self):
+        if self.due():
+            self.flush()
+
+    def flush(self):
+        if not self.rows:
+            return 0
+        rows = self.rows
+        with self.conn:
+            self.conn.executemany(self.sql, rows)
+            if self.on_flush:
+                self.on_flush(self.conn)
+        self.rows = []
+        self.first_buffered = None
+        self.written += len(rows)
+        log.info("Flushed %d tweets to the database", len(rows))
+        return len(rows)
+
+    def close(self):
+        if self.closed:
+            return
+        try:
+            self.flush()
+        except Exception as e:
+            log.error("Failed to flush %d buffered tweets: %s", len(self.rows), e)
+        self.closed = True
+        atexit.unregister(self.close)
@@ -0,0 +1,63 @@
+"""Archiver write throughput: the old INSERT OR REPLACE + commit per tweet vs.
+the buffered ArchiveWriter, on a temp DB opened through db.connect().
+
+    python benchmarks/bench_archive_writes.py [tweets]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from common import report
+
+from archiver.writer import ArchiveWriter
+from db import connect
+
+SCHEMA = """
+    CREATE TABLE tweets (
+        tweet_id TEXT PRIMARY KEY, user_handle TEXT, original_poster TEXT, text TEXT,
+        created_at TEXT, likes INTEGER DEFAULT 0, reposts INTEGER DEFAULT 0,
+        replies INTEGER DEFAULT 0, views INTEGER DEFAULT 0, collected_at TEXT
+    )
+"""
+COLUMNS = ["tweet_id", "user_handle", "original_poster", "text", "created_at",
+           "likes", "reposts", "replies", "views", "collected_at"]
+
+def rows(n):
+    for i in range(n):
+        yield {"tweet_id": str(1915000000000000000 + i), "user_handle": "bench", "original_poster": None,
+               "text": "x" * 180, "created_at": "2025-05-01 12:00:00", "likes": i, "reposts": i,
+               "replies": i, "views": i, "collected_at": "2025-05-02 03:00:00"}
+
+def per_row_commit(conn, n):
+    sql = f"INSERT OR REPLACE INTO tweets ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})"
+    for row in rows(n):
+        conn.execute(sql, tuple(row[column] for column in COLUMNS))
+        conn.commit()
+
+def buffered(conn, n):
+    with ArchiveWriter(conn, COLUMNS) as writer:
+        for row in rows(n):
+            writer.add(row)
+
+def main(n=5000):
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, fn, journal in (("per-row commit (rollback journal)", per_row_commit, "DELETE"),
+                                  ("per-row commit (WAL)", per_row_commit, "WAL"),
+                                  ("ArchiveWriter (WAL)", buffered, "WAL")):
+            conn = connect(os.path.join(tmp, f"{len(results)}.db"))
+            conn.execute(f"PRAGMA journal_mode = {journal}")
+            if journal == "DELETE":
+                conn.execute("PRAGMA synchronous = FULL")
+            conn.execute(SCHEMA)
+            start = time.perf_counter()
+            fn(conn, n)
+            elapsed = time.perf_counter() - start
+            count = conn.execute("SELECT COUNT(*) FROM tweets").fetchone()[0]
+            results.append((name, f"{n / elapsed:,.0f} tweets/s ({count} rows)"))
+            conn.close()
+    report(f"Archiving {n:,} tweets", results)
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
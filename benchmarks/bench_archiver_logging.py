@@ -0,0 +1,83 @@
+"""Per-article cost of the archiver's locator extraction path with the extract
+logger at INFO vs DEBUG, next to the old print-heavy extract_tweet_time.
+
+    python benchmarks/bench_archiver_logging.py [article_count]
+
+Log output goes to os.devnull so the numbers include formatting and the
+write, but not the terminal.
+"""
+import os
+import sys
+from datetime import datetime
+
+from common import RoundTripCounter, fixture_url, report, time_ms
+from playwright.sync_api import sync_playwright
+
+from archiver import extract
+from archiver.log import configure
+
+# extract_tweet_time as it was: three selectors, two reads per element with a
+# 5s timeout each, a debug print per step and an HTML dump on failure
+def legacy_extract_tweet_time(article):
+    try:
+        link = article.locator('a[href*="/status/"]').first
+        tweet_id = link.get_attribute('href').split('/')[-1]
+        print(f"\n[TIME DEBUG] Extracting time for tweet {tweet_id}:")
+        for selector in ('time[datetime]', 'time', '[datetime]'):
+            elements = article.locator(selector).all()
+            print(f"[TIME DEBUG] Found {len(elements)} elements matching '{selector}'")
+            for idx, element in enumerate(elements):
+                datetime_str = element.get_attribute('datetime', timeout=5000)
+                visible_text = element.inner_text(timeout=5000)
+                print(f"[TIME DEBUG] Element {idx}: datetime='{datetime_str}' text='{visible_text}'")
+                if datetime_str:
+                    tweet_time = datetime.fromisoformat(datetime_str.replace('Z', '+00:00'))
+                    print(f"[TIME DEBUG] Successfully parsed: {tweet_time} (UTC)")
+                    return tweet_time
+        print(f"[TIME DEBUG] {article.inner_html()[:500]}...")
+    except Exception as e:
+        print(f"[TIME DEBUG] Fatal error: {e}")
+    return None
+
+def main(article_count=100):
+    devnull = open(os.devnull, "w")
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=True)
+        page = browser.new_page()
+        page.goto(fixture_url("deck.html", n=article_count))
+        page.wait_for_selector("article")
+
+        def per_locator():
+            return extract.read_articles_per_locator(page, set())
+
+        def time_only(fn):
+            articles = page.locator("article")
+            return lambda: [fn(articles.nth(i)) for i in range(article_count)]
+
+        rows = []
+        cases = [
+            ("time, legacy prints", "INFO", time_only(legacy_extract_tweet_time)),
+            ("time, debug off", "INFO", time_only(extract.extract_tweet_time)),
+            ("time, debug on", "DEBUG", time_only(extract.extract_tweet_time)),
+            ("full article, debug off", "INFO", per_locator),
+            ("full article, debug on", "DEBUG", per_locator),
+        ]
+        stdout = sys.stdout
+        for name, level, fn in cases:
+            configure(levels={"extract": level}, stream=devnull)
+            sys.stdout = devnull  # the legacy path prints directly
+            try:
+                with RoundTripCounter() as counter:
+                    fn()
+                ms = time_ms(fn, repeat=3)
+            finally:
+                sys.stdout = stdout
+            rows.append((name, f"{ms / article_count:.2f} ms/article, "
+                               f"{counter.calls / article_count:.1f} round trips/article"))
+
+        report(f"Archiver extraction over {article_count} articles", rows)
+        browser.close()
+    devnull.close()
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100)
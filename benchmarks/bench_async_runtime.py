@@ -0,0 +1,126 @@
+"""CPU and memory of N sync Playwright processes (one browser each, the way
+scraper/updater/archivers run today) vs. one asyncio process driving N pages
+of one browser (runtime.py), doing the same scroll-and-extract loop on the
+infinite-scroll fixture.
+
+    python benchmarks/bench_async_runtime.py [pages] [seconds] [latency_ms]
+
+Both setups run as child processes; once every page has extracted its first
+batch, CPU seconds (user + system) and PSS of the whole process tree,
+Chromium included, are sampled over `seconds`. Linux only (/proc).
+"""
+import asyncio
+import json
+import signal
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from common import cpu_seconds, fixture_url, memory_mb, process_tree, report
+
+SCRIPT = str(Path(__file__).resolve())
+
+def fixture(latency):
+    return fixture_url("infinite_scroll.html", batch=20, latency=latency, jitter=latency // 2,
+                       total=1_000_000, keep=80)
+
+def stop_on_sigterm():
+    stopping = []
+    signal.signal(signal.SIGTERM, lambda *_: stopping.append(True))
+    return stopping
+
+# One of today's tools: its own Playwright, browser and page
+def sync_worker(latency):
+    from playwright.sync_api import sync_playwright
+    from extraction import extract_articles
+    from scrolling import ScrollController
+
+    stopping = stop_on_sigterm()
+    seen = set()
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=True)
+        page = browser.new_page(viewport={"width": 1280, "height": 900})
+        page.goto(fixture(latency))
+        page.wait_for_selector("article")
+        page.mouse.move(400, 300)
+        scroller = ScrollController(page, step=1000, wait_ms=1000, request_filter=None)
+        seen.update(tweet["id"] for tweet in extract_articles(page))
+        print("ready", flush=True)
+        while not stopping:
+            scroller.scroll()
+            seen.update(tweet["id"] for tweet in extract_articles(page))
+        browser.close()
+    print(json.dumps({"articles": len(seen)}), flush=True)
+
+# runtime.py's shape: one loop, one browser, a context per page
+async def async_worker(pages, latency):
+    from playwright.async_api import async_playwright
+    from runtime import AsyncScroller, extract_articles_async
+
+    stopping = asyncio.Event()
+    asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, stopping.set)
+    seen = set()
+    ready = []
+
+    async def loop(browser):
+        context = await browser.new_context(viewport={"width": 1280, "height": 900})
+        page = await context.new_page()
+        await page.goto(fixture(latency))
+        await page.wait_for_selector("article")
+        await page.mouse.move(400, 300)
+        scroller = AsyncScroller(page, step=1000, wait_ms=1000)
+        seen.update(tweet["id"] for tweet in await extract_articles_async(page))
+        ready.append(page)
+        if len(ready) == pages:
+            print("ready", flush=True)
+        while not stopping.is_set():
+            await scroller.scroll()
+            seen.update(tweet["id"] for tweet in await extract_articles_async(page))
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        await asyncio.gather(*(loop(browser) for _ in range(pages)))
+        await browser.close()
+    print(json.dumps({"articles": len(seen)}), flush=True)
+
+def measure(commands, seconds):
+    procs = [subprocess.Popen(command, stdout=subprocess.PIPE, text=True) for command in commands]
+    for proc in procs:
+        for line in proc.stdout:
+            if line.strip() == "ready":
+                break
+    tree = process_tree()[1:]  # without this process
+    cpu_start, start = cpu_seconds(tree), time.perf_counter()
+    time.sleep(seconds)
+    cpu, elapsed = cpu_seconds(tree) - cpu_start, time.perf_counter() - start
+    tree = process_tree()[1:]
+    memory = memory_mb(tree)
+
+    articles = 0
+    for proc in procs:
+        proc.terminate()
+        for line in proc.stdout:
+            if line.startswith("{"):
+                articles += json.loads(line)["articles"]
+        proc.wait()
+    return (f"{cpu / elapsed * 100:.0f}% CPU, {memory:.0f} MB, "
+            f"{len(tree)} processes, {articles} articles read")
+
+def main(pages=4, seconds=30, latency=300):
+    rows = [
+        (f"{pages} sync processes", measure(
+            [[sys.executable, SCRIPT, "--sync-worker", str(latency)] for _ in range(pages)], seconds)),
+        (f"1 async process, {pages} pages", measure(
+            [[sys.executable, SCRIPT, "--async-worker", str(pages), str(latency)]], seconds)),
+    ]
+    report(f"Multi-process vs async runtime, {pages} pages for {seconds}s", rows)
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["--sync-worker"]:
+        sync_worker(int(sys.argv[2]))
+    elif sys.argv[1:2] == ["--async-worker"]:
+        asyncio.run(async_worker(int(sys.argv[2]), int(sys.argv[3])))
+    else:
+        args = [int(arg) for arg in sys.argv[1:4]]
+        main(*args)
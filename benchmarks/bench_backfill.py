@@ -0,0 +1,96 @@
+"""Sharded backfill (archiver/backfill.py) against a local server that serves
+windowed search timelines: wall time with 1 vs N windows in parallel, and a
+run interrupted part-way then resumed from its shard checkpoints. Every run
+is checked for completeness against the tweets the fixture holds.
+
+    python benchmarks/bench_backfill.py [days] [parallel] [interval_s]
+
+The fixture has one tweet every `interval_s` seconds; each window is one day.
+"""
+import asyncio
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+from common import FIXTURES_DIR, report
+
+from archiver import get_profile
+from archiver.backfill import run_backfill
+from archiver.log import configure
+
+class Handler(SimpleHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        if self.path.startswith("/search/"):
+            self.path = "/search_timeline.html"
+        super().do_GET()
+
+def serve():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), partial(Handler, directory=str(FIXTURES_DIR)))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def expected_tweets(shards, interval):
+    total = 0
+    for shard in shards:
+        since, until = int(shard.since.timestamp()), int(shard.until.timestamp())
+        total += len(range(-(-since // interval) * interval, until, interval))
+    return total
+
+def stored_tweets(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute("SELECT COUNT(*) FROM tweets").fetchone()[0]
+    finally:
+        conn.close()
+
+def run(settings, timeout=None):
+    start = time.perf_counter()
+    try:
+        shards = asyncio.run(asyncio.wait_for(run_backfill(settings), timeout))
+    except asyncio.TimeoutError:
+        shards = None
+    return shards, time.perf_counter() - start
+
+def main(days=14, parallel=4, interval=600):
+    configure(levels={"archiver": "WARNING"})
+    server = serve()
+    workdir = tempfile.mkdtemp(prefix="bench_backfill_")
+
+    def settings(name, parallel_shards):
+        return get_profile("backfill", db_path=os.path.join(workdir, f"{name}.db"), cutoff_hours=24 * days,
+                           search_url=f"http://127.0.0.1:{server.server_address[1]}/search/{interval}",
+                           parallel_shards=parallel_shards, session_file="", scroll_pause=1, stall_limit=3)
+
+    def describe(name, shards, elapsed):
+        stored = stored_tweets(os.path.join(workdir, f"{name}.db"))
+        expected = expected_tweets(shards, interval)
+        status = "complete" if stored == expected else f"MISSING {expected - stored}"
+        return f"{elapsed:.1f}s, {stored}/{expected} tweets ({status}), {sum(s.done for s in shards)}/{len(shards)} shards"
+
+    rows = []
+    for name, count in (("serial", 1), ("parallel", parallel)):
+        shards, elapsed = run(settings(name, count))
+        rows.append((f"{count} window(s) at a time", describe(name, shards, elapsed)))
+
+    # Stop a run about halfway through the parallel time, then resume it
+    first_pass = max(5.0, elapsed / 2)
+    _, interrupted = run(settings("resume", parallel), timeout=first_pass)
+    partial_count = stored_tweets(os.path.join(workdir, "resume.db"))
+    shards, elapsed = run(settings("resume", parallel))
+    rows.append((f"interrupted after {interrupted:.0f}s", f"{partial_count} tweets stored"))
+    rows.append(("resumed", describe("resume", shards, elapsed)))
+
+    server.shutdown()
+    report(f"Sharded backfill, {days} one-day windows, a tweet every {interval}s", rows)
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:4]]
+    main(*args)
@@ -0,0 +1,90 @@
+"""Memory and startup time of N tools each launching their own Chromium vs.
+N contexts in one shared browser (browser_host.py).
+
+    python benchmarks/bench_browser_host.py [workers] [port]
+
+Each worker is this script re-run with --worker: it opens the deck fixture
+through browser_host.open_page(), reports how long that took, and stays alive
+until every worker is up so the Chromium memory is measured with all of them
+open. Memory is the summed PSS (RSS where smaps_rollup is unavailable) of
+the Chromium processes under this one, read from /proc, so Linux only.
+"""
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from common import fixture_url, is_chromium, memory_mb, process_tree, report
+from playwright.sync_api import sync_playwright
+
+import browser_host
+
+SCRIPT = str(Path(__file__).resolve())
+
+def worker(mode, port):
+    start = time.perf_counter()
+    with sync_playwright() as p:
+        browser, context, page = browser_host.open_page(
+            p, storage_state=None, port=port, use_host=(mode == "shared"))
+        page.goto(fixture_url("deck.html", n=50))
+        page.wait_for_selector("article")
+        articles = page.locator("article").count()
+        print(json.dumps({"startup_ms": (time.perf_counter() - start) * 1000,
+                          "articles": articles}), flush=True)
+        sys.stdin.readline()  # held open until the parent has measured
+        context.close()
+        browser.close()
+
+def run(mode, count, port):
+    host = None
+    if mode == "shared":
+        host = subprocess.Popen([sys.executable, SCRIPT, "--host", str(port)],
+                                stdout=subprocess.DEVNULL)
+        if not browser_host.wait_for_host(port):
+            host.kill()
+            raise RuntimeError(f"browser host did not come up on port {port}")
+
+    start = time.perf_counter()
+    workers = [subprocess.Popen([sys.executable, SCRIPT, "--worker", mode, str(port)],
+                                stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+               for _ in range(count)]
+    results = []
+    for proc in workers:
+        # Skip the [HOST] line open_page prints before the result
+        for line in proc.stdout:
+            if line.startswith("{"):
+                results.append(json.loads(line))
+                break
+    all_up_ms = (time.perf_counter() - start) * 1000
+    memory = memory_mb(pid for pid in process_tree() if is_chromium(pid))
+
+    for proc in workers:
+        proc.stdin.write("\n")
+        proc.stdin.close()
+        proc.wait()
+    if host:
+        host.terminate()
+        host.wait()
+
+    startup = sorted(r["startup_ms"] for r in results)
+    return (f"{memory:.0f} MB Chromium, startup median {startup[len(startup) // 2]:.0f} ms, "
+            f"all {count} up in {all_up_ms:.0f} ms")
+
+def main(count=4, port=9333):
+    if browser_host.host_info(port):
+        sys.exit(f"Something already answers on port {port}; pass another port")
+    rows = [
+        (f"{count} private browsers", run("private", count, port)),
+        (f"{count} contexts, shared host", run("shared", count, port)),
+    ]
+    report(f"Browser per tool vs shared host ({count} tools)", rows)
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["--worker"]:
+        worker(sys.argv[2], int(sys.argv[3]))
+    elif sys.argv[1:2] == ["--host"]:
+        browser_host.serve(int(sys.argv[2]))
+    else:
+        main(int(sys.argv[1]) if len(sys.argv) > 1 else 4,
+             int(sys.argv[2]) if len(sys.argv) > 2 else 9333)
@@ -0,0 +1,89 @@
+"""Multi-process write contention on a temp DB: one scraper-like process
+inserting new tweets and several updater-like processes writing metrics,
+with the old connection setup vs. the tuned db.connect() factory. A reader
+process plays the notebook.
+
+    python benchmarks/bench_db_contention.py [seconds] [updaters]
+"""
+import multiprocessing
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+from common import report
+
+# What db.py used to do: default rollback journal, 5s lock timeout
+def legacy_connect(path=None, readonly=False):
+    import db
+    conn = sqlite3.connect(path or db.DB_PATH, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+def worker(role, path, mode, seconds, results, worker_id):
+    os.environ["TWEETS_DB_PATH"] = path
+    import db
+    if mode == "legacy":
+        db.connect = legacy_connect
+
+    ops = errors = 0
+    deadline = time.time() + seconds
+    n = 0
+    while time.time() < deadline:
+        try:
+            if role == "scraper":
+                db.insert_new_tweets([{"id": f"{worker_id}-{n}-{i}", "user": "bench", "text": "x" * 200}
+                                      for i in range(20)])
+            elif role == "updater":
+                due = db.get_tweets_to_update(hours_back=24, limit=50)
+                db.update_tweet_metrics_bulk([(t["tweet_id"], {"likes": n, "retweets": 1, "replies": 1, "views": n})
+                                              for t in due])
+            else:
+                db.get_conn(readonly=(mode != "legacy")).execute(
+                    "SELECT COUNT(*), MAX(t_offset) FROM tweet_metrics").fetchone()
+            ops += 1
+        except sqlite3.OperationalError:
+            errors += 1
+        n += 1
+    results.put((role, ops, errors))
+
+def run(mode, seconds, updaters):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, f"{mode}.db")
+        os.environ["TWEETS_DB_PATH"] = path
+        import db
+        db.DB_PATH = path
+        if mode == "legacy":
+            db.connect = legacy_connect
+        db.init_db()
+        db.close_conn()
+
+        results = multiprocessing.Queue()
+        roles = ["scraper"] + ["updater"] * updaters + ["reader"]
+        procs = [multiprocessing.Process(target=worker, args=(role, path, mode, seconds, results, i))
+                 for i, role in enumerate(roles)]
+        for proc in procs:
+            proc.start()
+        totals = {}
+        for _ in procs:
+            role, ops, errors = results.get()
+            done, failed = totals.get(role, (0, 0))
+            totals[role] = (done + ops, failed + errors)
+        for proc in procs:
+            proc.join()
+        return totals
+
+def main(seconds=10, updaters=2):
+    multiprocessing.set_start_method("spawn")
+    rows = []
+    for mode in ("legacy", "tuned"):
+        totals = run(mode, seconds, updaters)
+        summary = ", ".join(f"{role} {ops / seconds:.0f} ops/s ({errors} locked)"
+                            for role, (ops, errors) in sorted(totals.items()))
+        rows.append((mode, summary))
+    report(f"{seconds}s contention run, 1 scraper + {updaters} updaters + 1 reader", rows)
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:3]]
+    main(*args)
@@ -0,0 +1,58 @@
+"""Tweets covered per update cycle by the old flat scan (page-wide article
+list, tallest container only) vs. DeckScanner (all columns read and scrolled
+together), on the virtualised multi-column deck fixture.
+
+    python benchmarks/bench_deck_coverage.py [columns] [articles_per_column] [scans]
+"""
+import sys
+import time
+
+from common import fixture_url, report
+from playwright.sync_api import sync_playwright
+
+from deck import DeckScanner
+from extraction import extract_articles
+from scrolling import scroll_container
+
+def flat_cycle(page, scans):
+    covered = set()
+    for _ in range(scans):
+        covered.update(tweet["id"] for tweet in extract_articles(page))
+        scroll_container(page, "down", 2000)
+        page.wait_for_timeout(100)
+    return covered
+
+def deck_cycle(page, scans):
+    deck = DeckScanner(page, step=2000, wait_ms=300, max_wait_ms=600)
+    covered = set()
+    for _ in range(scans):
+        covered.update(tweet["id"] for tweet in deck.scan())
+        deck.scroll()
+    return covered, deck
+
+def main(columns=4, n=150, scans=12):
+    url = fixture_url("big_deck.html", columns=columns, n=n, filler=5000, window=30)
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=True)
+        page = browser.new_page(viewport={"width": 1920, "height": 1080})
+
+        rows = []
+        page.goto(url)
+        page.wait_for_selector("article")
+        start = time.perf_counter()
+        covered = flat_cycle(page, scans)
+        rows.append(("flat scan", f"{len(covered)} of {columns * n} tweets in {time.perf_counter() - start:.1f}s"))
+
+        page.goto(url)
+        page.wait_for_selector("article")
+        start = time.perf_counter()
+        covered, deck = deck_cycle(page, scans)
+        rows.append(("DeckScanner", f"{len(covered)} of {columns * n} tweets in {time.perf_counter() - start:.1f}s"))
+        rows.append(("columns", deck.summary()))
+
+        report(f"Coverage after {scans} scans of a {columns}-column deck", rows)
+        browser.close()
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:4]]
+    main(*args)
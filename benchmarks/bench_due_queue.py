@@ -0,0 +1,63 @@
+"""get_tweets_to_update on a 1M-row tweets table. Asserts via EXPLAIN QUERY
+PLAN that the due query is an index search (no table scan, no temp sort)
+and reports query latency.
+
+    python benchmarks/bench_due_queue.py [rows]
+"""
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from common import report
+
+def seed(db, rows):
+    conn = db.get_conn()
+    now = datetime.utcnow()
+    batch = []
+    for i in range(rows):
+        # Most tweets are weeks old; the last 2000 are inside the 24h window
+        age = timedelta(minutes=i % 2000) if i >= rows - 2000 else timedelta(days=2, minutes=i)
+        created = now - age
+        due = created + timedelta(minutes=(i % 90))
+        batch.append((f"t{i}", "bench", "text", db.format_ts(created), db.format_ts(due)))
+        if len(batch) == 50000:
+            conn.executemany("INSERT INTO tweets (tweet_id, user_handle, text, created_at, next_update_ts) VALUES (?, ?, ?, ?, ?)", batch)
+            batch = []
+    conn.executemany("INSERT INTO tweets (tweet_id, user_handle, text, created_at, next_update_ts) VALUES (?, ?, ?, ?, ?)", batch)
+    conn.commit()
+    conn.execute("ANALYZE")
+
+def main(rows=1_000_000):
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["TWEETS_DB_PATH"] = os.path.join(tmp, "bench.db")
+        import db
+        db.init_db()
+        start = time.perf_counter()
+        seed(db, rows)
+        seed_s = time.perf_counter() - start
+
+        conn = db.get_conn()
+        plan = [row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + db.DUE_QUERY, db.due_query_params(24))]
+        due = db.get_tweets_to_update(hours_back=24)
+
+        assert not any(step.startswith("SCAN") for step in plan), plan
+        assert any("USING INDEX idx_tweets_due" in step for step in plan), plan
+        assert not any("TEMP B-TREE" in step for step in plan), plan
+
+        timings = []
+        for _ in range(20):
+            start = time.perf_counter()
+            db.get_tweets_to_update(hours_back=24)
+            timings.append((time.perf_counter() - start) * 1000)
+        report(f"Due queue over {rows:,} tweets", [
+            ("seed time", f"{seed_s:.1f}s"),
+            ("query plan", " | ".join(plan)),
+            ("due tweets", len(due)),
+            ("query latency", f"min {min(timings):.2f} ms, median {sorted(timings)[len(timings) // 2]:.2f} ms"),
+        ])
+        db.close_conn()
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
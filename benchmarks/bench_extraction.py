@@ -0,0 +1,38 @@
+"""Per-poll cost of the scraper's per-locator extraction vs. the single
+page.evaluate batch path, on the saved deck fixture.
+
+    python benchmarks/bench_extraction.py [article_count]
+"""
+import sys
+
+from common import RoundTripCounter, fixture_url, report, time_ms
+from playwright.sync_api import sync_playwright
+
+from extraction import extract_articles
+from scraper import collect_tweets_batch, collect_tweets_per_locator
+
+def main(article_count=150):
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=True)
+        page = browser.new_page()
+        page.goto(fixture_url("deck.html", n=article_count))
+        page.wait_for_selector("article")
+
+        # A fresh seen set every poll, as on the first poll after startup
+        per_locator = lambda: collect_tweets_per_locator(page, set())
+        batch = lambda: collect_tweets_batch(page, set())
+
+        rows = []
+        for name, fn in (("per-locator", per_locator), ("batch evaluate", batch)):
+            with RoundTripCounter() as counter:
+                tweets = fn()
+            ms = time_ms(fn, repeat=3)
+            rows.append((name, f"{len(tweets)} tweets, {counter.calls} round trips, {ms:.1f} ms/poll"))
+
+        sample = extract_articles(page)[0]
+        rows.append(("sample", sample))
+        report(f"Extraction over {article_count} articles", rows)
+        browser.close()
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 150)
@@ -0,0 +1,95 @@
+"""Times metrics.py on the label corpus in fixtures/metric_labels.json next
+to the two parsers it replaced (updater.py's split/K/M and the archivers'
+re.findall with `import re` inside the function), and scores each against
+the corpus. tests/test_metric_parsing.py checks metrics.py itself.
+
+    python benchmarks/bench_metric_parsing.py [iterations] [--browser]
+
+--browser also times reading one article's metrics from the
+deck fixture: four [aria-label*=...] locator lookups vs metrics.read_metrics.
+"""
+import json
+import sys
+import time
+
+from common import FIXTURES_DIR, RoundTripCounter, fixture_url, report, time_ms
+
+from metrics import parse_count, parse_group_label, read_metrics
+
+# updater.py's parser, minus the locator lookup
+def legacy_updater(label):
+    try:
+        number = label.split(" ")[0].replace(",", "")
+        if "K" in number:
+            return int(float(number.replace("K", "")) * 1000)
+        elif "M" in number:
+            return int(float(number.replace("M", "")) * 1_000_000)
+        return int(number)
+    except:
+        return 0
+
+# The archivers' parser, minus the locator lookup
+def legacy_archiver(label):
+    import re
+    numbers = re.findall(r'\d+', label)
+    if numbers:
+        return int(numbers[0])
+    return 0
+
+# The old per-article path: a locator lookup and a read per metric
+def legacy_read_metrics(article):
+    metrics = {}
+    for key, needle in (("likes", "Like"), ("retweets", "Repost"), ("replies", "Repl"), ("views", "View")):
+        label = article.locator(f'[aria-label*="{needle}"]').first.get_attribute("aria-label", timeout=5000)
+        metrics[key] = legacy_archiver(label or "")
+    return metrics
+
+def per_label_us(fn, labels, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for label in labels:
+            fn(label)
+    return (time.perf_counter() - start) * 1e6 / (iterations * len(labels))
+
+def main(iterations=20000, browser=False):
+    corpus = json.loads((FIXTURES_DIR / "metric_labels.json").read_text(encoding="utf-8"))
+    counts = [(label, expected) for label, expected in corpus["counts"]]
+    groups = [(label, expected) for label, expected in corpus["groups"]]
+
+    labels = [label for label, _ in counts]
+    rows = []
+    for name, fn in (("updater split/K/M", legacy_updater),
+                     ("archiver re.findall", legacy_archiver),
+                     ("metrics.parse_count", parse_count)):
+        correct = sum(fn(label) == expected for label, expected in counts)
+        rows.append((name, f"{per_label_us(fn, labels, iterations):.2f} us/label, "
+                           f"{correct}/{len(counts)} correct"))
+
+    group_labels = [label for label, _ in groups if label]
+    rows.append(("parse_group_label, all four",
+                 f"{per_label_us(parse_group_label, group_labels, iterations):.2f} us/article"))
+
+    report(f"Metric label parsing, {len(counts)} count + {len(groups)} group labels", rows)
+    if browser:
+        browser_rows()
+
+def browser_rows(article_count=50):
+    from playwright.sync_api import sync_playwright
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=True)
+        page = browser.new_page()
+        page.goto(fixture_url("deck.html", n=article_count))
+        page.wait_for_selector("article")
+        articles = [page.locator("article").nth(i) for i in range(article_count)]
+        rows = []
+        for name, fn in (("four locator lookups", legacy_read_metrics), ("read_metrics", read_metrics)):
+            with RoundTripCounter() as counter:
+                fn(articles[0])
+            ms = time_ms(lambda: [fn(article) for article in articles], repeat=3)
+            rows.append((name, f"{ms / article_count:.2f} ms/article, {counter.calls} round trips/article"))
+        report(f"Reading one article's metrics ({article_count} articles)", rows)
+        browser.close()
+
+if __name__ == "__main__":
+    args = [arg for arg in sys.argv[1:] if arg != "--browser"]
+    main(int(args[0]) if args else 20000, browser="--browser" in sys.argv)
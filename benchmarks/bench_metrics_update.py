@@ -0,0 +1,76 @@
+"""Cost of one update_tweet_metrics call with the old JSON-array series
+columns vs. the append-only tweet_metrics table, at 10 / 100 / 1000 samples
+already stored per tweet.
+
+    python benchmarks/bench_metrics_update.py
+"""
+import json
+import os
+import tempfile
+import time
+
+from common import report
+
+TWEETS = 50
+SIZES = [10, 100, 1000]
+METRICS = {"likes": 10, "retweets": 2, "replies": 1, "views": 500}
+
+# The pre-migration update: read five JSON columns, append, rewrite the row
+def legacy_update(conn, tweet_id, metrics):
+    row = conn.execute("""
+        SELECT likes_series, retweets_series, replies_series, views_series, engagement_timestamps
+        FROM tweets WHERE tweet_id = ?
+    """, (tweet_id,)).fetchone()
+    series = [json.loads(value) for value in row]
+    for values, key in zip(series, ["likes", "retweets", "replies", "views"]):
+        values.append(metrics[key])
+    series[4].append(len(series[4]) * 60)
+    conn.execute("""
+        UPDATE tweets SET likes_series = ?, retweets_series = ?, replies_series = ?,
+                          views_series = ?, engagement_timestamps = ?
+        WHERE tweet_id = ?
+    """, (*[json.dumps(values) for values in series], tweet_id))
+    conn.commit()
+
+def seed(db, samples):
+    db.init_db()
+    conn = db.get_conn()
+    conn.execute("DELETE FROM tweets")
+    conn.execute("DELETE FROM tweet_metrics")
+    for i in range(TWEETS):
+        tweet_id = f"bench-{i}"
+        conn.execute("INSERT INTO tweets (tweet_id, user_handle, text, update_phase, created_at) VALUES (?, 'bench', 'text', 'halfhour', '2025-01-01 00:00:00')", (tweet_id,))
+        conn.executemany(
+            "INSERT INTO tweet_metrics (tweet_id, t_offset, likes, retweets, replies, views) VALUES (?, ?, 1, 1, 1, 1)",
+            [(tweet_id, n * 60) for n in range(samples)])
+        legacy = json.dumps([1] * samples)
+        conn.execute("""
+            UPDATE tweets SET likes_series = ?, retweets_series = ?, replies_series = ?, views_series = ?,
+                              engagement_timestamps = ?
+            WHERE tweet_id = ?
+        """, (legacy, legacy, legacy, legacy, json.dumps(list(range(0, samples * 60, 60))), tweet_id))
+    conn.commit()
+
+def per_call_ms(fn):
+    start = time.perf_counter()
+    for i in range(TWEETS):
+        fn(f"bench-{i}")
+    return (time.perf_counter() - start) * 1000 / TWEETS
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["TWEETS_DB_PATH"] = os.path.join(tmp, "bench.db")
+        import db
+
+        rows = []
+        for samples in SIZES:
+            seed(db, samples)
+            legacy_ms = per_call_ms(lambda tweet_id: legacy_update(db.get_conn(), tweet_id, METRICS))
+            seed(db, samples)
+            table_ms = per_call_ms(lambda tweet_id: db.update_tweet_metrics(tweet_id, METRICS))
+            rows.append((f"{samples} samples/tweet", f"json columns {legacy_ms:.3f} ms, tweet_metrics {table_ms:.3f} ms"))
+        report("update_tweet_metrics cost per call", rows)
+        db.close_conn()
+
+if __name__ == "__main__":
+    main()
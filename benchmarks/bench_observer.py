@@ -0,0 +1,72 @@
+"""Capture latency and CPU of 1s polling vs. the MutationObserver push path
+against a local page that prepends articles on a timer.
+
+    python benchmarks/bench_observer.py [initial_articles] [interval_ms]
+"""
+import statistics
+import sys
+import time
+
+from common import fixture_url, report
+from playwright.sync_api import sync_playwright
+
+from extraction import extract_articles
+from observer import ArticleObserver
+from scraper import collect_tweets_batch
+
+TOTAL_NEW = 40
+
+def run(page, capture):
+    seen_ids = {tweet["id"] for tweet in extract_articles(page)}
+    latencies = []
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+    while len(latencies) < TOTAL_NEW and time.perf_counter() - wall_start < 60:
+        tweets = [t for t in capture(seen_ids) if t["id"] not in seen_ids]
+        if not tweets:
+            continue
+        received_ms = time.time() * 1000
+        appended = page.evaluate("() => window.__appendedAt")
+        for tweet in tweets:
+            seen_ids.add(tweet["id"])
+            if tweet["id"] in appended:
+                latencies.append(received_ms - appended[tweet["id"]])
+    cpu = time.process_time() - cpu_start
+    return latencies, cpu
+
+def main(initial=200, interval=250):
+    url = fixture_url("live_timeline.html", initial=initial, interval=interval, total=TOTAL_NEW)
+    rows = []
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=True)
+
+        page = browser.new_page()
+        page.goto(url)
+
+        def poll(seen_ids):
+            time.sleep(1)
+            return collect_tweets_batch(page, set(seen_ids))
+        latencies, cpu = run(page, poll)
+        rows.append(("poll (1s)", summarize(latencies, cpu)))
+        page.close()
+
+        page = browser.new_page()
+        page.goto(url)
+        observer = ArticleObserver(page)
+        observer.install()
+        observer.drain()  # discard the initial backlog
+        latencies, cpu = run(page, lambda seen_ids: observer.wait(timeout_ms=5000))
+        rows.append(("observer", summarize(latencies, cpu)))
+
+        browser.close()
+    report(f"Capture of {TOTAL_NEW} new tweets over {initial} loaded articles, one every {interval} ms", rows)
+
+def summarize(latencies, cpu):
+    if not latencies:
+        return "no tweets captured"
+    return (f"{len(latencies)} captured, latency mean {statistics.mean(latencies):.0f} ms "
+            f"/ max {max(latencies):.0f} ms, python cpu {cpu:.2f}s")
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:3]]
+    main(*args)
@@ -0,0 +1,71 @@
+"""Startup and per-cycle persistence cost of the updaters' spacing state
+with 1M historical tweet IDs: the old recent_updates.json rewrite vs. the
+windowed RecentUpdates store.
+
+    python benchmarks/bench_recent_updates.py [historical_ids]
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+from common import report
+
+CYCLE_UPDATES = 500
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return (time.perf_counter() - start) * 1000, result
+
+def main(history=1_000_000):
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["TWEETS_DB_PATH"] = os.path.join(tmp, "bench.db")
+        import db
+        from recent_updates import RecentUpdates
+
+        now = datetime.now(timezone.utc)
+        old = (now - timedelta(days=3)).isoformat()
+        legacy = {f"h{i}": old for i in range(history)}
+        json_path = os.path.join(tmp, "recent_updates.json")
+        with open(json_path, "w") as f:
+            json.dump(legacy, f)
+
+        # Old behaviour: load the whole file at startup, rewrite it every cycle
+        load_ms, data = timed(lambda: json.load(open(json_path)))
+        for i in range(CYCLE_UPDATES):
+            data[f"n{i}"] = now.isoformat()
+        save_ms, _ = timed(lambda: json.dump(data, open(json_path, "w")))
+        rows = [("json load", f"{load_ms:.0f} ms ({len(data):,} entries)"),
+                ("json save / cycle", f"{save_ms:.0f} ms")]
+
+        # One-time import of the legacy file (keeps only entries in the window)
+        store = RecentUpdates(window_seconds=50, legacy_path=json_path)
+        import_ms, _ = timed(lambda: store.load(now.timestamp()))
+        rows.append(("one-time json import", f"{import_ms:.0f} ms"))
+
+        # Same history already in the table, all older than the window
+        db.save_recent_updates([(f"h{i}", now.timestamp() - 3 * 86400) for i in range(history)])
+        fresh = RecentUpdates(window_seconds=50, legacy_path=None)
+        load_ms, _ = timed(lambda: fresh.load(now.timestamp()))
+        rows.append(("store load", f"{load_ms:.1f} ms ({len(fresh):,} entries in window)"))
+
+        # The first flush with changes prunes; later ones within the window don't
+        fresh.mark("first", now.timestamp())
+        prune_ms, _ = timed(lambda: fresh.flush(now.timestamp()))
+        rows.append(("first flush (prunes history)", f"{prune_ms:.0f} ms"))
+
+        for cycle in range(3):
+            t = now.timestamp() + 60 * (cycle + 1)
+            for i in range(CYCLE_UPDATES):
+                fresh.mark(f"c{cycle}-{i}", t)
+            flush_ms, _ = timed(lambda: fresh.flush(t))
+            rows.append((f"store flush / cycle {cycle + 1}", f"{flush_ms:.1f} ms ({len(fresh):,} in memory)"))
+
+        report(f"Spacing state with {history:,} historical IDs, {CYCLE_UPDATES} updates per cycle", rows)
+        db.close_conn()
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,132 @@
+"""Bytes downloaded and scroll throughput with and without the resource
+policy (resources.py), on a local server that serves a timeline whose
+articles carry avatars, photos, videos, web fonts and telemetry beacons.
+
+    python benchmarks/bench_resource_blocking.py [asset_kb] [asset_latency_ms] [total]
+
+Each asset is `asset_kb` of filler delayed by `asset_latency_ms`; timeline
+pages are delayed 300 ms. Bytes are counted on the server side, per kind.
+"""
+import json
+import sys
+import threading
+import time
+from collections import Counter
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from common import FIXTURES_DIR, report
+from playwright.sync_api import sync_playwright
+
+from extraction import extract_articles
+from resources import ResourcePolicy
+from scrolling import ScrollController
+
+MAX_SECONDS = 90
+TIMELINE_LATENCY = 0.3
+
+ASSETS = {
+    "/media/": ("media", "image/jpeg"),
+    "/avatar/": ("image", "image/jpeg"),
+    "/fonts/": ("font", "font/woff2"),
+}
+
+class FixtureServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, asset_kb, asset_latency_ms):
+        self.asset = b"\0" * (asset_kb * 1024)
+        self.asset_latency = asset_latency_ms / 1000
+        self.bytes = Counter()
+        self.lock = threading.Lock()
+        super().__init__(("127.0.0.1", 0), partial(Handler, directory=str(FIXTURES_DIR)))
+
+    def count(self, kind, size):
+        with self.lock:
+            self.bytes[kind] += size
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+class Handler(SimpleHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def send_body(self, body, content_type, kind):
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(body)
+        self.server.count(kind, len(body))
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        if url.path == "/timeline":
+            time.sleep(TIMELINE_LATENCY)
+            query = parse_qs(url.query)
+            start, count = int(query["start"][0]), int(query["count"][0])
+            body = json.dumps({"items": list(range(start, start + count)), "next": start + count})
+            return self.send_body(body.encode(), "application/json", "timeline")
+        for prefix, (kind, content_type) in ASSETS.items():
+            if url.path.startswith(prefix):
+                time.sleep(self.server.asset_latency)
+                if url.path.endswith(".mp4"):
+                    kind, content_type = "media", "video/mp4"
+                return self.send_body(self.server.asset, content_type, kind)
+        super().do_GET()
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        self.rfile.read(length)
+        self.send_body(b"{}", "application/json", "analytics")
+
+def harvest(page, url, total):
+    controller = ScrollController(page, step=1500, wait_ms=2000,
+                                  request_filter=lambda u: "/timeline" in u)
+    page.goto(url)
+    page.wait_for_selector("article")
+    page.mouse.move(400, 300)
+    seen = set()
+    start = time.perf_counter()
+    while len(seen) < total and time.perf_counter() - start < MAX_SECONDS:
+        seen.update(tweet["id"] for tweet in extract_articles(page))
+        if len(seen) >= total:
+            break
+        controller.scroll()
+    return len(seen), time.perf_counter() - start
+
+def run(browser, server, total, policy):
+    context = browser.new_context(viewport={"width": 1280, "height": 900})
+    if policy:
+        policy.install(context)
+    page = context.new_page()
+    server.bytes.clear()
+    count, elapsed = harvest(page, f"{server.url}/media_timeline.html?total={total}", total)
+    context.close()
+    downloaded = sum(server.bytes.values())
+    kinds = ", ".join(f"{kind} {size / 1e6:.1f}" for kind, size in server.bytes.most_common())
+    return downloaded, (f"{count / elapsed:.1f} articles/s, {downloaded / 1e6:.1f} MB ({kinds})"
+                        + (f"; blocked {policy.summary()}" if policy else ""))
+
+def main(asset_kb=60, asset_latency_ms=150, total=300):
+    server = FixtureServer(asset_kb, asset_latency_ms)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=True)
+        before, unblocked = run(browser, server, total, None)
+        after, blocked = run(browser, server, total, ResourcePolicy())
+        browser.close()
+    server.shutdown()
+    report(f"Resource blocking, {total} articles, {asset_kb} KB assets at {asset_latency_ms} ms", [
+        ("no policy", unblocked),
+        ("ResourcePolicy", blocked),
+        ("bytes saved", f"{(before - after) / 1e6:.1f} MB ({100 * (before - after) / max(before, 1):.0f}%)"),
+    ])
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:4]]
+    main(*args)
@@ -0,0 +1,47 @@
+"""Times scheduler.UpdateScheduler's pop_due/reschedule over a large
+schedule on a fake clock. The scheduling rules themselves are checked in
+tests/test_scheduler.py.
+
+    python benchmarks/bench_scheduler.py [tweets]
+
+Needs no browser.
+"""
+import sys
+import time
+from datetime import datetime, timedelta
+
+from common import report
+
+import cadence
+from scheduler import UpdateScheduler
+
+class FakeClock:
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, delta):
+        self.now += delta
+
+def timing(tweets):
+    clock = FakeClock(datetime(2026, 1, 1))
+    scheduler = UpdateScheduler(cadence.MinuteThenHalfHour(), hours_back=24, clock=clock)
+    for i in range(tweets):
+        scheduler.add(str(i), clock.now, next_due=clock.now + timedelta(seconds=i % 3600))
+    clock.advance(timedelta(hours=1))
+    start = time.perf_counter()
+    due = scheduler.pop_due()
+    for tweet_id in due:
+        scheduler.reschedule(tweet_id)
+    elapsed = time.perf_counter() - start
+    return len(due), elapsed
+
+def main(tweets=100_000):
+    due, elapsed = timing(tweets)
+    report("Update scheduler on a fake clock",
+           [(f"pop_due + reschedule x{due:,}", f"{elapsed * 1000:.0f} ms ({elapsed / due * 1e6:.1f} us/tweet)")])
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,66 @@
+"""Articles harvested per second by fixed-sleep scrolling (careful_scroll's
+2s, the updater's 0.3s) vs. the signal-driven ScrollController, on the
+infinite-scroll fixture with a configurable load latency.
+
+    python benchmarks/bench_scroll.py [latency_ms] [total] [jitter_ms]
+"""
+import sys
+import time
+
+from common import fixture_url, report
+from playwright.sync_api import sync_playwright
+
+from extraction import extract_articles
+from scrolling import ScrollController
+
+MAX_SCROLLS = 400
+MAX_SECONDS = 120
+
+def fixed_sleep(seconds, pixels=1000):
+    def scroll(page):
+        page.mouse.wheel(0, pixels)
+        time.sleep(seconds)
+    return scroll
+
+def harvest(page, url, total, scroll):
+    page.goto(url)
+    page.wait_for_selector("article")
+    page.mouse.move(400, 300)
+    seen = set()
+    scrolls = empty = 0
+    start = time.perf_counter()
+    while len(seen) < total and scrolls < MAX_SCROLLS and time.perf_counter() - start < MAX_SECONDS:
+        before = len(seen)
+        seen.update(tweet["id"] for tweet in extract_articles(page))
+        if len(seen) >= total:
+            break
+        scroll(page)
+        scrolls += 1
+        # the articles from this scroll are counted on the next pass
+        if scrolls > 1 and len(seen) == before:
+            empty += 1
+    elapsed = time.perf_counter() - start
+    return len(seen), scrolls, empty, elapsed
+
+def main(latency=800, total=400, jitter=400):
+    url = fixture_url("infinite_scroll.html", batch=20, latency=latency, jitter=jitter, total=total, keep=80)
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=True)
+        page = browser.new_page(viewport={"width": 1280, "height": 900})
+        controller = ScrollController(page, step=1000, wait_ms=2000)
+
+        rows = []
+        for name, scroll in (("fixed 2s sleep", fixed_sleep(2)),
+                             ("fixed 0.3s sleep", fixed_sleep(0.3)),
+                             ("ScrollController", lambda page: controller.scroll())):
+            controller.reset()
+            count, scrolls, empty, elapsed = harvest(page, url, total, scroll)
+            rows.append((name, f"{count} articles in {elapsed:.1f}s = {count / elapsed:.1f}/s, "
+                               f"{scrolls} scrolls ({empty} empty)"))
+
+        report(f"Infinite scroll, {latency}ms (+{jitter}ms jitter) per 20-article load", rows)
+        browser.close()
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:4]]
+    main(*args)
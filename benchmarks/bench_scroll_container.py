@@ -0,0 +1,68 @@
+"""Per-scroll evaluate time of updater_combined's old scroll_container (which
+measured scrollHeight on every element) vs. the cached deck column lookup in
+scrolling.py, on a large multi-column fixture DOM.
+
+    python benchmarks/bench_scroll_container.py [filler_nodes] [columns]
+"""
+import sys
+
+from common import fixture_url, report, time_ms
+from playwright.sync_api import sync_playwright
+
+from scrolling import list_columns, scroll_container
+
+# scroll_container as it was: querySelectorAll('*') and a layout read per element
+LEGACY_SCROLL_JS = """
+([amount]) => {
+    const containers = document.querySelectorAll('*');
+    let maxHeight = 0;
+    let maxContainer = null;
+    for (const container of containers) {
+        const height = container.scrollHeight;
+        if (height > maxHeight && height > 500) {
+            maxHeight = height;
+            maxContainer = container;
+        }
+    }
+    if (maxContainer) {
+        maxContainer.scrollTop += amount;
+        return { scrolled: true, newPosition: maxContainer.scrollTop };
+    }
+    return { scrolled: false };
+}
+"""
+
+def main(filler=20000, columns=4):
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=True)
+        page = browser.new_page(viewport={"width": 1920, "height": 1080})
+        page.goto(fixture_url("big_deck.html", columns=columns, n=100, filler=filler))
+        page.wait_for_selector("article")
+        node_count = page.evaluate("() => document.getElementsByTagName('*').length")
+
+        def reset():
+            page.evaluate("() => document.querySelectorAll('.scroller').forEach((el) => el.scrollTop = 0)")
+
+        rows = []
+        cases = [
+            ("legacy querySelectorAll('*')", lambda: page.evaluate(LEGACY_SCROLL_JS, [200])),
+            ("cached, tallest column", lambda: scroll_container(page, "down", 200)),
+            ("cached, column by index", lambda: scroll_container(page, "down", 200, 2)),
+            ("cached, column by title", lambda: scroll_container(page, "down", 200, "markets")),
+        ]
+        for name, fn in cases:
+            reset()
+            ms = time_ms(fn, repeat=20)
+            rows.append((name, f"{ms:.2f} ms/scroll"))
+
+        # First call after a re-render pays for one resolve
+        page.evaluate("() => { const s = document.querySelector('.scroller'); s.replaceWith(s.cloneNode(true)); }")
+        rows.append(("re-resolve after detach", f"{time_ms(lambda: scroll_container(page, 'down', 200, 0), repeat=1):.2f} ms"))
+        rows.append(("columns", list_columns(page)))
+
+        report(f"Scroll container lookup over {node_count} DOM nodes", rows)
+        browser.close()
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:3]]
+    main(*args)
@@ -0,0 +1,59 @@
+"""Memory of the old `seen_ids = set()` vs. the bounded SeenIds cache over a
+long synthetic stream of snowflake IDs (about one new tweet per second,
+with recent tweets re-rendered as the timeline scrolls).
+
+    python benchmarks/bench_seen_ids.py [stream_length]
+"""
+from collections import deque
+import random
+import sys
+import time
+import tracemalloc
+
+from common import report
+
+from dedup import RotatingBloomFilter, SeenIds
+
+BASE_ID = 1915000000000000000
+
+def stream(length, seed=7):
+    rng = random.Random(seed)
+    newest = BASE_ID
+    on_screen = deque([str(newest)], maxlen=200)
+    for _ in range(length):
+        if rng.random() < 0.7:
+            newest += (1000 << 22) + rng.randrange(1 << 22)  # ~1s later
+            on_screen.append(str(newest))
+            yield on_screen[-1]
+        else:
+            yield rng.choice(on_screen)  # re-rendered while scrolling
+
+def run(label, seen, length):
+    tracemalloc.start()
+    start = time.perf_counter()
+    checkpoints = []
+    duplicates = 0
+    for n, tweet_id in enumerate(stream(length), 1):
+        if n % (length // 4) == 0:
+            checkpoints.append(tracemalloc.get_traced_memory()[0] / 1e6)
+        if tweet_id in seen:
+            duplicates += 1
+            continue
+        seen.add(tweet_id)
+    elapsed = time.perf_counter() - start
+    tracemalloc.stop()
+    memory = " -> ".join(f"{mb:.0f}" for mb in checkpoints)
+    return (label, f"memory MB at 25/50/75/100%: {memory}, {duplicates:,} dupes skipped, {elapsed:.1f}s")
+
+def main(length=2_000_000):
+    rows = [
+        run("set()", set(), length),
+        run("SeenIds LRU", SeenIds(max_size=20_000), length),
+        run("SeenIds LRU + window", SeenIds(max_size=20_000, window_ms=6 * 3600 * 1000), length),
+        run("SeenIds + Bloom", SeenIds(max_size=20_000, bloom=RotatingBloomFilter(capacity=500_000),
+                                       fallback=lambda tweet_id: False), length),
+    ]
+    report(f"Dedup over {length:,} IDs", rows)
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000)
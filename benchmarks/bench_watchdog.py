@@ -0,0 +1,78 @@
+"""Runs the watchdog.py supervisor over the fake children in
+fixtures/children (slow loader, healthy, crash loop, hang-and-ignore-SIGTERM)
+with short timeouts and reports what it did: when each child got ready or
+started, the time to first tweet, the healthy child's throughput, the crash
+loop's restart delays and why the hang was restarted. tests/test_watchdog.py
+asserts on the same run.
+
+    python benchmarks/bench_watchdog.py [seconds]
+
+Needs no browser.
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+
+from common import FIXTURES_DIR, report
+
+import watchdog
+
+HEARTBEAT_TIMEOUT = 3
+READY_TIMEOUT = 5
+
+def main(seconds=40):
+    with tempfile.TemporaryDirectory(prefix="bench_watchdog_") as workdir:
+        rows, elapsed = supervise(workdir, seconds)
+    report(f"Supervisor over fake children for {elapsed:.0f}s", rows)
+
+def supervise(workdir, seconds):
+    watchdog.BACKOFF_BASE_SECONDS = 1
+    watchdog.STOP_GRACE_SECONDS = 2
+    watchdog.log = lambda message: print(f"  [watchdog] {message}")
+
+    def child(name, script=None, **options):
+        return watchdog.Child(name, str(FIXTURES_DIR / "children" / f"{script or name}.py"),
+                              heartbeat_timeout=HEARTBEAT_TIMEOUT, startup_grace=HEARTBEAT_TIMEOUT,
+                              log_dir=workdir, heartbeat_dir=workdir, **options)
+
+    children = {name: child(name) for name in ("loader", "crash", "hang")}
+    children["healthy"] = child("healthy", depends_on=[children["loader"]])
+    children["orphan"] = child("orphan", "healthy", depends_on=[children["crash"]], ready_timeout=READY_TIMEOUT)
+    # Record when each restart was scheduled, to check the backoff
+    delays = {name: [] for name in children}
+    for name, child in children.items():
+        def fail(reason, now, child=child, original=child.fail, name=name):
+            original(reason, now)
+            delays[name].append(round(child.next_start - now))
+        child.fail = fail
+
+    status_path = os.path.join(workdir, "status.json")
+    supervisor = watchdog.Supervisor(list(children.values()), status_path=status_path, poll_seconds=0.5)
+    start = time.time()
+    supervisor.run(duration=seconds)
+    elapsed = time.time() - start
+    with open(status_path) as f:
+        full_status = json.load(f)
+    status = full_status["children"]
+
+    loader = children["loader"]
+    crash = delays["crash"]
+    hang = children["hang"]
+    log_sizes = {name: os.path.getsize(os.path.join(workdir, f"{name}.log")) for name in children}
+    rows = [
+        ("loader ready after", f"{loader.ready_at - loader.started_at:.1f}s"),
+        ("healthy started after loader ready", f"{children['healthy'].started_at - loader.ready_at:.1f}s"),
+        ("orphan started (crash never ready)", f"{children['orphan'].started_at - start:.1f}s"),
+        ("time to first tweet", f"{full_status['startup']['first_tweet_after_s']}s"),
+        ("healthy restarts, throughput", f"{status['healthy']['restarts']}, "
+                                         f"{status['healthy']['per_minute'].get('tweets', 0)}/min"),
+        ("crash restart delays", f"{crash}"),
+        ("hang restarts", f"{status['hang']['restarts']} ({hang.last_reason or 'never'})"),
+        ("child log sizes", f"{log_sizes} bytes"),
+    ]
+    return rows, elapsed
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 40)
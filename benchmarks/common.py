@@ -0,0 +1,125 @@
+import os
+import sys
+import time
+from pathlib import Path
+from urllib.parse import urlencode
+
+BENCH_DIR = Path(__file__).resolve().parent
+FIXTURES_DIR = BENCH_DIR / "fixtures"
+REPO_DIR = BENCH_DIR.parent
+
+# Make the top-level scripts importable when running `python benchmarks/x.py`
+if str(REPO_DIR) not in sys.path:
+    sys.path.insert(0, str(REPO_DIR))
+
+# file:// URL for a fixture page, with optional query parameters
+def fixture_url(name, **params):
+    url = (FIXTURES_DIR / name).as_uri()
+    if params:
+        url += "?" + urlencode(params)
+    return url
+
+# Count calls to Playwright methods that each cost one IPC round trip
+class RoundTripCounter:
+    METHODS = {
+        "Locator": ["count", "get_attribute", "inner_text", "inner_html", "all_inner_texts",
+                    "text_content", "evaluate", "evaluate_all", "all"],
+        "Page": ["evaluate"],
+    }
+
+    def __init__(self):
+        self.calls = 0
+        self._originals = []
+
+    def __enter__(self):
+        from playwright.sync_api import Locator, Page
+        classes = {"Locator": Locator, "Page": Page}
+        for class_name, methods in self.METHODS.items():
+            cls = classes[class_name]
+            for method in methods:
+                original = getattr(cls, method)
+                self._originals.append((cls, method, original))
+                setattr(cls, method, self._wrap(original))
+        return self
+
+    def __exit__(self, *exc):
+        for cls, method, original in self._originals:
+            setattr(cls, method, original)
+        self._originals = []
+
+    def _wrap(self, original):
+        counter = self
+
+        def wrapper(*args, **kwargs):
+            counter.calls += 1
+            return original(*args, **kwargs)
+        return wrapper
+
+# Run fn `repeat` times and return the mean wall time in milliseconds
+def time_ms(fn, repeat=5):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) * 1000 / repeat
+
+def report(title, rows):
+    print(f"\n{title}")
+    width = max(len(row[0]) for row in rows)
+    for label, value in rows:
+        print(f"  {label.ljust(width)}  {value}")
+
+def env_flag(name, default="0"):
+    return os.environ.get(name, default) not in ("", "0", "false", "False")
+
+# Every process descended from `pid` (default: this one), itself included.
+# Reads /proc, so Linux only.
+def process_tree(pid=None):
+    children = {}
+    for proc in Path("/proc").iterdir():
+        if not proc.name.isdigit():
+            continue
+        try:
+            ppid = int((proc / "stat").read_text().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(ppid, []).append(int(proc.name))
+    tree, stack = [], [pid or os.getpid()]
+    while stack:
+        current = stack.pop()
+        tree.append(current)
+        stack.extend(children.get(current, []))
+    return tree
+
+def is_chromium(pid):
+    try:
+        cmdline = Path(f"/proc/{pid}/cmdline").read_bytes().split(b"\0")[0].decode(errors="ignore")
+    except OSError:
+        return False
+    return "chrom" in Path(cmdline).name.lower() or "headless_shell" in cmdline
+
+# Summed proportional set size (RSS where smaps_rollup is unavailable), in MB
+def memory_mb(pids):
+    total_kb = 0
+    for pid in pids:
+        proc = Path(f"/proc/{pid}")
+        try:
+            rollup = proc / "smaps_rollup"
+            source = rollup.read_text() if rollup.exists() else (proc / "status").read_text()
+        except OSError:
+            continue
+        for line in source.splitlines():
+            if line.startswith(("Pss:", "VmRSS:")):
+                total_kb += int(line.split()[1])
+                break
+    return total_kb / 1024
+
+# Summed user + system CPU seconds
+def cpu_seconds(pids):
+    ticks = 0
+    for pid in pids:
+        try:
+            fields = Path(f"/proc/{pid}/stat").read_text().rsplit(")", 1)[1].split()
+        except OSError:
+            continue
+        ticks += int(fields[11]) + int(fields[12])
+    return ticks / os.sysconf("SC_CLK_TCK")
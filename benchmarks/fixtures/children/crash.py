@@ -0,0 +1,12 @@
+# Fake supervised child: a crash loop (dies one second after starting)
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+import heartbeat
+
+heartbeat.beat(force=True)
+print("starting, about to crash", flush=True)
+time.sleep(1)
+raise SystemExit("simulated crash")
@@ -0,0 +1,19 @@
+# Fake supervised child: works for two seconds, then freezes like a stuck
+# browser call (no more heartbeats) and ignores SIGTERM, so the supervisor
+# has to notice the stall and escalate to a kill
+import signal
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+import heartbeat
+
+signal.signal(signal.SIGTERM, signal.SIG_IGN)
+start = time.time()
+while time.time() - start < 2:
+    heartbeat.count("tweets", 1)
+    time.sleep(0.2)
+print("hanging", flush=True)
+while True:
+    time.sleep(60)
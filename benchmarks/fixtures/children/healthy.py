@@ -0,0 +1,12 @@
+# Fake supervised child: beats and reports 5 "tweets" every 0.5s
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+import heartbeat
+
+while True:
+    heartbeat.count("tweets", 5)
+    print("inserted 5 tweets", flush=True)
+    time.sleep(0.5)
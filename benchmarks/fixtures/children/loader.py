@@ -0,0 +1,18 @@
+# Fake supervised child: takes 2s to "load its page", marks itself ready,
+# then captures its first tweets a second later and keeps beating
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+import heartbeat
+
+print("loading page", flush=True)
+time.sleep(2)
+heartbeat.mark("ready")
+print("first article seen", flush=True)
+time.sleep(1)
+while True:
+    heartbeat.count("tweets", 1)
+    heartbeat.mark("first_tweet")
+    time.sleep(0.5)
@@ -0,0 +1,52 @@
+// Shared helpers for the local fixture pages. Builds article markup shaped
+// like the TweetDeck / pro.x.com timeline (status links, div[lang] text,
+// time[datetime] and the aria-labelled metric buttons).
+(function () {
+    const BASE_ID = 1915000000000000000n;
+    const BASE_TIME = Date.parse('2025-05-01T12:00:00Z');
+
+    function tweetId(i) {
+        return (BASE_ID + BigInt(i)).toString();
+    }
+
+    function articleHtml(i, opts) {
+        opts = opts || {};
+        const id = opts.id || tweetId(i);
+        const handle = opts.handle || `user${i % 37}`;
+        const created = opts.createdAt || new Date(BASE_TIME - i * 60000).toISOString();
+        const likes = (i * 7) % 1500;
+        const reposts = (i * 3) % 400;
+        const replies = i % 90;
+        const views = 1000 + i * 131;
+        return `
+<article role="article" tabindex="0" data-testid="tweet">
+  <div data-testid="User-Name">
+    <a role="link" href="/${handle}"><span>@${handle}</span></a>
+    <div dir="ltr"><span><span>${handle}</span></span></div>
+  </div>
+  <a href="/${handle}" role="link"><img src="avatar.png" alt=""></a>
+  <a href="/${handle}/status/${id}" role="link"><time datetime="${created}">${i}m</time></a>
+  <div lang="en" dir="auto">Fixture tweet number ${i} about markets, rates and ${handle}</div>
+  <div role="group" aria-label="${replies} replies, ${reposts} reposts, ${likes} likes, ${views} views">
+    <button aria-label="${replies} Replies. Reply"><span>${replies}</span></button>
+    <button aria-label="${reposts} reposts. Repost"><span>${reposts}</span></button>
+    <button aria-label="${likes} Likes. Like"><span>${likes}</span></button>
+    <a href="/${handle}/status/${id}/analytics" aria-label="${views} views. View post analytics"><span>${views}</span></a>
+  </div>
+</article>`;
+    }
+
+    function cell(i, opts) {
+        const div = document.createElement('div');
+        div.setAttribute('data-testid', 'cellInnerDiv');
+        div.innerHTML = articleHtml(i, opts);
+        return div;
+    }
+
+    function param(name, fallback) {
+        const value = new URLSearchParams(location.search).get(name);
+        return value === null ? fallback : Number(value);
+    }
+
+    window.Fixture = { tweetId, articleHtml, cell, param };
+})();
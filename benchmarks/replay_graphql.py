@@ -0,0 +1,59 @@
+"""Replays recorded timeline JSON through page.route against a local page and
+compares what the GraphQL interceptor sees with what the DOM extractor sees.
+
+    python benchmarks/replay_graphql.py
+"""
+import json
+from urllib.parse import parse_qs, urlparse
+
+from common import FIXTURES_DIR, report
+from playwright.sync_api import sync_playwright
+
+from config import DECK_URL
+from extraction import extract_articles
+from graphql import TimelineInterceptor
+
+PAGES = {
+    "": FIXTURES_DIR / "graphql" / "timeline_page1.json",
+    "DAABCgABcursor-page-2": FIXTURES_DIR / "graphql" / "timeline_page2.json",
+}
+
+def route_fixtures(page):
+    def handle(route):
+        url = route.request.url
+        if "/graphql/" in url:
+            cursor = parse_qs(urlparse(url).query).get("cursor", [""])[0]
+            fixture = PAGES.get(cursor)
+            if fixture is None:
+                return route.fulfill(status=404, body="")
+            return route.fulfill(status=200, content_type="application/json", body=fixture.read_text())
+        return route.fulfill(status=200, content_type="text/html",
+                             body=(FIXTURES_DIR / "graphql_deck.html").read_text())
+    page.route("https://pro.x.com/**", handle)
+
+def main():
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=True)
+        page = browser.new_page()
+        route_fixtures(page)
+        interceptor = TimelineInterceptor().attach(page)
+        page.goto(DECK_URL)
+        page.wait_for_selector("article")
+
+        intercepted = interceptor.wait(page, timeout_ms=500)
+        page.evaluate("() => { const c = document.getElementById('column'); c.scrollTop = c.scrollHeight; }")
+        intercepted += interceptor.wait(page, timeout_ms=1000)
+
+        dom = {t["id"]: t for t in extract_articles(page)}
+        rows = [("responses", interceptor.responses),
+                ("tweets from JSON", len(intercepted)),
+                ("tweets from DOM", len(dom)),
+                ("bottom cursor", interceptor.cursor)]
+        for tweet in intercepted[:6]:
+            dom_metrics = dom.get(tweet["id"], {}).get("metrics")
+            rows.append((tweet["id"], f"json={json.dumps(tweet['metrics'])} dom={json.dumps(dom_metrics)}"))
+        report("GraphQL replay", rows)
+        browser.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+from playwright.sync_api import sync_playwright
+from config import SESSION_FILE, USE_BROWSER_HOST, BROWSER_HOST_PORT
+from resources import policy_for
+from urllib.request import urlopen
+import json
+import signal
+import time
+
+# One Chromium for every tool. `python browser_host.py` launches it with a
+# CDP endpoint on 127.0.0.1:BROWSER_HOST_PORT and keeps it alive; scraper,
+# updaters and archivers then call open_page(), which connects over CDP and
+# opens their own context (own cookies/storage loaded from SESSION_FILE)
+# inside the shared browser. When no host is running, open_page() launches
+# a private browser exactly as the tools used to.
+
+# Union of the flags the tools launched with
+BROWSER_ARGS = [
+    '--disable-dev-shm-usage',
+    '--no-sandbox',
+    '--disable-setuid-sandbox',
+    '--disable-gpu',
+    '--disable-software-rasterizer',
+    '--disable-extensions',
+    '--window-size=1920,1080'
+]
+
+# Context options the deck tools open their pages with
+DESKTOP_CONTEXT = {
+    "viewport": {'width': 1920, 'height': 1080},
+    "user_agent": 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36',
+}
+
+def host_url(port=BROWSER_HOST_PORT):
+    return f"http://127.0.0.1:{port}"
+
+# The CDP /json/version document if a host answers, else None
+def host_info(port=BROWSER_HOST_PORT, timeout=1.0):
+    try:
+        with urlopen(f"{host_url(port)}/json/version", timeout=timeout) as response:
+            return json.load(response)
+    except (OSError, ValueError):
+        return None
+
+def wait_for_host(port=BROWSER_HOST_PORT, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if host_info(port):
+            return True
+        time.sleep(0.25)
+    return False
+
+# Returns (browser, context, page). `launch_args` / `launch_options` only
+# apply to the private-browser fallback. `tool` picks the resource policy
+# (resources.py) the context gets. Closing the returned browser closes this
+# tool's contexts and disconnects; a shared host keeps running.
+def open_page(p, storage_state=SESSION_FILE, launch_args=None, launch_options=None,
+              port=BROWSER_HOST_PORT, use_host=USE_BROWSER_HOST, tool=None, **context_options):
+    browser = None
+    if use_host and host_info(port):
+        try:
+            browser = p.chromium.connect_over_cdp(host_url(port))
+            print(f"[HOST] Using shared browser at {host_url(port)}")
+        except Exception as e:
+            print(f"[HOST] Could not connect to {host_url(port)}, launching a private browser: {e}")
+    if browser is None:
+        browser = p.chromium.launch(headless=True, args=launch_args or BROWSER_ARGS, **(launch_options or {}))
+    context = browser.new_context(storage_state=storage_state, **context_options)
+    policy = policy_for(tool)
+    if policy:
+        policy.install(context)
+    return browser, context, context.new_page()
+
+def serve(port=BROWSER_HOST_PORT, headless=True):
+    if host_info(port):
+        print(f"[HOST] A browser host is already running at {host_url(port)}")
+        return
+
+    stopping = []
+    signal.signal(signal.SIGTERM, lambda *_: stopping.append(True))
+
+    with sync_playwright() as p:
+        browser = p.chromium.launch(
+            headless=headless,
+            args=BROWSER_ARGS + [f"--remote-debugging-port={port}", "--remote-debugging-address=127.0.0.1"]
+        )
+        if not wait_for_host(port):
+            print(f"[HOST] Chromium did not open its CDP endpoint on port {port}")
+            browser.close()
+            return
+        print(f"[HOST] Shared Chromium {browser.version} ready at {host_url(port)}")
+
+        # The endpoint going away means Chromium died; exit so the watchdog restarts us
+        try:
+            while not stopping and host_info(port, timeout=5):
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
+        print("[HOST] Shutting down shared browser")
+        browser.close()
+
+if __name__ == "__main__":
+    serve()
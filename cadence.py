@@ -0,0 +1,67 @@
+from datetime import timedelta
+
+from config import UPDATE_CADENCE, UPDATE_VIRAL_BOOST
+
+# A cadence policy decides how long to wait before sampling a tweet again.
+# next_update() gets the sample count *after* the current sample, the current
+# phase, and optionally the latest and previous metrics with the time between
+# them; it returns (phase, interval). Phases are stored in tweets.update_phase.
+class CadencePolicy:
+    def next_update(self, count, phase, metrics=None, previous=None, elapsed=None):
+        raise NotImplementedError
+
+# The original schedule: every minute for the first 60 samples, then every 30 minutes
+class MinuteThenHalfHour(CadencePolicy):
+    def __init__(self, minute_samples=60, minute=timedelta(minutes=1), halfhour=timedelta(minutes=30)):
+        self.minute_samples = minute_samples
+        self.minute = minute
+        self.halfhour = halfhour
+
+    def next_update(self, count, phase, metrics=None, previous=None, elapsed=None):
+        if phase == "minute" and count >= self.minute_samples:
+            return "halfhour", self.halfhour
+        elif phase == "minute":
+            return "minute", self.minute
+        return "halfhour", self.halfhour
+
+# Interval grows geometrically with each sample, capped at max_interval
+class DecaySchedule(CadencePolicy):
+    def __init__(self, initial=timedelta(minutes=1), factor=1.25, max_interval=timedelta(hours=1)):
+        self.initial = initial
+        self.factor = factor
+        self.max_interval = max_interval
+
+    def next_update(self, count, phase, metrics=None, previous=None, elapsed=None):
+        interval = self.initial * (self.factor ** max(count - 1, 0))
+        return "decay", min(interval, self.max_interval)
+
+# Wraps another policy and samples fast-moving tweets more often: when likes
+# plus retweets grow faster than `threshold_per_minute`, the interval is
+# capped at `boost_interval`
+class ViralBoost(CadencePolicy):
+    def __init__(self, base, threshold_per_minute=50, boost_interval=timedelta(minutes=1)):
+        self.base = base
+        self.threshold_per_minute = threshold_per_minute
+        self.boost_interval = boost_interval
+
+    def next_update(self, count, phase, metrics=None, previous=None, elapsed=None):
+        phase, interval = self.base.next_update(count, phase, metrics, previous, elapsed)
+        if metrics and previous and elapsed and elapsed.total_seconds() > 0:
+            gained = (metrics["likes"] + metrics["retweets"]) - (previous["likes"] + previous["retweets"])
+            if gained / (elapsed.total_seconds() / 60) >= self.threshold_per_minute:
+                interval = min(interval, self.boost_interval)
+        return phase, interval
+
+DEFAULT_POLICY = MinuteThenHalfHour()
+
+POLICIES = {
+    "minute_then_halfhour": MinuteThenHalfHour,
+    "decay": DecaySchedule,
+}
+
+# The policy config.py selects for the updaters
+def configured_policy(name=UPDATE_CADENCE, viral_boost=UPDATE_VIRAL_BOOST):
+    if name not in POLICIES:
+        raise ValueError(f"Unknown UPDATE_CADENCE {name!r}, expected one of: {', '.join(POLICIES)}")
+    policy = POLICIES[name]()
+    return ViralBoost(policy) if viral_boost else policy
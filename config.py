@@ -1,4 +1,21 @@
 # Configuration for the scraper version
 LIST_URL = "https://x.com/i/lists/1496399769266266112"
 MAX_TWEETS = 500
+DECK_URL = "https://pro.x.com/i/decks/1915696383484371263"  # the pro.x.com deck every tool opens
 SESSION_FILE = "auth.json"  # Your saved login session from `playwright codegen`
+CAPTURE_MODE = "observer"  # "observer" (MutationObserver push), "poll" (rescan every second) or "graphql"
+INGEST_MODE = "dom"  # updater/archivers: "dom" (read rendered articles) or "graphql" (read timeline JSON responses)
+ARCHIVER_LOG_LEVELS = {"archiver": "INFO"}  # per subsystem (engine/extract/scroll/writer), e.g. {"extract": "DEBUG"}; ARCHIVER_LOG env overrides
+UPDATE_CADENCE = "minute_then_halfhour"  # updaters: "minute_then_halfhour" (every minute for 60 samples, then every 30 min) or "decay" (interval grows 1.25x per sample, up to 1h)
+UPDATE_VIRAL_BOOST = False  # also sample tweets gaining 50+ likes/retweets a minute every minute, whatever the cadence
+UPDATE_HOURS_BACK = 24  # updaters track tweets up to this old
+DECK_COLUMN = None  # updaters: deck column to scan and scroll, by index (0 = leftmost) or title substring; None = every column
+USE_BROWSER_HOST = True  # connect to browser_host.py over CDP when it is running; otherwise each tool launches its own Chromium
+BROWSER_HOST_PORT = 9222  # CDP port of the shared browser (127.0.0.1 only)
+BLOCK_RESOURCES = True  # abort image/media/font and analytics requests in every tool's context (resources.py)
+RESOURCE_ALLOWLIST = {  # per tool: resource types ("image") or URL substrings ("pbs.twimg.com/media") to load anyway
+    "scraper": [],
+    "updater": [],
+    "updater_combined": [],
+    "archiver": [],
+}
@@ -2,16 +2,71 @@ import sqlite3
 import json
 from datetime import datetime, timedelta
 import os
+import threading
+from cadence import configured_policy
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))  # current script dir
 DB_PATH = os.path.join(BASE_DIR, "..", "dbs", "tweets.db")
 DB_PATH = os.path.abspath(DB_PATH)  # normalize the final path
+DB_PATH = os.environ.get("TWEETS_DB_PATH", DB_PATH)  # override for benchmarks / scratch DBs
 
-conn = sqlite3.connect(DB_PATH, check_same_thread=False)
-conn.row_factory = sqlite3.Row
-c = conn.cursor()
+SERIES_FIELDS = ["likes", "retweets", "replies", "views"]
+SCHEMA_VERSION = 3
+
+# Canonical timestamp encoding: UTC, space separator, whole seconds. This is
+# what CURRENT_TIMESTAMP produces, so Python-written values compare correctly
+# against SQLite defaults as plain strings.
+TS_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Connection tuning. scraper.py and updater.py write from separate processes
+# and the notebooks read at the same time, so use WAL and wait on locks
+# instead of failing with "database is locked".
+BUSY_TIMEOUT_MS = 30000
+MMAP_SIZE = 256 * 1024 * 1024
+CACHE_SIZE_KB = 64 * 1024
+
+_local = threading.local()
+
+def format_ts(dt):
+    return dt.strftime(TS_FORMAT)
+
+# Open a new tuned connection. readonly=True opens the file with mode=ro,
+# for analytics that must never take a write lock.
+def connect(path=None, readonly=False):
+    path = path or DB_PATH
+    if readonly:
+        conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True, timeout=BUSY_TIMEOUT_MS / 1000)
+    else:
+        conn = sqlite3.connect(path, timeout=BUSY_TIMEOUT_MS / 1000)
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+    conn.row_factory = sqlite3.Row
+    conn.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}")
+    conn.execute(f"PRAGMA mmap_size = {MMAP_SIZE}")
+    conn.execute(f"PRAGMA cache_size = -{CACHE_SIZE_KB}")
+    conn.execute("PRAGMA temp_store = MEMORY")
+    return conn
+
+# Per-thread, per-process shared connection. The pid check makes sure a
+# forked child never reuses its parent's handle.
+def get_conn(readonly=False):
+    key = "ro" if readonly else "rw"
+    cached = getattr(_local, key, None)
+    if cached is None or cached[0] != os.getpid() or cached[1] != DB_PATH:
+        cached = (os.getpid(), DB_PATH, connect(DB_PATH, readonly=readonly))
+        setattr(_local, key, cached)
+    return cached[2]
+
+def close_conn():
+    for key in ("ro", "rw"):
+        cached = getattr(_local, key, None)
+        if cached is not None and cached[0] == os.getpid():
+            cached[2].close()
+        setattr(_local, key, None)
 
 def init_db():
+    conn = get_conn()
+    c = conn.cursor()
     c.execute("""
         CREATE TABLE IF NOT EXISTS tweets (
             tweet_id TEXT PRIMARY KEY,
@@ -25,115 +80,326 @@ def init_db():
             engagement_timestamps TEXT DEFAULT '[]',
             update_phase TEXT DEFAULT 'minute',
             update_count INTEGER DEFAULT 0,
-            next_update_ts TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            next_update_ts TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            source_column TEXT
+        );
+    """)
+    # One row per engagement sample; t_offset is seconds since created_at
+    c.execute("""
+        CREATE TABLE IF NOT EXISTS tweet_metrics (
+            tweet_id TEXT NOT NULL,
+            t_offset INTEGER NOT NULL,
+            likes INTEGER,
+            retweets INTEGER,
+            replies INTEGER,
+            views INTEGER,
+            PRIMARY KEY (tweet_id, t_offset)
+        ) WITHOUT ROWID;
+    """)
+    # Same columns the notebooks used to read from tweets, rebuilt from tweet_metrics
+    c.execute("""
+        CREATE VIEW IF NOT EXISTS tweets_with_series AS
+        SELECT t.tweet_id, t.user_handle, t.text, t.created_at,
+               COALESCE(s.likes_series, '[]') AS likes_series,
+               COALESCE(s.retweets_series, '[]') AS retweets_series,
+               COALESCE(s.replies_series, '[]') AS replies_series,
+               COALESCE(s.views_series, '[]') AS views_series,
+               COALESCE(s.engagement_timestamps, '[]') AS engagement_timestamps,
+               t.update_phase, t.update_count, t.next_update_ts
+        FROM tweets t
+        LEFT JOIN (
+            SELECT tweet_id,
+                   json_group_array(likes) AS likes_series,
+                   json_group_array(retweets) AS retweets_series,
+                   json_group_array(replies) AS replies_series,
+                   json_group_array(views) AS views_series,
+                   json_group_array(t_offset) AS engagement_timestamps
+            FROM (SELECT * FROM tweet_metrics ORDER BY tweet_id, t_offset)
+            GROUP BY tweet_id
+        ) s ON s.tweet_id = t.tweet_id;
+    """)
+    # Last update time per tweet for the updaters' spacing rule (epoch seconds)
+    c.execute("""
+        CREATE TABLE IF NOT EXISTS recent_updates (
+            tweet_id TEXT PRIMARY KEY,
+            updated_at REAL NOT NULL
         );
     """)
+    c.execute("""
+        CREATE INDEX IF NOT EXISTS idx_recent_updates_time
+        ON recent_updates (updated_at)
+    """)
+    # Due-queue index for get_tweets_to_update
+    c.execute("""
+        CREATE INDEX IF NOT EXISTS idx_tweets_due
+        ON tweets (next_update_ts, created_at)
+    """)
     conn.commit()
 
+    version = c.execute("PRAGMA user_version").fetchone()[0]
+    if version < 1:
+        migrate_series_to_metrics_table()
+    if version < 2:
+        migrate_canonical_timestamps()
+    if version < 3:
+        migrate_add_source_column()
+    if version < SCHEMA_VERSION:
+        c.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        conn.commit()
+
+# Explode the old JSON-array series columns into tweet_metrics rows and
+# clear them so the tweet rows stop growing
+def migrate_series_to_metrics_table():
+    conn = get_conn()
+    c = conn.cursor()
+    c.execute("""
+        SELECT tweet_id, likes_series, retweets_series, replies_series,
+               views_series, engagement_timestamps
+        FROM tweets WHERE engagement_timestamps != '[]'
+    """)
+    rows = c.fetchall()
+    samples = []
+    for row in rows:
+        offsets = json.loads(row["engagement_timestamps"])
+        series = [json.loads(row[f"{field}_series"]) for field in SERIES_FIELDS]
+        for i, offset in enumerate(offsets):
+            values = [s[i] if i < len(s) else None for s in series]
+            samples.append((row["tweet_id"], offset, *values))
+
+    c.executemany("""
+        INSERT OR REPLACE INTO tweet_metrics (tweet_id, t_offset, likes, retweets, replies, views)
+        VALUES (?, ?, ?, ?, ?, ?)
+    """, samples)
+    c.execute("""
+        UPDATE tweets SET likes_series = '[]', retweets_series = '[]', replies_series = '[]',
+                          views_series = '[]', engagement_timestamps = '[]'
+        WHERE engagement_timestamps != '[]'
+    """)
+    conn.commit()
+    if rows:
+        print(f"[DB] Migrated {len(samples)} samples from {len(rows)} tweets into tweet_metrics")
+
+# Rewrite isoformat() values ("2025-05-01T12:00:01.123456") written by
+# older versions into the canonical encoding
+def migrate_canonical_timestamps():
+    conn = get_conn()
+    c = conn.cursor()
+    with conn:
+        for column in ("next_update_ts", "created_at"):
+            c.execute(f"""
+                UPDATE tweets SET {column} = strftime('%Y-%m-%d %H:%M:%S', {column})
+                WHERE {column} LIKE '%T%' AND strftime('%Y-%m-%d %H:%M:%S', {column}) IS NOT NULL
+            """)
+            if c.rowcount:
+                print(f"[DB] Rewrote {c.rowcount} {column} values to canonical timestamps")
+
+# Deck column each tweet was first seen in (see deck.py); NULL for older rows
+def migrate_add_source_column():
+    conn = get_conn()
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(tweets)")]
+    if "source_column" not in columns:
+        with conn:
+            conn.execute("ALTER TABLE tweets ADD COLUMN source_column TEXT")
+        print("[DB] Added tweets.source_column")
+
 def insert_new_tweets(tweets):
     init_db()
+    conn = get_conn()
+    c = conn.cursor()
     for tweet in tweets:
         try:
             c.execute("""
                 INSERT OR IGNORE INTO tweets (
-                    tweet_id, user_handle, text
-                ) VALUES (?, ?, ?)
+                    tweet_id, user_handle, text, source_column
+                ) VALUES (?, ?, ?, ?)
             """, (
-                tweet["id"], tweet["user"], tweet["text"]
+                tweet["id"], tweet["user"], tweet["text"], tweet.get("column")
             ))
         except Exception as e:
             print(f"[ERROR] Failed to insert tweet {tweet['id']}: {e}")
     conn.commit()
 
-def get_tweets_to_update(hours_back=24, limit=None):
+# Tweets due for an update, oldest due first. next_update_ts is never earlier
+# than created_at, so the lower bound keeps the idx_tweets_due range limited
+# to tweets from the last `hours_back` hours.
+DUE_QUERY = """
+    SELECT * FROM tweets INDEXED BY idx_tweets_due
+    WHERE next_update_ts <= ?
+      AND next_update_ts >= ?
+      AND created_at >= ?
+    ORDER BY next_update_ts ASC
+"""
+
+def due_query_params(hours_back=24):
     now = datetime.utcnow()
     cutoff = now - timedelta(hours=hours_back)
+    return [format_ts(now), format_ts(cutoff), format_ts(cutoff)]
+
+def get_tweets_to_update(hours_back=24, limit=None):
+    init_db()
+    conn = get_conn()
+    c = conn.cursor()
+    query = DUE_QUERY
+    params = due_query_params(hours_back)
     if limit:
-        c.execute("""
-            SELECT * FROM tweets
-            WHERE next_update_ts <= ?
-              AND created_at >= ?
-            ORDER BY next_update_ts ASC
-            LIMIT ?
-        """, (now.isoformat(), cutoff.isoformat(), int(limit)))
-    else:
-        c.execute("""
-            SELECT * FROM tweets
-            WHERE next_update_ts <= ?
-              AND created_at >= ?
-            ORDER BY next_update_ts ASC
-        """, (now.isoformat(), cutoff.isoformat()))
+        query += " LIMIT ?"
+        params.append(int(limit))
+    c.execute(query, params)
     return [dict(row) for row in c.fetchall()]
 
-def update_tweet_metrics(tweet_id, metrics):
-    c.execute("""
-        SELECT likes_series, retweets_series, replies_series, views_series,
-               engagement_timestamps, update_count, update_phase, created_at
-        FROM tweets WHERE tweet_id = ?
-    """, (tweet_id,))
-    row = c.fetchone()
-    if not row:
-        print(f"[ERROR] Tweet {tweet_id} not found in DB.")
-        return
-
-    # Parse data
-    likes = json.loads(row["likes_series"])
-    retweets = json.loads(row["retweets_series"])
-    replies = json.loads(row["replies_series"])
-    views = json.loads(row["views_series"])
-    timestamps = json.loads(row["engagement_timestamps"])
-    count = row["update_count"]
-    phase = row["update_phase"]
-    created_at = datetime.fromisoformat(row["created_at"])
-
-    # Calculate time offset in seconds
+# Schedule after one more sample, following the cadence policy (the one
+# config.py selects unless given)
+def next_schedule(count, phase, now, policy=None):
+    count += 1
+    phase, interval = (policy or configured_policy()).next_update(count, phase)
+    return count, phase, now + interval
+
+def update_tweet_metrics(tweet_id, metrics, policy=None):
+    update_tweet_metrics_bulk([(tweet_id, metrics)], policy=policy)
+
+# Apply many (tweet_id, metrics) samples with one read and one transaction.
+# Rows are rescheduled by `policy` (default: the configured one); previous
+# metrics aren't read here, so ViralBoost falls back to its base policy.
+def update_tweet_metrics_bulk(updates, chunk_size=500, policy=None):
+    policy = policy or configured_policy()
+    conn = get_conn()
+    c = conn.cursor()
+    updates = list(updates)
+    if not updates:
+        return 0
+
+    rows = {}
+    ids = list(dict.fromkeys(tweet_id for tweet_id, _ in updates))
+    for i in range(0, len(ids), chunk_size):
+        chunk = ids[i:i + chunk_size]
+        c.execute(f"""
+            SELECT tweet_id, update_count, update_phase, created_at
+            FROM tweets WHERE tweet_id IN ({','.join('?' * len(chunk))})
+        """, chunk)
+        rows.update({row["tweet_id"]: dict(row) for row in c.fetchall()})
+
     now = datetime.utcnow()
-    time_offset = int((now - created_at).total_seconds())
+    samples = []
+    schedules = {}
+    for tweet_id, metrics in updates:
+        row = rows.get(tweet_id)
+        if not row:
+            print(f"[ERROR] Tweet {tweet_id} not found in DB.")
+            continue
 
-    # Append metrics and timestamp
-    likes.append(metrics["likes"])
-    retweets.append(metrics["retweets"])
-    replies.append(metrics["replies"])
-    views.append(metrics["views"])
-    timestamps.append(time_offset)
+        # Calculate time offset in seconds
+        created_at = datetime.fromisoformat(row["created_at"])
+        time_offset = int((now - created_at).total_seconds())
+        samples.append((
+            tweet_id, time_offset,
+            metrics["likes"], metrics["retweets"], metrics["replies"], metrics["views"]
+        ))
 
-    # Update schedule
-    count += 1
-    if phase == "minute" and count >= 60:
-        phase = "halfhour"
-        next_ts = now + timedelta(minutes=30)
-    elif phase == "minute":
-        next_ts = now + timedelta(minutes=1)
-    else:
-        next_ts = now + timedelta(minutes=30)
+        count, phase, next_ts = next_schedule(row["update_count"], row["update_phase"], now, policy)
+        row["update_count"], row["update_phase"] = count, phase
+        schedules[tweet_id] = (count, phase, format_ts(next_ts), tweet_id)
+
+    write_updates(samples, list(schedules.values()))
+    return len(samples)
 
+# Write metric samples (tweet_id, t_offset, likes, retweets, replies, views)
+# and schedule rows (update_count, update_phase, next_update_ts, tweet_id)
+# in one transaction
+def write_updates(samples, schedules):
+    conn = get_conn()
+    c = conn.cursor()
+    with conn:
+        # Append the samples; cost no longer depends on how many came before
+        c.executemany("""
+            INSERT OR REPLACE INTO tweet_metrics (tweet_id, t_offset, likes, retweets, replies, views)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, samples)
+        c.executemany("""
+            UPDATE tweets SET
+                update_count = ?,
+                update_phase = ?,
+                next_update_ts = ?
+            WHERE tweet_id = ?
+        """, schedules)
+
+# Schedule state of tweets created in the last `hours_back` hours, optionally
+# only those inserted after `after_rowid` (for picking up new tweets cheaply)
+def get_schedule_rows(hours_back=24, after_rowid=0):
+    init_db()
+    conn = get_conn()
+    c = conn.cursor()
+    cutoff = datetime.utcnow() - timedelta(hours=hours_back)
     c.execute("""
-        UPDATE tweets SET
-            likes_series = ?,
-            retweets_series = ?,
-            replies_series = ?,
-            views_series = ?,
-            engagement_timestamps = ?,
-            update_count = ?,
-            update_phase = ?,
-            next_update_ts = ?
-        WHERE tweet_id = ?
-    """, (
-        json.dumps(likes),
-        json.dumps(retweets),
-        json.dumps(replies),
-        json.dumps(views),
-        json.dumps(timestamps),
-        count,
-        phase,
-        next_ts.isoformat(),
-        tweet_id
-    ))
-    conn.commit()
+        SELECT rowid, tweet_id, created_at, update_count, update_phase, next_update_ts
+        FROM tweets
+        WHERE rowid > ? AND created_at >= ?
+        ORDER BY rowid
+    """, (after_rowid, format_ts(cutoff)))
+    return [dict(row) for row in c.fetchall()]
+
+def load_recent_updates(since):
+    init_db()
+    conn = get_conn()
+    c = conn.cursor()
+    c.execute("""
+        SELECT tweet_id, updated_at FROM recent_updates
+        WHERE updated_at >= ?
+        ORDER BY updated_at
+    """, (since,))
+    return [(row["tweet_id"], row["updated_at"]) for row in c.fetchall()]
+
+# Upsert changed (tweet_id, updated_at) rows and drop expired ones
+def save_recent_updates(rows, prune_before=None):
+    init_db()
+    conn = get_conn()
+    c = conn.cursor()
+    with conn:
+        c.executemany("""
+            INSERT INTO recent_updates (tweet_id, updated_at) VALUES (?, ?)
+            ON CONFLICT(tweet_id) DO UPDATE SET updated_at = excluded.updated_at
+        """, rows)
+        if prune_before is not None:
+            c.execute("DELETE FROM recent_updates WHERE updated_at < ?", (prune_before,))
+
+# Series for one tweet in the old column layout (likes_series, ..., engagement_timestamps)
+def get_metric_series(tweet_id):
+    return get_all_metric_series([tweet_id]).get(tweet_id, _empty_series())
+
+# Series for many tweets (all tracked tweets when tweet_ids is None)
+def get_all_metric_series(tweet_ids=None):
+    conn = get_conn()
+    c = conn.cursor()
+    query = "SELECT * FROM tweet_metrics"
+    params = ()
+    if tweet_ids is not None:
+        tweet_ids = list(tweet_ids)
+        query += f" WHERE tweet_id IN ({','.join('?' * len(tweet_ids))})"
+        params = tweet_ids
+    query += " ORDER BY tweet_id, t_offset"
+
+    result = {}
+    for row in c.execute(query, params).fetchall():
+        series = result.setdefault(row["tweet_id"], _empty_series())
+        for field in SERIES_FIELDS:
+            series[f"{field}_series"].append(row[field])
+        series["engagement_timestamps"].append(row["t_offset"])
+    return result
+
+def _empty_series():
+    series = {f"{field}_series": [] for field in SERIES_FIELDS}
+    series["engagement_timestamps"] = []
+    return series
+
+def tweet_exists(tweet_id):
+    c = get_conn().cursor()
+    c.execute("SELECT 1 FROM tweets WHERE tweet_id = ?", (tweet_id,))
+    return c.fetchone() is not None
 
 def get_all_tracked_ids():
+    conn = get_conn()
+    c = conn.cursor()
     c.execute("SELECT tweet_id FROM tweets")
     return [row[0] for row in c.fetchall()]
 
-def update_tweet_metrics_by_id(tweet_id, metrics):
-    update_tweet_metrics(tweet_id, metrics)
\ No newline at end of file
+def update_tweet_metrics_by_id(tweet_id, metrics, policy=None):
+    update_tweet_metrics(tweet_id, metrics, policy)
\ No newline at end of file
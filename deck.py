@@ -0,0 +1,160 @@
+from extraction import ARTICLE_TO_DICT_JS, normalize_article
+from scrolling import DECK_SCROLL_JS, ScrollController
+
+# Every column's articles (or just `column`'s, see scrolling.scroll_container)
+# and scroll position, in one round trip
+SCAN_DECK_JS = f"""
+([column]) => {{
+    const deck = {DECK_SCROLL_JS};
+    const toDict = {ARTICLE_TO_DICT_JS};
+    let columns = deck.list();
+    if (column !== null) {{
+        const target = deck.target(column);
+        columns = columns.filter((c) => c.el === target);
+    }}
+    return columns.map((c) => ({{
+        key: c.key,
+        index: c.index,
+        title: c.title,
+        position: c.el.scrollTop,
+        maxScroll: c.el.scrollHeight - c.el.clientHeight,
+        articles: Array.from(c.el.querySelectorAll('article')).map(toDict),
+    }}));
+}}
+"""
+
+# Scroll several columns at once: [[key, amount], ...], amount null = to top,
+# key null = every column not moved yet (all of them, or just `column`)
+SCROLL_DECK_JS = f"""
+([moves, column]) => {{
+    const deck = {DECK_SCROLL_JS};
+    let columns = deck.list();
+    if (column !== null) {{
+        const target = deck.target(column);
+        columns = columns.filter((c) => c.el === target);
+    }}
+    const positions = {{}};
+    for (const [key, amount] of moves) {{
+        const matched = key === null ? columns.filter((c) => !(c.key in positions)) : columns.filter((c) => c.key === key);
+        for (const c of matched) {{
+            if (amount === null) c.el.scrollTop = 0;
+            else c.el.scrollTop += amount;
+            positions[c.key] = {{
+                index: c.index,
+                title: c.title,
+                position: c.el.scrollTop,
+                maxScroll: c.el.scrollHeight - c.el.clientHeight,
+            }};
+        }}
+    }}
+    return positions;
+}}
+"""
+
+# Scroll position, step and newest tweet of one deck column. Columns are
+# keyed by index and title ("0:Home"), so two columns with the same heading
+# keep their own state.
+class ColumnState:
+    def __init__(self, key, title, index=None, step=1500, min_step=400, max_step=4000):
+        self.key = key
+        self.title = title
+        self.index = index
+        self.position = 0
+        self.max_scroll = 0
+        self.step = step
+        self.min_step = min_step
+        self.max_step = max_step
+        self.stalls = 0
+        self.newest_id = 0
+        self.scanned = 0
+        self.new = 0  # articles newer than newest_id as of the previous scan
+
+    @property
+    def at_bottom(self):
+        return self.position >= self.max_scroll - 1
+
+    def moved(self, position, max_scroll):
+        if position > self.position or max_scroll > self.max_scroll:
+            self.stalls = 0
+            self.step = min(self.max_step, int(self.step * 1.5))
+        else:
+            self.stalls += 1
+            self.step = max(self.min_step, self.step // 2)
+        self.position, self.max_scroll = position, max_scroll
+
+# Reads and scrolls all deck columns from one page. scan() returns every
+# rendered tweet tagged with its source column ("column"); scroll() moves each
+# column by its own adaptive step in a single evaluate, then waits for the
+# deck to deliver content (scrolling.ScrollController).
+class DeckScanner:
+    def __init__(self, page, column=None, step=1500, wait_ms=2000, max_wait_ms=8000):
+        self.page = page
+        self.column = column
+        self.step = step
+        self.columns = {}
+        self.controller = ScrollController(page, wait_ms=wait_ms, max_wait_ms=max_wait_ms,
+                                           scroll_fn=self._scroll_columns)
+        self._targets = None
+
+    def _state(self, key, title=None, index=None):
+        if key not in self.columns:
+            self.columns[key] = ColumnState(key, title or key, index, step=self.step)
+        return self.columns[key]
+
+    def scan(self):
+        tweets = []
+        for column in self.page.evaluate(SCAN_DECK_JS, [self.column]):
+            state = self._state(column["key"], column["title"], column["index"])
+            state.position, state.max_scroll = column["position"], column["maxScroll"]
+            state.scanned = len(column["articles"])
+            previous_newest = state.newest_id
+            state.new = 0
+            for raw in column["articles"]:
+                tweet = normalize_article(raw)
+                tweet["column"] = state.title
+                tweet_id = _as_int(tweet["id"])
+                if tweet_id > previous_newest:
+                    state.new += 1
+                    state.newest_id = max(state.newest_id, tweet_id)
+                tweets.append(tweet)
+        return tweets
+
+    # Scroll the given column keys (default: all, including ones no scan has
+    # seen yet). A column at the bottom only counts as moving again once the
+    # deck has loaded more into it.
+    def scroll(self, keys=None):
+        self._targets = keys
+        return self.controller.scroll()
+
+    def _scroll_columns(self, page, _step):
+        if self._targets:
+            moves = [[key, self._state(key).step] for key in self._targets]
+        else:
+            moves = [[key, state.step] for key, state in self.columns.items()] + [[None, self.step]]
+        positions = page.evaluate(SCROLL_DECK_JS, [moves, self.column])
+        for key, column in positions.items():
+            self._state(key, column["title"], column["index"]).moved(column["position"], column["maxScroll"])
+        return positions
+
+    def scroll_to_top(self):
+        self.page.evaluate(SCROLL_DECK_JS, [[[None, None]], self.column])
+        for state in self.columns.values():
+            state.position = 0
+            state.stalls = 0
+            state.step = self.step
+        self.controller.reset()
+
+    # True once every column has stopped moving for `limit` scrolls
+    def stalled(self, limit):
+        states = list(self.columns.values())
+        return not states or all(state.stalls >= limit for state in states)
+
+    def summary(self):
+        return ", ".join(f"{state.title}: {state.scanned} articles ({state.new} new)"
+                         for state in self.columns.values())
+
+def _as_int(tweet_id):
+    try:
+        return int(tweet_id)
+    except (TypeError, ValueError):
+        return 0
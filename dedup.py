@@ -0,0 +1,108 @@
+from collections import OrderedDict
+import hashlib
+
+# Twitter snowflake IDs carry their creation time: ms since this epoch, << 22
+TWITTER_EPOCH_MS = 1288834974657
+
+def snowflake_ms(tweet_id):
+    return (tweet_id >> 22) + TWITTER_EPOCH_MS
+
+# Two-generation Bloom filter: when the current generation reaches capacity
+# it becomes the previous one and a fresh one starts, so memory stays fixed
+# and the most recent 1-2x capacity items are remembered.
+class RotatingBloomFilter:
+    def __init__(self, capacity=1_000_000, hashes=7, bits_per_item=10):
+        self.capacity = capacity
+        self.hashes = hashes
+        self.size = capacity * bits_per_item
+        self.current = bytearray(self.size // 8 + 1)
+        self.previous = None
+        self.count = 0
+
+    def _positions(self, key):
+        if not isinstance(key, int):
+            key = int.from_bytes(hashlib.blake2b(str(key).encode(), digest_size=8).digest(), "little")
+        # Double hashing from two cheap 64-bit multiplicative mixes
+        h1 = ((key ^ (key >> 31)) * 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF
+        h2 = (((key ^ (key >> 29)) * 0xC2B2AE3D27D4EB4F) & 0xFFFFFFFFFFFFFFFF) | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def add(self, key):
+        if self.count >= self.capacity:
+            self.previous = self.current
+            self.current = bytearray(self.size // 8 + 1)
+            self.count = 0
+        for pos in self._positions(key):
+            self.current[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, key):
+        positions = self._positions(key)
+        for bits in (self.current, self.previous):
+            if bits is not None and all(bits[pos >> 3] & (1 << (pos & 7)) for pos in positions):
+                return True
+        return False
+
+# Bounded replacement for the `seen_ids = set()` in the long-running loops.
+#
+# IDs are kept as ints in an LRU of at most `max_size` entries; with
+# `window_ms` set, IDs whose snowflake time is that much older than the newest
+# ID seen are also dropped. IDs that fell out can still be recognised through
+# an optional Bloom filter, with its positives confirmed by `fallback(tweet_id)`
+# (typically a primary-key lookup in the DB). Memory stays flat no matter how
+# long the process runs.
+class SeenIds:
+    def __init__(self, max_size=20_000, window_ms=None, bloom=None, fallback=None):
+        self.max_size = max_size
+        self.window_ms = window_ms
+        self.bloom = bloom
+        self.fallback = fallback
+        self._ids = OrderedDict()
+        self._newest_ms = 0
+        self._adds_since_sweep = 0
+        self.total_added = 0
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __contains__(self, tweet_id):
+        key = _key(tweet_id)
+        if key in self._ids:
+            self._ids.move_to_end(key)
+            return True
+        if self.bloom is not None and key in self.bloom:
+            return self.fallback is not None and self.fallback(str(tweet_id))
+        return False
+
+    def add(self, tweet_id):
+        key = _key(tweet_id)
+        if key not in self._ids:
+            self.total_added += 1
+        self._ids[key] = None
+        self._ids.move_to_end(key)
+        if self.bloom is not None:
+            self.bloom.add(key)
+        if isinstance(key, int):
+            self._newest_ms = max(self._newest_ms, snowflake_ms(key))
+        self._evict()
+
+    def _evict(self):
+        while len(self._ids) > self.max_size:
+            self._ids.popitem(last=False)
+        if self.window_ms is None:
+            return
+        # The time-window sweep is O(n), so only run it every so often
+        self._adds_since_sweep += 1
+        if self._adds_since_sweep < max(1000, self.max_size // 10):
+            return
+        self._adds_since_sweep = 0
+        cutoff = self._newest_ms - self.window_ms
+        expired = [key for key in self._ids if isinstance(key, int) and snowflake_ms(key) < cutoff]
+        for key in expired:
+            del self._ids[key]
+
+def _key(tweet_id):
+    try:
+        return int(tweet_id)
+    except (TypeError, ValueError):
+        return tweet_id
@@ -0,0 +1,63 @@
+from metrics import METRIC_LABELS_JS, parse_metrics
+
+# In-page helper that turns one <article> node into a plain object. Kept as a
+# standalone JS function so other injected scripts can reuse it.
+ARTICLE_TO_DICT_JS = rf"""
+(article) => {{
+    const metricLabels = {METRIC_LABELS_JS};
+    const statusLink = article.querySelector('a[href*="/status/"]');
+    let id = null;
+    if (statusLink) {{
+        const href = statusLink.getAttribute('href') || '';
+        const match = href.match(/\/status\/(\d+)/);
+        id = match ? match[1] : href.split('/').pop();
+    }}
+
+    const handleElem = article.querySelector("a[role='link'] span");
+    const textBlocks = Array.from(article.querySelectorAll('div[lang]')).map(d => d.innerText);
+    const timeElem = article.querySelector('time[datetime]');
+
+    // Reposts carry a "X reposted" social context; the author is then the original poster
+    let originalPoster = null;
+    const social = article.querySelector('[data-testid="socialContext"]');
+    if (social && /repost/i.test(social.innerText)) {{
+        const handle = article.querySelector('div[data-testid="User-Name"] div[dir="ltr"] > span > span');
+        const text = handle ? handle.textContent : null;
+        if (text && !/reposted/i.test(text)) originalPoster = text;
+    }}
+
+    return {{
+        id: id,
+        user: handleElem ? handleElem.innerText : 'unknown',
+        text: textBlocks.join(' ').trim(),
+        created_at: timeElem ? timeElem.getAttribute('datetime') : null,
+        original_poster: originalPoster,
+        labels: metricLabels(article),
+    }};
+}}
+"""
+
+# Extract every article currently in the DOM with a single evaluate call
+EXTRACT_ARTICLES_JS = f"""
+(selector) => {{
+    const toDict = {ARTICLE_TO_DICT_JS};
+    return Array.from(document.querySelectorAll(selector)).map(toDict);
+}}
+"""
+
+# Convert the raw in-page result into the tweet dicts the rest of the code uses
+def normalize_article(raw):
+    return {
+        "id": raw.get("id"),
+        "user": raw.get("user") or "unknown",
+        "text": raw.get("text") or "",
+        "created_at": raw.get("created_at"),
+        "original_poster": raw.get("original_poster"),
+        "column": raw.get("column"),
+        "metrics": parse_metrics(raw.get("labels")),
+    }
+
+# Return id, handle, text, timestamp and metrics for all loaded articles
+# in one Playwright round trip
+def extract_articles(page, selector="article"):
+    return [normalize_article(raw) for raw in page.evaluate(EXTRACT_ARTICLES_JS, selector)]
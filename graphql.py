@@ -0,0 +1,151 @@
+from datetime import datetime, timezone
+from urllib.parse import parse_qs, urlencode, urlsplit
+import json
+
+# Timeline payloads arrive on these GraphQL operations; anything else under
+# /graphql/ (user lookups, settings, ...) is ignored
+TIMELINE_OPERATIONS = (
+    "HomeTimeline",
+    "HomeLatestTimeline",
+    "ListLatestTweetsTimeline",
+    "UserTweets",
+    "SearchTimeline",
+    "TweetDetail",
+)
+
+def is_timeline_url(url):
+    return "/graphql/" in url and any(op in url for op in TIMELINE_OPERATIONS)
+
+# Twitter's legacy created_at format: "Wed Oct 10 20:19:24 +0000 2018"
+def parse_created_at(value):
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, "%a %b %d %H:%M:%S %z %Y").astimezone(timezone.utc)
+    except ValueError:
+        try:
+            return datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+
+def _unwrap(result):
+    # Tweets with visibility restrictions are wrapped one level deeper
+    if result and result.get("__typename") == "TweetWithVisibilityResults":
+        return result.get("tweet")
+    return result
+
+def _screen_name(tweet):
+    user = (((tweet.get("core") or {}).get("user_results") or {}).get("result")) or {}
+    return ((user.get("legacy") or {}).get("screen_name")
+            or (user.get("core") or {}).get("screen_name")
+            or "unknown")
+
+def _to_int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
+# Convert one tweet_results.result object into the tweet dict shape used by
+# the DOM extractors, with exact engagement counts
+def parse_tweet_result(result):
+    tweet = _unwrap(result)
+    if not tweet or not tweet.get("legacy") or not tweet.get("rest_id"):
+        return None
+
+    author = _screen_name(tweet)
+    original_poster = None
+    retweeted = _unwrap(((tweet["legacy"].get("retweeted_status_result")) or {}).get("result"))
+    if retweeted and retweeted.get("legacy"):
+        # Reposts: keep the reposter as user and report the original tweet
+        original_poster = _screen_name(retweeted)
+        tweet = retweeted
+
+    legacy = tweet["legacy"]
+    note = (((tweet.get("note_tweet") or {}).get("note_tweet_results") or {}).get("result")) or {}
+    return {
+        "id": tweet["rest_id"],
+        "user": author,
+        "original_poster": original_poster,
+        "text": note.get("text") or legacy.get("full_text") or "",
+        "created_at": parse_created_at(legacy.get("created_at")),
+        "metrics": {
+            "likes": _to_int(legacy.get("favorite_count")),
+            "retweets": _to_int(legacy.get("retweet_count")),
+            "replies": _to_int(legacy.get("reply_count")),
+            "views": _to_int((tweet.get("views") or {}).get("count")),
+        },
+    }
+
+# Walk a timeline payload and return (tweets, bottom_cursor). Only timeline
+# items are collected, so quoted tweets nested inside them are not.
+def parse_timeline_response(payload):
+    tweets = []
+    cursor = None
+    stack = [payload]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, list):
+            stack.extend(reversed(node))
+            continue
+        if not isinstance(node, dict):
+            continue
+
+        if node.get("cursorType") == "Bottom" and node.get("value"):
+            cursor = node["value"]
+        item = node.get("itemContent")
+        if isinstance(item, dict) and "tweet_results" in item:
+            tweet = parse_tweet_result((item.get("tweet_results") or {}).get("result"))
+            if tweet:
+                tweets.append(tweet)
+            continue
+        stack.extend(reversed(list(node.values())))
+    return tweets, cursor
+
+# Collects parsed tweets from timeline responses as the page fetches them.
+# Playwright delivers the events while the sync API is waiting on any call,
+# so callers pump with page.wait_for_timeout() and then drain().
+class TimelineInterceptor:
+    def __init__(self):
+        self.tweets = []
+        self.cursor = None
+        self.responses = 0
+
+    def attach(self, page):
+        page.on("response", self.on_response)
+        return self
+
+    def on_response(self, response):
+        if not is_timeline_url(response.url):
+            return
+        try:
+            payload = json.loads(response.body())
+        except Exception as e:
+            print(f"[GRAPHQL WARN] Could not read {response.url}: {e}")
+            return
+        tweets, cursor = parse_timeline_response(payload)
+        self.responses += 1
+        self.tweets.extend(tweets)
+        if cursor:
+            self.cursor = cursor
+
+    def drain(self):
+        tweets, self.tweets = self.tweets, []
+        return tweets
+
+    def wait(self, page, timeout_ms=1000):
+        page.wait_for_timeout(timeout_ms)
+        return self.drain()
+
+# Make the page's next timeline request start at `cursor` (a Bottom cursor
+# from an earlier run), so a reload lands where that run stopped instead of
+# at the top. One-shot: later pagination requests go out untouched.
+def resume_at_cursor(page, cursor):
+    def rewrite(route):
+        url = urlsplit(route.request.url)
+        params = parse_qs(url.query)
+        variables = json.loads(params.get("variables", ["{}"])[0])
+        variables["cursor"] = cursor
+        params["variables"] = [json.dumps(variables, separators=(",", ":"))]
+        route.continue_(url=url._replace(query=urlencode(params, doseq=True)).geturl())
+    page.route(is_timeline_url, rewrite, times=1)
@@ -0,0 +1,58 @@
+import json
+import os
+import time
+
+# Liveness and progress file for scripts run under watchdog.py. The
+# supervisor passes the path in TT_HEARTBEAT_FILE; a script calls beat() from
+# its main loop (never from a helper thread, or a hung loop would still look
+# alive) and count() when it gets work done. Outside the watchdog both are
+# no-ops. mark() records one-off milestones such as "ready" (page loaded,
+# first article seen), which the watchdog waits for before starting the
+# scripts that depend on this one.
+HEARTBEAT_ENV = "TT_HEARTBEAT_FILE"
+MIN_INTERVAL = 1.0  # seconds between writes; beats in between only update memory
+
+_counters = {}
+_marks = {}
+_last_write = 0.0
+
+def beat(force=False):
+    global _last_write
+    path = os.environ.get(HEARTBEAT_ENV)
+    if not path:
+        return
+    now = time.time()
+    if not force and now - _last_write < MIN_INTERVAL:
+        return
+    # Write-then-rename so the supervisor never reads a half-written file.
+    # On Windows the rename fails while the supervisor has the file open;
+    # skip this write (the next beat retries) rather than crash the worker.
+    tmp = f"{path}.tmp"
+    try:
+        with open(tmp, "w") as f:
+            json.dump({"pid": os.getpid(), "time": now, "counters": _counters, "marks": _marks}, f)
+        os.replace(tmp, path)
+    except OSError:
+        return
+    _last_write = now
+
+# Add to a cumulative counter (e.g. "tweets") and beat
+def count(name, amount=1):
+    _counters[name] = _counters.get(name, 0) + amount
+    beat()
+
+# Record when `event` first happened (e.g. "ready", "first_tweet") and beat
+# right away so the supervisor sees it
+def mark(event):
+    if event in _marks:
+        return
+    _marks[event] = time.time()
+    beat(force=True)
+
+# The last heartbeat written to `path`, or None
+def read(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
@@ -0,0 +1,85 @@
+import re
+
+METRIC_KEYS = ("likes", "retweets", "replies", "views")
+
+# In-page helper: the aria-labels an article's counts can be read from. The
+# action bar's role=group label carries all four exact counts ("5 replies,
+# 12 reposts, 1234 likes, 3 bookmarks, 56789 views"); the per-button labels
+# ("1.2K Likes. Like") are only looked up when there is no group label.
+METRIC_LABELS_JS = r"""
+(article) => {
+    const group = article.querySelector('[role="group"][aria-label]');
+    if (group) return { group: group.getAttribute('aria-label') };
+    const labelFor = (needle) => {
+        const el = article.querySelector(`[aria-label*="${needle}"]`);
+        return el ? el.getAttribute('aria-label') : null;
+    };
+    return {
+        replies: labelFor('Repl'),
+        retweets: labelFor('Repost'),
+        likes: labelFor('Like'),
+        views: labelFor('View'),
+    };
+}
+"""
+
+# A count as X renders it: digits with optional thousands separators
+# (",", ".", spaces, NBSP/narrow NBSP, apostrophe), an optional decimal part
+# and an optional K/M/B suffix ("1.2K", "12,345", "1 234", "3,5 M")
+_NUMBER = r"(\d(?:[\d.,'\u00a0\u202f]|\s(?=\d{3}\b))*)\s*([KMB](?![a-z]))?"
+_COUNT_RE = re.compile(_NUMBER, re.IGNORECASE)
+_GROUP_RE = re.compile(_NUMBER + r"\s+(repl(?:y|ies)|reposts?|retweets?|likes?|views?)\b", re.IGNORECASE)
+_GROUPING_RE = re.compile(r"[\s'\u00a0\u202f]")
+
+_MULTIPLIERS = {"": 1, "K": 1_000, "M": 1_000_000, "B": 1_000_000_000}
+_GROUP_KEYS = {"repl": "replies", "repo": "retweets", "retw": "retweets", "like": "likes", "view": "views"}
+
+def _to_int(digits, suffix):
+    suffix = suffix.upper() if suffix else ""
+    if digits.isdigit():
+        return int(digits) * _MULTIPLIERS[suffix]
+    digits = _GROUPING_RE.sub("", digits).rstrip(".,")
+    separators = [c for c in digits if c in ".,"]
+    if separators:
+        last = separators[-1]
+        decimals = len(digits) - digits.rfind(last) - 1
+        if len(set(separators)) == 2 or (len(separators) == 1 and (suffix or decimals != 3)):
+            # "1,234.5" / "1.234,5" / "1.2K" / "1,5": the last one is the decimal point
+            whole, _, fraction = digits.rpartition(last)
+            digits = whole.replace(".", "").replace(",", "") + "." + fraction
+        else:
+            # "12,345" / "1.234.567": grouping only
+            digits = digits.replace(last, "")
+    try:
+        return int(round(float(digits) * _MULTIPLIERS[suffix]))
+    except ValueError:
+        return 0
+
+def parse_count(label):
+    """The first count in an aria-label such as "1.2K Likes. Like" (0 if none)"""
+    if not label:
+        return 0
+    match = _COUNT_RE.search(label)
+    return _to_int(match.group(1), match.group(2)) if match else 0
+
+def parse_group_label(label):
+    """All four counts from an action bar label, in one pass (missing ones are 0)"""
+    metrics = dict.fromkeys(METRIC_KEYS, 0)
+    for digits, suffix, word in _GROUP_RE.findall(label or ""):
+        metrics[_GROUP_KEYS[word[:4].lower()]] = _to_int(digits, suffix)
+    return metrics
+
+def parse_metrics(labels):
+    """Metrics dict from METRIC_LABELS_JS output: the group label when present,
+    else the per-button labels"""
+    labels = labels or {}
+    if labels.get("group"):
+        return parse_group_label(labels["group"])
+    return {key: parse_count(labels.get(key)) for key in METRIC_KEYS}
+
+def read_metrics(article):
+    """Metrics of one article Locator in a single round trip"""
+    try:
+        return parse_metrics(article.evaluate(METRIC_LABELS_JS))
+    except Exception:
+        return dict.fromkeys(METRIC_KEYS, 0)
@@ -0,0 +1,87 @@
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+from extraction import ARTICLE_TO_DICT_JS, normalize_article
+from scrolling import DECK_SCROLL_JS
+
+# Installs a MutationObserver that converts every newly added <article> into a
+# plain object, tagged with its deck column, and queues it in window.__ttQueue.
+# Existing articles are queued once at install time so nothing on screen is
+# missed.
+INSTALL_OBSERVER_JS = f"""
+([rootSelector, maxSeen]) => {{
+    if (window.__ttObserver) return false;
+    const toDict = {ARTICLE_TO_DICT_JS};
+    const deck = {DECK_SCROLL_JS};
+    const root = (rootSelector && document.querySelector(rootSelector)) || document.body;
+    const seen = new Set();
+    window.__ttQueue = [];
+
+    const enqueue = (article) => {{
+        const tweet = toDict(article);
+        if (!tweet.id || seen.has(tweet.id)) return;
+        tweet.column = deck.columnOf(article);
+        seen.add(tweet.id);
+        // Sets iterate in insertion order, so this forgets the oldest IDs first
+        for (const old of seen) {{
+            if (seen.size <= maxSeen) break;
+            seen.delete(old);
+        }}
+        window.__ttQueue.push(tweet);
+    }};
+    const scan = (node) => {{
+        if (node.nodeType !== Node.ELEMENT_NODE) return;
+        if (node.tagName === 'ARTICLE') {{
+            enqueue(node);
+            return;
+        }}
+        node.querySelectorAll('article').forEach(enqueue);
+    }};
+
+    window.__ttObserver = new MutationObserver((mutations) => {{
+        for (const mutation of mutations) {{
+            mutation.addedNodes.forEach(scan);
+        }}
+    }});
+    window.__ttObserver.observe(root, {{ childList: true, subtree: true }});
+    root.querySelectorAll('article').forEach(enqueue);
+    return true;
+}}
+"""
+
+# Returns and clears the queue, or null when the observer is gone (reload)
+DRAIN_JS = """
+() => {
+    if (!window.__ttObserver) return null;
+    const items = window.__ttQueue;
+    window.__ttQueue = [];
+    return items;
+}
+"""
+
+QUEUE_READY_JS = "() => !window.__ttObserver || window.__ttQueue.length > 0"
+
+# Push-based article capture: Python only hears about articles the page added
+class ArticleObserver:
+    def __init__(self, page, root_selector=None, max_seen=5000):
+        self.page = page
+        self.root_selector = root_selector
+        self.max_seen = max_seen
+
+    def install(self):
+        return self.page.evaluate(INSTALL_OBSERVER_JS, [self.root_selector, self.max_seen])
+
+    # Drain whatever is queued right now, reinstalling after a navigation
+    def drain(self):
+        items = self.page.evaluate(DRAIN_JS)
+        if items is None:
+            self.install()
+            items = self.page.evaluate(DRAIN_JS) or []
+        return [normalize_article(item) for item in items]
+
+    # Block until the page queues something (or timeout_ms passes), then drain.
+    # The check runs inside the page, so an idle timeline costs no round trips.
+    def wait(self, timeout_ms=30000, polling_ms=50):
+        try:
+            self.page.wait_for_function(QUEUE_READY_JS, timeout=timeout_ms, polling=polling_ms)
+        except PlaywrightTimeoutError:
+            pass
+        return self.drain()
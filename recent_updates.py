@@ -0,0 +1,74 @@
+from collections import OrderedDict
+from datetime import datetime, timezone
+import json
+import os
+
+import db
+
+# Last-update times for the updaters' minimum-spacing rule. Only entries
+# inside the spacing window are kept: the in-memory map evicts anything older
+# and the DB table is pruned the same way, so startup and per-cycle cost
+# depend on the window, not on how many tweets were ever updated.
+class RecentUpdates:
+    def __init__(self, window_seconds=50, legacy_path="recent_updates.json"):
+        self.window_seconds = window_seconds
+        self.legacy_path = legacy_path
+        self._times = OrderedDict()  # tweet_id -> epoch seconds, oldest first
+        self._dirty = {}
+        self._last_prune = None
+
+    def __len__(self):
+        return len(self._times)
+
+    def load(self, now):
+        self._import_legacy(now)
+        for tweet_id, updated_at in db.load_recent_updates(now - self.window_seconds):
+            self._times[tweet_id] = updated_at
+        return self
+
+    def due(self, tweet_id, now):
+        updated_at = self._times.get(tweet_id)
+        return updated_at is None or now - updated_at >= self.window_seconds
+
+    def mark(self, tweet_id, now):
+        self._times[tweet_id] = now
+        self._times.move_to_end(tweet_id)
+        self._dirty[tweet_id] = now
+
+    # Evict expired entries and persist only what changed since the last
+    # flush. The DB table is pruned at most once per window: rows only expire
+    # that fast, and load() ignores stale ones anyway.
+    def flush(self, now):
+        cutoff = now - self.window_seconds
+        while self._times:
+            tweet_id, updated_at = next(iter(self._times.items()))
+            if updated_at >= cutoff:
+                break
+            self._times.popitem(last=False)
+        if not self._dirty:
+            return 0
+        prune = self._last_prune is None or now - self._last_prune >= self.window_seconds
+        if prune:
+            self._last_prune = now
+        db.save_recent_updates(list(self._dirty.items()), prune_before=cutoff if prune else None)
+        written = len(self._dirty)
+        self._dirty = {}
+        return written
+
+    # One-time import of the old recent_updates.json, which is then set aside
+    def _import_legacy(self, now):
+        if not self.legacy_path or not os.path.exists(self.legacy_path):
+            return
+        with open(self.legacy_path, "r") as f:
+            data = json.load(f)
+        rows = []
+        for tweet_id, value in data.items():
+            updated_at = datetime.fromisoformat(value)
+            if updated_at.tzinfo is None:
+                updated_at = updated_at.replace(tzinfo=timezone.utc)
+            updated_at = updated_at.timestamp()
+            if now - updated_at < self.window_seconds:
+                rows.append((tweet_id, updated_at))
+        db.save_recent_updates(rows)
+        os.replace(self.legacy_path, self.legacy_path + ".bak")
+        print(f"[UPDATER] Imported {len(rows)} of {len(data)} entries from {self.legacy_path}")
@@ -0,0 +1,91 @@
+from collections import Counter
+
+from config import BLOCK_RESOURCES, RESOURCE_ALLOWLIST
+
+# Request types no tool reads: we extract text, ids, times and metrics from
+# the DOM or the timeline JSON, never the pixels
+BLOCKED_TYPES = ("image", "media", "font")
+
+# Client telemetry and ad/analytics endpoints the timeline fires on every scroll
+ANALYTICS_PATTERNS = (
+    "/1.1/jot/",
+    "/i/api/1.1/jot/",
+    "/client_event",
+    "/scribe",
+    "ads-api.x.com",
+    "ads-twitter.com",
+    "analytics.twitter.com",
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+)
+
+# Aborts image/media/font and analytics requests for every page of a context
+# before they leave the browser. `allow` entries are resource types (e.g.
+# "image") or URL substrings (e.g. "pbs.twimg.com/media") that go through
+# anyway. `blocked` counts aborted requests per type ("analytics" for the
+# telemetry patterns).
+#
+# Trade-off: Playwright turns the HTTP cache off for any page or context with
+# a route, so with blocking on every reload re-downloads X's JS/CSS bundles.
+# The images and video we skip outweigh that on a scrolling timeline; set
+# BLOCK_RESOURCES = False where reloads dominate.
+class ResourcePolicy:
+    def __init__(self, allow=(), block_types=BLOCKED_TYPES, block_patterns=ANALYTICS_PATTERNS):
+        allow = list(allow)
+        self.allowed_types = {entry for entry in allow if "/" not in entry and "." not in entry}
+        self.allowed_patterns = [entry for entry in allow if entry not in self.allowed_types]
+        self.block_types = set(block_types) - self.allowed_types
+        self.block_patterns = list(block_patterns)
+        self.blocked = Counter()
+
+    @classmethod
+    def for_tool(cls, tool):
+        return cls(allow=RESOURCE_ALLOWLIST.get(tool, ()))
+
+    def reason(self, resource_type, url):
+        """Why a request would be blocked, or None to let it through"""
+        if any(pattern in url for pattern in self.allowed_patterns):
+            return None
+        if resource_type in self.block_types:
+            return resource_type
+        if any(pattern in url for pattern in self.block_patterns):
+            return "analytics"
+        return None
+
+    def install(self, target):
+        """Route a BrowserContext (all its pages) or a single Page through the policy"""
+        target.route("**/*", self._handle)
+        return self
+
+    def _handle(self, route):
+        request = route.request
+        reason = self.reason(request.resource_type, request.url)
+        if reason:
+            self.blocked[reason] += 1
+            route.abort("blockedbyclient")
+        else:
+            # Page-level routes (graphql.resume_at_cursor) already ran before
+            # this one; hand the request to any other context route
+            route.fallback()
+
+    async def install_async(self, target):
+        """install() for playwright.async_api contexts and pages"""
+        await target.route("**/*", self._handle_async)
+        return self
+
+    async def _handle_async(self, route):
+        request = route.request
+        reason = self.reason(request.resource_type, request.url)
+        if reason:
+            self.blocked[reason] += 1
+            await route.abort("blockedbyclient")
+        else:
+            await route.fallback()
+
+    def summary(self):
+        return ", ".join(f"{kind}: {count}" for kind, count in self.blocked.most_common()) or "nothing blocked"
+
+# The policy open_page() applies for `tool`, or None when blocking is off
+def policy_for(tool):
+    return ResourcePolicy.for_tool(tool) if BLOCK_RESOURCES and tool else None
@@ -0,0 +1,293 @@
+from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
+from browser_host import BROWSER_ARGS, DESKTOP_CONTEXT, host_info, host_url
+from config import BROWSER_HOST_PORT, DECK_URL, SESSION_FILE, UPDATE_HOURS_BACK, USE_BROWSER_HOST
+from db import insert_new_tweets, tweet_exists
+from dedup import RotatingBloomFilter, SeenIds
+from extraction import EXTRACT_ARTICLES_JS, normalize_article
+from graphql import is_timeline_url
+from observer import DRAIN_JS, INSTALL_OBSERVER_JS, QUEUE_READY_JS
+from recent_updates import RecentUpdates
+from resources import policy_for
+from cadence import configured_policy
+from scheduler import UpdateScheduler
+from scrolling import CONTENT_SETTLED_JS, SCROLL_SIGNALS_JS, ScrollPacing
+from concurrent.futures import ThreadPoolExecutor
+import argparse
+import asyncio
+import time
+
+# One process, one event loop, one browser: capture and update run as
+# asyncio tasks, each over its own pages (contexts), so a page waiting on
+# the deck never blocks another. All SQLite work goes through a single DB
+# thread, which keeps writes serialized and off the event loop.
+#
+#     python runtime.py --capture 1 --update 2 --url DECK_A --url DECK_B --archive daily
+#
+# Page i of each loop opens the i-th --url: pages on the same deck would only
+# repeat each other's DOM and network work for dedup to throw away.
+#
+# The archiver keeps its sync engine (checkpoints, incremental stop, seeking)
+# and runs on a worker thread of the same process, with its own
+# sync_playwright driver: it shares the browser host when that is up, and
+# otherwise launches a second Chromium.
+
+class Runtime:
+    def __init__(self, browser):
+        self.browser = browser
+        self.db_thread = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db")
+        self.contexts = []
+
+    @classmethod
+    async def start(cls, p, port=BROWSER_HOST_PORT, use_host=USE_BROWSER_HOST):
+        browser = None
+        if use_host and await asyncio.to_thread(host_info, port):
+            try:
+                browser = await p.chromium.connect_over_cdp(host_url(port))
+                print(f"[RUNTIME] Using shared browser at {host_url(port)}")
+            except Exception as e:
+                print(f"[RUNTIME] Could not connect to {host_url(port)}, launching a browser: {e}")
+        if browser is None:
+            browser = await p.chromium.launch(headless=True, args=BROWSER_ARGS)
+        return cls(browser)
+
+    # A page in a fresh context (own session state and resource policy)
+    async def open_page(self, tool, url=DECK_URL, storage_state=SESSION_FILE, **context_options):
+        context = await self.browser.new_context(storage_state=storage_state, **{**DESKTOP_CONTEXT, **context_options})
+        self.contexts.append(context)
+        policy = policy_for(tool)
+        if policy:
+            await policy.install_async(context)
+        page = await context.new_page()
+        if url:
+            await page.goto(url, timeout=60000)
+        return page
+
+    async def close_page(self, page):
+        self.contexts.remove(page.context)
+        await page.context.close()
+
+    # Recover a page whose loop hit an error: reload it, or open a fresh one
+    # in its place if that fails too (crashed or closed). Never raises; on
+    # failure the old page comes back and the caller retries later.
+    async def recover_page(self, page, tool, url):
+        try:
+            await page.reload(timeout=60000)
+            return page
+        except Exception as e:
+            print(f"[RUNTIME] Reloading {url} failed ({e}), opening a new page")
+        try:
+            if page.context in self.contexts:
+                await self.close_page(page)
+        except Exception:
+            pass
+        try:
+            return await self.open_page(tool, url)
+        except Exception as e:
+            print(f"[RUNTIME ERROR] Could not reopen {url}: {e}")
+            return page
+
+    # Run a blocking DB call on the DB thread
+    async def db(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.db_thread, fn, *args)
+
+    async def close(self):
+        for context in self.contexts:
+            await context.close()
+        await self.browser.close()
+        self.db_thread.shutdown()
+
+# scrolling.ScrollController for async pages: one wheel step, then wait
+# until the page has added content and settled. The step/wait adaptation is
+# scrolling.ScrollPacing's.
+class AsyncScroller(ScrollPacing):
+    def __init__(self, page, step=1000, min_step=250, max_step=4000, wait_ms=1000, max_wait_ms=4000,
+                 settle_ms=150, request_filter=is_timeline_url):
+        super().__init__(page, step, min_step, max_step, wait_ms, max_wait_ms, settle_ms, request_filter)
+
+    async def scroll(self):
+        since = await self.page.evaluate(SCROLL_SIGNALS_JS)
+        await self.page.mouse.wheel(0, self.step)
+        new_items = await self.wait_for_content(since)
+        self.record(new_items)
+        return new_items
+
+    # Items added after `since`, or 0 once wait_ms passed with no timeline
+    # request left in flight
+    async def wait_for_content(self, since):
+        deadline, hard_deadline = self._deadlines(time.monotonic(), self.wait_ms)
+        while True:
+            try:
+                handle = await self.page.wait_for_function(
+                    CONTENT_SETTLED_JS, arg=[since, self.settle_ms],
+                    timeout=max(1, (deadline - time.monotonic()) * 1000), polling=50)
+                return await handle.json_value() - since
+            except PlaywrightTimeoutError:
+                deadline = self._extend(hard_deadline)
+                if deadline is None:
+                    return 0
+
+async def extract_articles_async(page, selector="article"):
+    return [normalize_article(raw) for raw in await page.evaluate(EXTRACT_ARTICLES_JS, selector)]
+
+# Drop tweets already seen and insert the rest. Runs on the DB thread, which
+# owns seen_ids (its tweet_exists fallback queries SQLite) and serializes the
+# pages' batches.
+def _insert_new(seen_ids, tweets):
+    new_tweets = []
+    for tweet in tweets:
+        if not tweet["id"] or tweet["id"] in seen_ids:
+            continue
+        seen_ids.add(tweet["id"])
+        new_tweets.append(tweet)
+    if new_tweets:
+        insert_new_tweets(new_tweets)
+    return len(new_tweets)
+
+# scraper.py's observer mode over several pages: each page drains its own
+# MutationObserver queue in its own loop, so a busy page never waits on an
+# idle one, and a page that errors is recovered on its own without stopping
+# the others
+async def capture(runtime, pages, seen_ids=None, timeout_ms=30000, retry_seconds=5):
+    seen_ids = seen_ids or SeenIds(max_size=20_000, bloom=RotatingBloomFilter(capacity=500_000), fallback=tweet_exists)
+
+    async def wait_and_drain(page):
+        try:
+            await page.wait_for_function(QUEUE_READY_JS, timeout=timeout_ms, polling=50)
+        except PlaywrightTimeoutError:
+            pass
+        items = await page.evaluate(DRAIN_JS)
+        if items is None:  # reloaded: the observer is gone
+            await page.evaluate(INSTALL_OBSERVER_JS, [None, 5000])
+            items = await page.evaluate(DRAIN_JS) or []
+        return [normalize_article(item) for item in items]
+
+    async def capture_page(page):
+        url = page.url
+        while True:
+            try:
+                tweets = await wait_and_drain(page)
+            except Exception as e:
+                print(f"[RUNTIME ERROR] Capture on {url} failed: {e}")
+                await asyncio.sleep(retry_seconds)
+                page = await runtime.recover_page(page, "scraper", url)
+                continue
+            if not tweets:
+                continue
+            try:
+                inserted = await runtime.db(_insert_new, seen_ids, tweets)
+            except Exception as e:
+                print(f"[RUNTIME ERROR] Failed inserting {len(tweets)} tweets: {e}")
+                continue
+            if inserted:
+                print(f"[RUNTIME] Logging {inserted} new tweets")
+
+    for page in pages:
+        await page.evaluate(INSTALL_OBSERVER_JS, [None, 5000])
+    print(f"[RUNTIME] Capture started on {len(pages)} page(s).")
+    await asyncio.gather(*(capture_page(page) for page in pages))
+
+# Reschedule and write one scan's worth of metrics (runs on the DB thread)
+def _write_updates(scheduler, pending):
+    for tweet_id, metrics in pending:
+        scheduler.reschedule(tweet_id, metrics)
+    return scheduler.flush()
+
+# updater.py's cycle over several pages: every scan scrolls all pages and
+# extracts from all of them concurrently, then writes once. A page whose
+# scan fails is recovered before the next scan.
+async def update(runtime, pages, max_cycle_seconds=65, min_update_spacing_seconds=50, max_idle_seconds=5):
+    recent_updates = RecentUpdates(window_seconds=min_update_spacing_seconds)
+    await runtime.db(recent_updates.load, time.time())
+    scheduler = UpdateScheduler(configured_policy(), hours_back=UPDATE_HOURS_BACK)
+    scrollers = [AsyncScroller(page) for page in pages]
+    urls = [page.url for page in pages]
+    print(f"[RUNTIME] Update loop started on {len(pages)} page(s).")
+
+    async def scroll_and_extract(scroller):
+        await scroller.scroll()
+        return await extract_articles_async(scroller.page)
+
+    while True:
+        cycle_start = time.monotonic()
+        await runtime.db(scheduler.refresh)
+        known_updates = set(scheduler.pop_due())
+        if not known_updates:
+            await asyncio.sleep(scheduler.idle_seconds(max_idle_seconds))
+            continue
+        tweets_to_update = set(known_updates)
+        updated = scans = 0
+        for scroller in scrollers:
+            scroller.reset()
+
+        while tweets_to_update and time.monotonic() - cycle_start < max_cycle_seconds:
+            scans += 1
+            batches = await asyncio.gather(*(scroll_and_extract(s) for s in scrollers), return_exceptions=True)
+            now = time.time()
+            pending = []
+            for i, batch in enumerate(batches):
+                if isinstance(batch, Exception):
+                    page = scrollers[i].page
+                    print(f"[RUNTIME ERROR] Extraction on {page.url} failed: {batch}")
+                    recovered = await runtime.recover_page(page, "updater", urls[i])
+                    if recovered is not page:
+                        scrollers[i] = AsyncScroller(recovered)
+                    continue
+                for tweet in batch:
+                    tweet_id = tweet["id"]
+                    if tweet_id not in tweets_to_update or not recent_updates.due(tweet_id, now):
+                        continue
+                    pending.append((tweet_id, tweet["metrics"]))
+                    recent_updates.mark(tweet_id, now)
+                    tweets_to_update.discard(tweet_id)
+            if pending:
+                try:
+                    updated += await runtime.db(_write_updates, scheduler, pending)
+                except Exception as e:
+                    print(f"[RUNTIME ERROR] Failed writing {len(pending)} updates: {e}")
+
+        scheduler.release(tweets_to_update)
+        print(f"[SUMMARY] Cycle finished: {updated} tweets updated, {len(tweets_to_update)} still pending, after {scans} scroll scans.")
+        await runtime.db(recent_updates.flush, time.time())
+
+async def archive(profile):
+    from archiver import archive_tweets
+    await asyncio.to_thread(archive_tweets, profile)
+
+async def run(capture_pages=1, update_pages=1, archive_profile=None, urls=(DECK_URL,)):
+    if max(capture_pages, update_pages) > len(urls):
+        raise ValueError(f"{max(capture_pages, update_pages)} pages need as many URLs, got {len(urls)}")
+    async with async_playwright() as p:
+        runtime = await Runtime.start(p)
+        try:
+            capture_on = [await runtime.open_page("scraper", url) for url in urls[:capture_pages]]
+            update_on = [await runtime.open_page("updater", url) for url in urls[:update_pages]]
+            tasks = []
+            if capture_on:
+                tasks.append(capture(runtime, capture_on))
+            if update_on:
+                tasks.append(update(runtime, update_on))
+            if archive_profile:
+                tasks.append(archive(archive_profile))
+            await asyncio.gather(*tasks)
+        finally:
+            await runtime.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Run capture, update and archive in one process.")
+    parser.add_argument("--capture", type=int, default=1, help="pages running the capture loop, one per --url")
+    parser.add_argument("--update", type=int, default=1, help="pages running the update loop, one per --url")
+    parser.add_argument("--archive", metavar="PROFILE", help="also run this archiver profile")
+    parser.add_argument("--url", dest="urls", action="append", metavar="URL",
+                        help=f"deck or timeline for the next page of each loop (repeatable; default {DECK_URL})")
+    args = parser.parse_args()
+    urls = args.urls or [DECK_URL]
+    if max(args.capture, args.update) > len(urls):
+        parser.error(f"--capture/--update {max(args.capture, args.update)} needs as many --url values "
+                     f"(got {len(urls)}); pages on the same URL only repeat each other's work")
+    try:
+        asyncio.run(run(args.capture, args.update, args.archive, urls))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
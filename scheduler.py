@@ -0,0 +1,163 @@
+from datetime import datetime, timedelta
+import heapq
+import itertools
+
+from cadence import DEFAULT_POLICY
+import db
+
+# Per-tweet schedule state kept in memory by UpdateScheduler
+class ScheduleState:
+    __slots__ = ("tweet_id", "created_at", "count", "phase", "next_due", "last_metrics", "last_sampled", "in_flight")
+
+    def __init__(self, tweet_id, created_at, count=0, phase="minute", next_due=None):
+        self.tweet_id = tweet_id
+        self.created_at = created_at
+        self.count = count
+        self.phase = phase
+        self.next_due = next_due or created_at
+        self.last_metrics = None
+        self.last_sampled = None
+        self.in_flight = False
+
+# Min-heap of tweets keyed by next-due time. Seeded from the DB once, then
+# kept current in memory: finding due tweets is O(log n) per tweet rather
+# than a query per cycle, and only rescheduled tweets are written back.
+#
+# `clock` returns naive UTC datetimes (like datetime.utcnow) and can be
+# replaced with a fake clock in tests.
+class UpdateScheduler:
+    def __init__(self, policy=None, hours_back=24, clock=None):
+        self.policy = policy or DEFAULT_POLICY
+        self.max_age = timedelta(hours=hours_back)
+        self.clock = clock or datetime.utcnow
+        self.states = {}
+        self._heap = []
+        self._seq = itertools.count()
+        self._last_rowid = 0
+        self._samples = []
+        self._dirty = set()
+
+    def __len__(self):
+        return len(self.states)
+
+    def __contains__(self, tweet_id):
+        return tweet_id in self.states
+
+    # Seed from the DB (first call) or pick up tweets inserted since the last call
+    def refresh(self):
+        rows = db.get_schedule_rows(hours_back=self.max_age.total_seconds() / 3600, after_rowid=self._last_rowid)
+        for row in rows:
+            self._last_rowid = max(self._last_rowid, row["rowid"])
+            self.add(
+                row["tweet_id"],
+                _parse(row["created_at"]),
+                count=row["update_count"] or 0,
+                phase=row["update_phase"] or "minute",
+                next_due=_parse(row["next_update_ts"]),
+            )
+        return len(rows)
+
+    def add(self, tweet_id, created_at, count=0, phase="minute", next_due=None):
+        if tweet_id in self.states:
+            return self.states[tweet_id]
+        state = ScheduleState(tweet_id, created_at, count, phase, next_due)
+        self.states[tweet_id] = state
+        self._push(state)
+        return state
+
+    # Pop up to `budget` tweets that are due at `now`, earliest first. Popped
+    # tweets are in flight until reschedule() or release() is called for them.
+    def pop_due(self, now=None, budget=None):
+        now = now or self.clock()
+        due = []
+        while self._heap and (budget is None or len(due) < budget):
+            next_due, _, tweet_id = self._heap[0]
+            if next_due > now:
+                break
+            heapq.heappop(self._heap)
+            state = self.states.get(tweet_id)
+            # Skip stale heap entries left behind by earlier reschedules
+            if state is None or state.in_flight or state.next_due != next_due:
+                continue
+            if now - state.created_at > self.max_age:
+                del self.states[tweet_id]
+                continue
+            state.in_flight = True
+            due.append(tweet_id)
+        return due
+
+    # Put in-flight tweets that were not sampled back on the heap, still due
+    def release(self, tweet_ids):
+        for tweet_id in tweet_ids:
+            state = self.states.get(tweet_id)
+            if state is not None and state.in_flight:
+                state.in_flight = False
+                self._push(state)
+
+    # Record a sample (if metrics are given) and schedule the next one using
+    # the cadence policy, or at `next_due` when given explicitly
+    def reschedule(self, tweet_id, metrics=None, now=None, next_due=None):
+        state = self.states.get(tweet_id)
+        if state is None:
+            return None
+        now = now or self.clock()
+
+        state.count += 1
+        elapsed = now - state.last_sampled if state.last_sampled else None
+        phase, interval = self.policy.next_update(state.count, state.phase, metrics, state.last_metrics, elapsed)
+        state.phase = phase
+        state.next_due = next_due or now + interval
+        state.in_flight = False
+
+        if metrics is not None:
+            state.last_metrics = metrics
+            state.last_sampled = now
+            self._samples.append((
+                tweet_id, int((now - state.created_at).total_seconds()),
+                metrics["likes"], metrics["retweets"], metrics["replies"], metrics["views"]
+            ))
+        self._dirty.add(tweet_id)
+        self._push(state)
+        return state.next_due
+
+    # Persist only what changed since the last flush, in one transaction
+    def flush(self):
+        if not self._samples and not self._dirty:
+            return 0
+        schedules = []
+        for tweet_id in self._dirty:
+            state = self.states.get(tweet_id)
+            if state is not None:
+                schedules.append((state.count, state.phase, db.format_ts(state.next_due), tweet_id))
+        written = len(self._samples)
+        db.write_updates(self._samples, schedules)
+        self._samples = []
+        self._dirty = set()
+        return written
+
+    def next_due(self):
+        while self._heap:
+            next_due, _, tweet_id = self._heap[0]
+            state = self.states.get(tweet_id)
+            if state is not None and not state.in_flight and state.next_due == next_due:
+                return next_due
+            heapq.heappop(self._heap)
+        return None
+
+    # Seconds until the next tweet is due (0 if one already is), at most
+    # `cap`: how long an updater with nothing due can sleep. Tweets inserted
+    # meanwhile only show up on the next refresh(), so keep `cap` short.
+    def idle_seconds(self, cap, now=None):
+        next_due = self.next_due()
+        if next_due is None:
+            return cap
+        now = now or self.clock()
+        return min(cap, max(0.0, (next_due - now).total_seconds()))
+
+    def _push(self, state):
+        heapq.heappush(self._heap, (state.next_due, next(self._seq), state.tweet_id))
+
+def _parse(value):
+    if isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(value) if value else None
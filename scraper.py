@@ -1,6 +1,13 @@
-from playwright.sync_api import sync_playwright
-from config import SESSION_FILE
-from db import insert_new_tweets
+from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeoutError
+from browser_host import open_page
+from config import DECK_URL, CAPTURE_MODE
+from db import insert_new_tweets, tweet_exists
+from dedup import RotatingBloomFilter, SeenIds
+from extraction import extract_articles
+from observer import ArticleObserver
+from deck import DeckScanner
+from graphql import TimelineInterceptor
+import heartbeat
 from datetime import datetime, timezone
 import time
 
@@ -30,50 +37,132 @@ def extract_user_handle(article):
     except:
         return "unknown"
 
-def scraper_live_capture():
-    seen_ids = set()
+# Per-locator extraction, kept as a fallback when the batch evaluate fails
+def collect_tweets_per_locator(page, seen_ids):
+    articles = page.locator("article")
+    count = articles.count()
+    new_tweets = []
+
+    for i in range(count):
+        try:
+            article = articles.nth(i)
+            tweet_id = extract_tweet_id(article)
+            if not tweet_id or tweet_id in seen_ids:
+                continue
+
+            seen_ids.add(tweet_id)
+
+            tweet_text = extract_tweet_text(article)
+            user_handle = extract_user_handle(article)
+
+            tweet = {
+                "id": tweet_id,
+                "user": user_handle,
+                "text": tweet_text,
+            }
+            new_tweets.append(tweet)
+
+        except Exception as e:
+            print(f"[SCRAPER WARN] Error at #{i}: {e}")
+
+    return new_tweets
+
+# Batch extraction: one page.evaluate per poll for every loaded article.
+# With a DeckScanner the articles come per deck column, tagged with it.
+def collect_tweets_batch(page, seen_ids, deck=None):
+    new_tweets = []
+    for tweet in (deck.scan() if deck else extract_articles(page)):
+        tweet_id = tweet["id"]
+        if not tweet_id or tweet_id in seen_ids:
+            continue
+        seen_ids.add(tweet_id)
+        new_tweets.append(tweet)
+    return new_tweets
+
+def scraper_live_capture(mode=CAPTURE_MODE):
+    # Recent IDs in memory; older ones go through the Bloom filter and the DB
+    seen_ids = SeenIds(max_size=20_000, bloom=RotatingBloomFilter(capacity=500_000), fallback=tweet_exists)
 
     with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True, slow_mo=0)
-        context = browser.new_context(storage_state=SESSION_FILE)
-        page = context.new_page()
-        page.goto("https://pro.x.com/i/decks/1915696383484371263", timeout=60000)
-        time.sleep(5)
-
-        print("[SCRAPER] Live tweet capture started.")
-
-        while True:
-            articles = page.locator("article")
-            count = articles.count()
-            new_tweets = []
-
-            for i in range(count):
-                try:
-                    article = articles.nth(i)
-                    tweet_id = extract_tweet_id(article)
-                    if not tweet_id or tweet_id in seen_ids:
-                        continue
-
-                    seen_ids.add(tweet_id)
-
-                    tweet_text = extract_tweet_text(article)
-                    user_handle = extract_user_handle(article)
-
-                    tweet = {
-                        "id": tweet_id,
-                        "user": user_handle,
-                        "text": tweet_text,
-                    }
-                    new_tweets.append(tweet)
-
-                except Exception as e:
-                    print(f"[SCRAPER WARN] Error at #{i}: {e}")
-
-            if new_tweets:
-                print(f"[SCRAPER] Logging {len(new_tweets)} new tweets")
-                insert_new_tweets(new_tweets)
-
-            time.sleep(1)  # Small wait before checking again
+        browser, context, page = open_page(p, tool="scraper", launch_options={"slow_mo": 0})
+        # Listen before navigating so the initial timeline response is captured
+        interceptor = TimelineInterceptor().attach(page) if mode == "graphql" else None
+        page.goto(DECK_URL, timeout=60000)
+        # Ready once the deck shows its first article; the watchdog holds the
+        # updater back until then
+        try:
+            page.wait_for_selector("article", timeout=30000)
+            heartbeat.mark("ready")
+        except PlaywrightTimeoutError:
+            print("[SCRAPER WARN] No articles on the deck after 30s, starting capture anyway.")
+
+        if mode == "graphql":
+            graphql_loop(page, interceptor, seen_ids)
+        elif mode == "observer":
+            observe_loop(page, seen_ids)
+        else:
+            poll_loop(page, seen_ids)
+
+# Rescan every loaded article once a second
+def poll_loop(page, seen_ids):
+    deck = DeckScanner(page)
+    print("[SCRAPER] Live tweet capture started (poll mode).")
+
+    while True:
+        try:
+            new_tweets = collect_tweets_batch(page, seen_ids, deck)
+        except Exception as e:
+            print(f"[SCRAPER WARN] Batch extraction failed, falling back to locators: {e}")
+            new_tweets = collect_tweets_per_locator(page, seen_ids)
+
+        if new_tweets:
+            print(f"[SCRAPER] Logging {len(new_tweets)} new tweets")
+            insert_new_tweets(new_tweets)
+            heartbeat.count("tweets", len(new_tweets))
+            heartbeat.mark("first_tweet")
+        heartbeat.beat()
+
+        time.sleep(1)  # Small wait before checking again
+
+# Only handle articles the in-page MutationObserver reports as newly added
+def observe_loop(page, seen_ids):
+    observer = ArticleObserver(page)
+    observer.install()
+    print("[SCRAPER] Live tweet capture started (observer mode).")
+
+    while True:
+        new_tweets = []
+        for tweet in observer.wait(timeout_ms=30000):
+            if not tweet["id"] or tweet["id"] in seen_ids:
+                continue
+            seen_ids.add(tweet["id"])
+            new_tweets.append(tweet)
+
+        if new_tweets:
+            print(f"[SCRAPER] Logging {len(new_tweets)} new tweets")
+            insert_new_tweets(new_tweets)
+            heartbeat.count("tweets", len(new_tweets))
+            heartbeat.mark("first_tweet")
+        heartbeat.beat()
+
+# Read tweets straight from the timeline JSON the deck fetches; no DOM queries
+def graphql_loop(page, interceptor, seen_ids):
+    print("[SCRAPER] Live tweet capture started (graphql mode).")
+
+    while True:
+        new_tweets = []
+        for tweet in interceptor.wait(page, timeout_ms=1000):
+            if tweet["id"] in seen_ids:
+                continue
+            seen_ids.add(tweet["id"])
+            new_tweets.append(tweet)
+
+        if new_tweets:
+            print(f"[SCRAPER] Logging {len(new_tweets)} new tweets")
+            insert_new_tweets(new_tweets)
+            heartbeat.count("tweets", len(new_tweets))
+            heartbeat.mark("first_tweet")
+        heartbeat.beat()
 
 if __name__ == "__main__":
     scraper_live_capture()
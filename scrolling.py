@@ -0,0 +1,278 @@
+import time
+
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+from graphql import is_timeline_url
+
+# Counts timeline cells/articles the page adds, and when the last one landed.
+# Installed once per document; returns the running count so a scroll can
+# remember where it started in the same round trip.
+SCROLL_SIGNALS_JS = """
+() => {
+    let s = window.__scrollSignals;
+    if (!s) {
+        s = window.__scrollSignals = { added: 0, last: 0 };
+        new MutationObserver((mutations) => {
+            for (const mutation of mutations) {
+                for (const node of mutation.addedNodes) {
+                    if (node.nodeType !== Node.ELEMENT_NODE) continue;
+                    if (node.matches('article, [data-testid="cellInnerDiv"]') || node.querySelector('article')) {
+                        s.added++;
+                        s.last = performance.now();
+                    }
+                }
+            }
+        }).observe(document.body, { childList: true, subtree: true });
+    }
+    return s.added;
+}
+"""
+
+# Truthy (the new count) once content arrived after `since` and the DOM has
+# been quiet for settleMs, so a batch is read whole rather than half-rendered
+CONTENT_SETTLED_JS = """
+([since, settleMs]) => {
+    const s = window.__scrollSignals;
+    if (!s || s.added <= since || performance.now() - s.last < settleMs) return false;
+    return s.added;
+}
+"""
+
+def wheel(page, pixels):
+    page.mouse.wheel(0, pixels)
+
+class ScrollResult:
+    def __init__(self, new_items, waited_ms, step, moved=None):
+        self.new_items = new_items
+        self.waited_ms = waited_ms
+        self.step = step
+        self.moved = moved  # whatever scroll_fn returned (e.g. the new position)
+
+    def __bool__(self):
+        return self.new_items > 0
+
+# Step and wait adaptation shared by ScrollController and the async
+# runtime.AsyncScroller, which only add the page calls. Steps that bring
+# nothing back off: the wait doubles and the step shrinks; productive steps
+# reset the wait and grow the step. Timeline requests are tracked so a wait
+# can run on (up to `max_wait_ms`) while one is still in flight.
+class ScrollPacing:
+    def __init__(self, page, step=1000, min_step=250, max_step=4000, wait_ms=2000,
+                 max_wait_ms=8000, settle_ms=150, request_filter=is_timeline_url):
+        self.page = page
+        self.base_step = self.step = step
+        self.min_step = min_step
+        self.max_step = max_step
+        self.base_wait_ms = self.wait_ms = wait_ms
+        self.max_wait_ms = max_wait_ms
+        self.settle_ms = settle_ms
+        self.request_filter = request_filter
+        self.stalls = 0
+        self.scrolls = 0
+        self.inflight = set()
+        page.on("request", self._on_request)
+        page.on("requestfinished", self._on_request_done)
+        page.on("requestfailed", self._on_request_done)
+
+    def _on_request(self, request):
+        if self.request_filter and self.request_filter(request.url):
+            self.inflight.add(request)
+
+    def _on_request_done(self, request):
+        self.inflight.discard(request)
+
+    def reset(self):
+        self.step = self.base_step
+        self.wait_ms = self.base_wait_ms
+        self.stalls = 0
+
+    # Adapt the step and wait to what one scroll brought in
+    def record(self, new_items):
+        self.scrolls += 1
+        if new_items:
+            self.stalls = 0
+            self.wait_ms = self.base_wait_ms
+            self.step = min(self.max_step, int(self.step * 1.5))
+        else:
+            self.stalls += 1
+            self.wait_ms = min(self.max_wait_ms, self.wait_ms * 2)
+            self.step = max(self.min_step, self.step // 2)
+
+    # (deadline, hard deadline) of a wait starting now
+    def _deadlines(self, start, timeout_ms):
+        return start + timeout_ms / 1000, start + max(timeout_ms, self.max_wait_ms) / 1000
+
+    # A later deadline while a timeline request is still loading (network
+    # idle, not the clock, decides), else None: stop waiting
+    def _extend(self, hard_deadline):
+        now = time.monotonic()
+        if self.inflight and now < hard_deadline:
+            return min(hard_deadline, now + 0.5)
+        return None
+
+# Scrolls a timeline and waits for the page to actually deliver content
+# instead of sleeping a fixed time. After each step it returns as soon as new
+# cells/articles have been added and the DOM settled for `settle_ms`; while a
+# timeline request is still in flight it keeps waiting (see ScrollPacing).
+class ScrollController(ScrollPacing):
+    def __init__(self, page, step=1000, min_step=250, max_step=4000, wait_ms=2000,
+                 max_wait_ms=8000, settle_ms=150, scroll_fn=wheel, request_filter=is_timeline_url):
+        super().__init__(page, step, min_step, max_step, wait_ms, max_wait_ms, settle_ms, request_filter)
+        self.scroll_fn = scroll_fn
+
+    # One step down (or `pixels`), then wait for content
+    def scroll(self, pixels=None):
+        since = self.page.evaluate(SCROLL_SIGNALS_JS)
+        step = pixels or self.step
+        moved = self.scroll_fn(self.page, step)
+        new_items, waited_ms = self.wait_for_content(since, self.wait_ms)
+        self.record(new_items)
+        return ScrollResult(new_items, waited_ms, step, moved)
+
+    # Wait until content is added after `since` (a SCROLL_SIGNALS_JS count),
+    # or timeout_ms passes with no timeline request left in flight.
+    # Returns (items added, ms waited).
+    def wait_for_content(self, since=None, timeout_ms=None):
+        if since is None:
+            since = self.page.evaluate(SCROLL_SIGNALS_JS)
+        start = time.monotonic()
+        deadline, hard_deadline = self._deadlines(start, timeout_ms or self.wait_ms)
+        while True:
+            try:
+                handle = self.page.wait_for_function(
+                    CONTENT_SETTLED_JS, arg=[since, self.settle_ms],
+                    timeout=max(1, (deadline - time.monotonic()) * 1000), polling=50)
+                return handle.json_value() - since, (time.monotonic() - start) * 1000
+            except PlaywrightTimeoutError:
+                deadline = self._extend(hard_deadline)
+                if deadline is None:
+                    return 0, (time.monotonic() - start) * 1000
+
+# Deck columns and their scroll containers, resolved from the articles up
+# instead of measuring every element on the page. The column list is cached
+# on window and re-enumerated only when it goes stale: a listed column was
+# detached (re-render, navigation) or an article sits outside every listed
+# column (a column rendered its first articles). Resolved targets are cached
+# per column spec until the list changes. `column` is null (the tallest
+# column, as before), an index into the columns left to right, or a
+# case-insensitive title substring (the column's aria-label or heading).
+DECK_SCROLL_JS = """
+(() => {
+    if (window.__ttDeck) return window.__ttDeck;
+
+    // The nearest ancestor that scrolls, or failing that the nearest one
+    // styled to scroll (a column that hasn't overflowed yet). The page itself
+    // never counts as a column: an article with neither is left for the next
+    // enumeration.
+    const scrollableAncestor = (node) => {
+        let styled = null;
+        for (let el = node.parentElement; el && el !== document.body; el = el.parentElement) {
+            if (!/(auto|scroll)/.test(getComputedStyle(el).overflowY)) continue;
+            if (el.scrollHeight > el.clientHeight) return el;
+            styled = styled || el;
+        }
+        return styled;
+    };
+
+    const columns = () => {
+        const found = [];
+        for (const article of document.querySelectorAll('article')) {
+            if (found.some((container) => container.contains(article))) continue;
+            const container = scrollableAncestor(article);
+            if (container) found.push(container);
+        }
+        return found.sort((a, b) => a.getBoundingClientRect().left - b.getBoundingClientRect().left);
+    };
+
+    // Nearest aria-label or heading that belongs to this column alone
+    const titleOf = (container, all) => {
+        for (let node = container; node && node !== document.body; node = node.parentElement) {
+            if (all.some((other) => other !== container && node.contains(other))) break;
+            const label = node.getAttribute('aria-label');
+            if (label) return label;
+            const heading = node.querySelector('h1, h2, [role="heading"]');
+            if (heading && !heading.closest('article')) return heading.textContent.trim();
+        }
+        return '';
+    };
+
+    // [{el, index, title, key}] for every rendered column; the key (index and
+    // title) keeps columns with the same heading apart
+    let listed = [];
+    let generation = 0;
+    const stale = () => !listed.length
+        || listed.some((c) => !c.el.isConnected)
+        || Array.from(document.querySelectorAll('article')).some((a) => !listed.some((c) => c.el.contains(a)));
+    const list = () => {
+        if (stale()) {
+            const all = columns();
+            listed = all.map((el, index) => {
+                const title = titleOf(el, all) || `column ${index}`;
+                return { el, index, title, key: `${index}:${title}` };
+            });
+            generation++;
+        }
+        return listed;
+    };
+
+    const resolve = (column) => {
+        const all = list();
+        if (column === null || column === undefined) {
+            return all.reduce((best, c) => (!best || c.el.scrollHeight > best.el.scrollHeight ? c : best), null)?.el || null;
+        }
+        if (typeof column === 'number') return all[column]?.el || null;
+        const needle = String(column).toLowerCase();
+        return all.find((c) => c.title.toLowerCase().includes(needle))?.el || null;
+    };
+
+    const cache = new Map();
+    const target = (column) => {
+        const key = JSON.stringify(column ?? null);
+        list();
+        const hit = cache.get(key);
+        if (hit && hit.generation === generation && hit.el) return hit.el;
+        const el = resolve(column);
+        cache.set(key, { generation, el });
+        return el;
+    };
+
+    // Title of the column holding `node`: the cached list while it has it
+    // (cheap enough to call per added article), else a fresh one
+    const columnOf = (node) => {
+        const c = listed.find((c) => c.el.isConnected && c.el.contains(node))
+            || list().find((c) => c.el.contains(node));
+        return c ? c.title : null;
+    };
+
+    const describe = () => list().map(({ el, index, title }) => ({
+        index,
+        title,
+        articles: el.querySelectorAll('article').length,
+    }));
+
+    return (window.__ttDeck = { target, list, columnOf, describe });
+})()
+"""
+
+SCROLL_CONTAINER_JS = f"""
+([direction, amount, column]) => {{
+    const el = {DECK_SCROLL_JS}.target(column);
+    if (!el) return {{ scrolled: false }};
+    const previousPosition = el.scrollTop;
+    if (direction === 'up') el.scrollTop = 0;
+    else el.scrollTop += amount;
+    return {{
+        scrolled: true,
+        previousPosition,
+        newPosition: el.scrollTop,
+        maxScroll: el.scrollHeight - el.clientHeight
+    }};
+}}
+"""
+
+def scroll_container(page, direction="down", amount=2000, column=None):
+    """Scroll a deck column's container (the tallest one by default)."""
+    return page.evaluate(SCROLL_CONTAINER_JS, [direction, amount, column])
+
+def list_columns(page):
+    """[{index, title, articles}] for the deck columns currently rendered"""
+    return page.evaluate(f"() => {DECK_SCROLL_JS}.describe()")
@@ -0,0 +1,19 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+
+# Make the top-level scripts importable when running `pytest` from anywhere
+if str(REPO_DIR) not in sys.path:
+    sys.path.insert(0, str(REPO_DIR))
+
+# A fresh tweets DB in tmp_path for one test
+@pytest.fixture
+def scratch_db(tmp_path, monkeypatch):
+    import db
+    monkeypatch.setattr(db, "DB_PATH", str(tmp_path / "tweets.db"))
+    db.init_db()
+    yield db
+    db.close_conn()
@@ -0,0 +1,17 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from metrics import parse_count, parse_group_label
+
+FIXTURES_DIR = Path(__file__).resolve().parent.parent / "benchmarks" / "fixtures"
+CORPUS = json.loads((FIXTURES_DIR / "metric_labels.json").read_text(encoding="utf-8"))
+
+@pytest.mark.parametrize("label, expected", CORPUS["counts"])
+def test_parse_count(label, expected):
+    assert parse_count(label) == expected
+
+@pytest.mark.parametrize("label, expected", CORPUS["groups"])
+def test_parse_group_label(label, expected):
+    assert parse_group_label(label) == expected
@@ -0,0 +1,138 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+import cadence
+from scheduler import UpdateScheduler
+
+MINUTE = timedelta(minutes=1)
+
+class FakeClock:
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, delta):
+        self.now += delta
+
+def metrics(likes=0, retweets=0):
+    return {"likes": likes, "retweets": retweets, "replies": 0, "views": 0}
+
+def seed(db, rows):
+    conn = db.get_conn()
+    conn.executemany("INSERT INTO tweets (tweet_id, user_handle, text, created_at, next_update_ts) VALUES (?, ?, ?, ?, ?)",
+                     [(tweet_id, "test", "text", db.format_ts(created), db.format_ts(due)) for tweet_id, created, due in rows])
+    conn.commit()
+
+# Due 3, 1, 2 minutes from now, plus one already too old to track
+@pytest.fixture
+def loaded(scratch_db):
+    start = datetime.utcnow().replace(microsecond=0)
+    clock = FakeClock(start)
+    seed(scratch_db, [
+        ("a", start - 10 * MINUTE, start + 3 * MINUTE),
+        ("b", start - 10 * MINUTE, start + 1 * MINUTE),
+        ("c", start - 10 * MINUTE, start + 2 * MINUTE),
+        ("old", start - timedelta(hours=23, minutes=59), start),
+    ])
+    scheduler = UpdateScheduler(cadence.MinuteThenHalfHour(), hours_back=24, clock=clock)
+    assert scheduler.refresh() == 4
+    return scratch_db, scheduler, clock
+
+def test_pop_due_earliest_first_within_budget(loaded):
+    _, scheduler, clock = loaded
+    clock.advance(5 * MINUTE)
+    assert scheduler.pop_due(budget=2) == ["b", "c"]
+    assert scheduler.pop_due() == ["a"]
+    assert "old" not in scheduler
+
+def test_in_flight_not_popped_until_released(loaded):
+    _, scheduler, clock = loaded
+    clock.advance(5 * MINUTE)
+    scheduler.pop_due()
+    assert scheduler.pop_due() == []
+    scheduler.release(["a"])
+    assert scheduler.pop_due() == ["a"]
+
+def test_stale_heap_entries_skipped(loaded):
+    _, scheduler, clock = loaded
+    clock.advance(5 * MINUTE)
+    scheduler.pop_due()
+    for tweet_id in ("a", "b", "c"):
+        scheduler.reschedule(tweet_id, metrics())
+    scheduler.reschedule("b", next_due=clock.now + 10 * MINUTE)
+    clock.advance(MINUTE)
+    assert sorted(scheduler.pop_due()) == ["a", "c"]
+    assert scheduler.next_due() == clock.now + 9 * MINUTE
+
+def test_flush_writes_only_the_delta(loaded):
+    db, scheduler, clock = loaded
+    start = clock.now
+    clock.advance(5 * MINUTE)
+    scheduler.pop_due()
+    for tweet_id in ("a", "b", "c"):
+        scheduler.reschedule(tweet_id, metrics())
+    # No metrics this time: a schedule change only
+    scheduler.reschedule("b", next_due=clock.now + 10 * MINUTE)
+
+    assert scheduler.flush() == 3
+    assert scheduler.flush() == 0
+    conn = db.get_conn()
+    assert conn.execute("SELECT COUNT(*) FROM tweet_metrics").fetchone()[0] == 3
+    row = conn.execute("SELECT update_count, next_update_ts FROM tweets WHERE tweet_id = 'b'").fetchone()
+    assert row[0] == 2
+    assert row[1] == db.format_ts(start + 15 * MINUTE)
+
+def test_refresh_only_picks_up_new_rows(loaded):
+    db, scheduler, clock = loaded
+    seed(db, [("d", clock.now, clock.now)])
+    assert scheduler.refresh() == 1
+    assert "d" in scheduler
+
+def test_idle_seconds_until_next_due(loaded):
+    _, scheduler, clock = loaded
+    # "old" is due now, then "b" in a minute
+    assert scheduler.idle_seconds(5) == 0
+    clock.advance(5 * MINUTE)
+    scheduler.pop_due()
+    scheduler.reschedule("a", next_due=clock.now + timedelta(seconds=3))
+    scheduler.release(["b", "c"])
+    scheduler.reschedule("b", next_due=clock.now + MINUTE)
+    scheduler.reschedule("c", next_due=clock.now + MINUTE)
+    assert scheduler.idle_seconds(5) == 3
+    assert scheduler.idle_seconds(2) == 2
+
+def test_idle_seconds_caps_an_empty_schedule():
+    scheduler = UpdateScheduler(cadence.MinuteThenHalfHour(), clock=FakeClock(datetime(2026, 1, 1)))
+    assert scheduler.idle_seconds(5) == 5
+
+def test_minute_then_halfhour_after_60_samples():
+    policy = cadence.MinuteThenHalfHour()
+    phase, intervals = "minute", []
+    for count in range(1, 63):
+        phase, interval = policy.next_update(count, phase)
+        intervals.append(interval)
+    assert intervals.index(timedelta(minutes=30)) + 1 == 60
+    assert phase == "halfhour"
+    assert set(intervals[:59]) == {MINUTE}
+
+def test_viral_boost_caps_fast_tweets():
+    boost = cadence.ViralBoost(cadence.MinuteThenHalfHour(), threshold_per_minute=50)
+    _, fast = boost.next_update(70, "halfhour", metrics(400, 100), metrics(100, 100), timedelta(minutes=5))
+    _, slow = boost.next_update(70, "halfhour", metrics(120, 100), metrics(100, 100), timedelta(minutes=5))
+    assert fast == MINUTE
+    assert slow == timedelta(minutes=30)
+
+def test_decay_schedule_grows_to_its_cap():
+    decay = cadence.DecaySchedule(initial=MINUTE, factor=2, max_interval=timedelta(minutes=10))
+    steps = [decay.next_update(count, "decay")[1] for count in range(1, 7)]
+    assert [step // MINUTE for step in steps] == [1, 2, 4, 8, 10, 10]
+
+def test_configured_policy():
+    configured = cadence.configured_policy("decay", viral_boost=True)
+    assert isinstance(configured, cadence.ViralBoost)
+    assert isinstance(configured.base, cadence.DecaySchedule)
+    with pytest.raises(ValueError):
+        cadence.configured_policy("hourly")
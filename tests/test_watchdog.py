@@ -0,0 +1,82 @@
+import json
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+import watchdog
+
+CHILDREN_DIR = Path(__file__).resolve().parent.parent / "benchmarks" / "fixtures" / "children"
+HEARTBEAT_TIMEOUT = 3
+READY_TIMEOUT = 5
+STOP_GRACE = 2
+RUN_SECONDS = 20
+
+# One supervisor run over the fake children (slow loader, crash loop, hang,
+# and two dependents), shared by every test in this module
+@pytest.fixture(scope="module")
+def run(tmp_path_factory):
+    workdir = str(tmp_path_factory.mktemp("watchdog"))
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(watchdog, "BACKOFF_BASE_SECONDS", 1)
+        patch.setattr(watchdog, "STOP_GRACE_SECONDS", STOP_GRACE)
+        patch.setattr(watchdog, "log", lambda message: None)
+
+        def child(name, script=None, **options):
+            return watchdog.Child(name, str(CHILDREN_DIR / f"{script or name}.py"),
+                                  heartbeat_timeout=HEARTBEAT_TIMEOUT, startup_grace=HEARTBEAT_TIMEOUT,
+                                  log_dir=workdir, heartbeat_dir=workdir, **options)
+
+        children = {name: child(name) for name in ("loader", "crash", "hang")}
+        children["healthy"] = child("healthy", depends_on=[children["loader"]])
+        children["orphan"] = child("orphan", "healthy", depends_on=[children["crash"]], ready_timeout=READY_TIMEOUT)
+        # Record when each restart was scheduled, to check the backoff
+        delays = {name: [] for name in children}
+        for name, each in children.items():
+            def fail(reason, now, each=each, original=each.fail, name=name):
+                original(reason, now)
+                delays[name].append(round(each.next_start - now))
+            each.fail = fail
+
+        status_path = os.path.join(workdir, "status.json")
+        supervisor = watchdog.Supervisor(list(children.values()), status_path=status_path, poll_seconds=0.5)
+        start = time.time()
+        supervisor.run(duration=RUN_SECONDS)
+        with open(status_path) as f:
+            status = json.load(f)
+    return {"workdir": workdir, "start": start, "children": children, "delays": delays, "status": status}
+
+def test_dependent_starts_on_readiness(run):
+    loader = run["children"]["loader"]
+    held = run["children"]["healthy"].started_at - loader.ready_at
+    assert 0 <= held <= 1.5
+
+# Stopping the hang (which ignores SIGTERM) can hold a tick up for the stop grace
+def test_dependent_starts_after_ready_timeout(run):
+    orphan = run["children"]["orphan"].started_at - run["start"]
+    assert READY_TIMEOUT <= orphan <= READY_TIMEOUT + STOP_GRACE + 1.5
+
+def test_time_to_first_tweet_reported(run):
+    first_tweet = run["status"]["startup"]["first_tweet_after_s"]
+    assert first_tweet is not None
+    assert 2.5 <= first_tweet <= 4.5
+
+def test_healthy_child_never_restarted(run):
+    healthy = run["status"]["children"]["healthy"]
+    assert healthy["restarts"] == 0
+    assert 450 <= healthy["per_minute"].get("tweets", 0) <= 700
+
+def test_crash_loop_backs_off(run):
+    crash = run["delays"]["crash"]
+    assert len(crash) >= 3
+    assert all(later >= 2 * earlier for earlier, later in zip(crash, crash[1:]))
+
+def test_hang_detected_and_killed(run):
+    hang = run["children"]["hang"]
+    assert run["status"]["children"]["hang"]["restarts"] >= 1
+    assert (hang.last_reason or "").startswith("no heartbeat")
+
+def test_child_output_captured(run):
+    for name in run["children"]:
+        assert os.path.getsize(os.path.join(run["workdir"], f"{name}.log")) > 0
@@ -1,93 +1,80 @@
-from playwright.sync_api import sync_playwright
-from config import SESSION_FILE
-from db import get_tweets_to_update, update_tweet_metrics
+from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeoutError
+from browser_host import open_page
+from config import DECK_COLUMN, DECK_URL, INGEST_MODE, UPDATE_HOURS_BACK
+from cadence import configured_policy
+from scheduler import UpdateScheduler
+from recent_updates import RecentUpdates
+from graphql import TimelineInterceptor
+from deck import DeckScanner
+import heartbeat
 from datetime import datetime, timezone
 import time
-import json
-import os
 
-# Extract a numeric metric (likes, views, etc.) from a tweet article's aria-label
-def extract_metric_from_label(article, label_text):
+# Reschedule one scroll scan's worth of tweets and write them in a single transaction
+def flush_updates(scheduler, pending):
+    if not pending:
+        return 0
     try:
-        span = article.locator(f"[aria-label*='{label_text}']")
-        if span.count() > 0:
-            label = span.first.get_attribute("aria-label")
-            number = label.split(" ")[0].replace(",", "")
-            if "K" in number:
-                return int(float(number.replace("K", "")) * 1000)
-            elif "M" in number:
-                return int(float(number.replace("M", "")) * 1_000_000)
-            return int(number)
-    except:
-        pass
-    return 0
-
-# Extract all engagement metrics from a tweet article
-def extract_metrics(article):
-    return {
-        "replies": extract_metric_from_label(article, "Reply"),
-        "retweets": extract_metric_from_label(article, "Repost"),
-        "likes": extract_metric_from_label(article, "Like"),
-        "views": extract_metric_from_label(article, "View"),
-    }
-
-# Extract the tweet ID from an article's link
-def extract_tweet_id(article):
-    try:
-        links = article.locator("a")
-        hrefs = [links.nth(j).get_attribute("href") for j in range(links.count())]
-        status_links = [href for href in hrefs if href and "/status/" in href]
-        if status_links:
-            tweet_url = status_links[0]
-            return tweet_url.split("/")[-1]
-    except:
-        pass
-    return None
-
-# Load recent update timestamps from disk to avoid redundant updates
-def load_recent_updates(path="recent_updates.json"):
-    if os.path.exists(path):
-        with open(path, "r") as f:
-            return json.load(f)
-    return {}
-
-# Save recent update timestamps back to disk
-def save_recent_updates(data, path="recent_updates.json"):
-    with open(path, "w") as f:
-        json.dump(data, f)
+        for tweet_id, metrics in pending:
+            scheduler.reschedule(tweet_id, metrics)
+        return scheduler.flush()
+    except Exception as e:
+        print(f"[UPDATER ERROR] Failed writing {len(pending)} updates: {e}")
+        return 0
 
 # Main loop that tracks tweet engagement metrics over time
 def updater_engagement_tracker():
-    recent_updates = load_recent_updates()
-
     # Configurable timing parameters
     max_cycle_seconds = 65                # Max total time for each scroll/update cycle
     min_update_spacing_seconds = 50       # Minimum spacing between updates for each tweet
-    scroll_pause_seconds = 0.3            # Pause between scroll actions
-    scroll_offset_pixels = 1000           # Amount to scroll each pass
+    scroll_wait_ms = 1000                 # Longest wait for new articles after a scroll (returns early when they land)
+    scroll_offset_pixels = 1000           # Initial amount to scroll each column per pass (adapted per column)
+    max_scroll_stalls = 4                 # Scrolls in a row with no column moving before giving up on missing tweets
+    max_idle_seconds = 5                  # Longest sleep when nothing is due (new tweets are picked up after it)
+
+    recent_updates = RecentUpdates(window_seconds=min_update_spacing_seconds).load(time.time())
 
     last_summary = None
     skipped_same_summaries = 0
 
     with sync_playwright() as p:
         # Start Chromium browser session using saved login session
-        browser = p.chromium.launch(headless=True, slow_mo=0)
-        context = browser.new_context(storage_state=SESSION_FILE)
-        page = context.new_page()
-        page.goto("https://pro.x.com/i/decks/1915696383484371263", timeout=60000)
-        time.sleep(5)
-
+        browser, context, page = open_page(p, tool="updater", launch_options={"slow_mo": 0})
+        interceptor = TimelineInterceptor().attach(page) if INGEST_MODE == "graphql" else None
+        page.goto(DECK_URL, timeout=60000)
+        try:
+            page.wait_for_selector("article", timeout=30000)
+            heartbeat.mark("ready")
+        except PlaywrightTimeoutError:
+            print("[UPDATER WARN] No articles on the deck after 30s, starting anyway.")
+        # Every deck column (or just DECK_COLUMN) is read in one evaluate and
+        # scrolled by its own step
+        deck = DeckScanner(page, column=DECK_COLUMN, step=scroll_offset_pixels, wait_ms=scroll_wait_ms, max_wait_ms=4000)
+
+        scheduler = UpdateScheduler(configured_policy(), hours_back=UPDATE_HOURS_BACK)
         print("[UPDATER] Engagement tracker started.")
 
         while True:
             cycle_start = datetime.now(timezone.utc)
 
             # Get tweets from the last 24h that are ready to be updated
-            known_updates = {t["tweet_id"]: t for t in get_tweets_to_update(hours_back=24)}
-            tweets_to_update = set(known_updates.keys())
+            scheduler.refresh()
+            known_updates = set(scheduler.pop_due())
+            if not known_updates:
+                # Nothing due: no scan, and no reload of the deck in graphql mode
+                heartbeat.beat()
+                time.sleep(scheduler.idle_seconds(max_idle_seconds))
+                continue
+            tweets_to_update = set(known_updates)
             updated = 0
             scroll_scans = 0
 
+            # A reload makes the deck refetch its timeline, so the JSON carries
+            # fresh counts; only done when something is due
+            if interceptor:
+                page.reload(timeout=60000)
+            deck.scroll_to_top()
+
             while True:
                 now = datetime.now(timezone.utc)
                 elapsed = (now - cycle_start).total_seconds()
@@ -97,43 +84,46 @@ def updater_engagement_tracker():
                     break
 
                 scroll_scans += 1
-                page.mouse.wheel(0, scroll_offset_pixels)
-                time.sleep(scroll_pause_seconds)
+                pending = []  # (tweet_id, metrics) buffered for one bulk write per scan
 
-                # Locate all tweet articles on the page
-                articles = page.locator("article")
-                for i in range(articles.count()):
+                # Exact counts from intercepted timeline JSON (no DOM queries),
+                # or every rendered article of the deck in one round trip
+                if interceptor:
+                    tweets = interceptor.drain()
+                else:
                     try:
-                        article = articles.nth(i)
-                        tweet_id = extract_tweet_id(article)
-
-                        # Skip if tweet not in the list of known update targets
-                        if not tweet_id or tweet_id not in known_updates:
-                            continue
-
-                        # Get last time this tweet was updated
-                        last_updated = datetime.fromisoformat(recent_updates.get(tweet_id, "1970-01-01T00:00:00"))
-                        if last_updated.tzinfo is None:
-                            last_updated = last_updated.replace(tzinfo=timezone.utc)
-
-                        # Skip if too soon to re-update
-                        if (now - last_updated).total_seconds() < min_update_spacing_seconds:
-                            continue
-
-                        # Extract and save new metrics
-                        metrics = extract_metrics(article)
-                        update_tweet_metrics(tweet_id, metrics)
-                        recent_updates[tweet_id] = now.isoformat()
-                        updated += 1
-                        tweets_to_update.discard(tweet_id)
-
+                        tweets = deck.scan()
                     except Exception as e:
-                        print(f"[UPDATER ERROR] Failed updating #{i}: {e}")
+                        print(f"[UPDATER ERROR] Failed reading the deck: {e}")
+                        tweets = []
+
+                for tweet in tweets:
+                    tweet_id = tweet["id"]
+                    # Skip tweets that aren't due (or were already updated from another column)
+                    if tweet_id not in tweets_to_update:
+                        continue
+                    # Skip if too soon to re-update
+                    if not recent_updates.due(tweet_id, now.timestamp()):
+                        continue
+                    pending.append((tweet_id, tweet["metrics"]))
+                    recent_updates.mark(tweet_id, now.timestamp())
+                    tweets_to_update.discard(tweet_id)
+
+                updated += flush_updates(scheduler, pending)
 
                 # Exit early if all eligible tweets have been updated
                 if not tweets_to_update:
                     break
 
+                deck.scroll()
+                heartbeat.beat()
+                if deck.stalled(max_scroll_stalls):
+                    break
+
+            # Tweets we could not find stay due for the next cycle
+            scheduler.release(tweets_to_update)
+            heartbeat.count("updates", updated)
+
             # Build and conditionally print the summary
             current_summary = f"[SUMMARY] Cycle finished: {updated} tweets updated, {len(tweets_to_update)} still pending, after {scroll_scans} scroll scans."
 
@@ -146,8 +136,8 @@ def updater_engagement_tracker():
                 print(current_summary)
                 last_summary = current_summary
 
-            # Persist updated timestamps
-            save_recent_updates(recent_updates)
+            # Persist only the timestamps that changed this cycle
+            recent_updates.flush(time.time())
 
 if __name__ == "__main__":
     updater_engagement_tracker()
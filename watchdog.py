@@ -1,7 +1,33 @@
-import subprocess
-import time
+from collections import deque
+from logging.handlers import RotatingFileHandler
 import datetime
+import json
+import logging
 import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+
+from browser_host import host_info
+import heartbeat
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+LOG_DIR = os.path.join(BASE_DIR, "logs")
+HEARTBEAT_DIR = os.path.join(LOG_DIR, "heartbeats")
+STATUS_FILE = os.path.join(LOG_DIR, "watchdog_status.json")
+
+POLL_SECONDS = 5
+STARTUP_POLL_SECONDS = 1       # while a child is held back waiting on another's readiness
+STOP_GRACE_SECONDS = 10        # SIGTERM, then kill after this long
+BACKOFF_BASE_SECONDS = 5       # first restart delay, doubled per crash in a row
+BACKOFF_MAX_SECONDS = 300
+HEALTHY_AFTER_SECONDS = 600    # this long up and beating resets the backoff
+READY_TIMEOUT_SECONDS = 120    # start a dependent anyway if its dependencies aren't ready by then
+THROUGHPUT_WINDOW_SECONDS = 300
+CHILD_LOG_BYTES = 5 * 1024 * 1024
+CHILD_LOG_BACKUPS = 3
 
 def log(message):
     timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -10,35 +36,276 @@ def log(message):
     with open("watchdog_basic_log.txt", "a", buffering=1) as f:
         f.write(line + "\n")
 
-def start_process(name, script):
-    log(f"Starting {name}...")
-    return subprocess.Popen(
-        ["python", script],
-        stdout=subprocess.DEVNULL,
-        stderr=subprocess.DEVNULL
-    )
+# One supervised script. A child is unhealthy when it exits, when its
+# heartbeat file (heartbeat.py) is older than `heartbeat_timeout`, or when
+# its `health` check fails for that long. Unhealthy children are stopped and
+# restarted after an exponential backoff; their stdout/stderr go to a
+# rotating log file. A child is ready once its heartbeat carries the "ready"
+# mark (or its health check first passes); children listed in `depends_on`
+# must be ready before this one starts.
+class Child:
+    def __init__(self, name, script, args=(), heartbeat_timeout=180, startup_grace=120, health=None,
+                 depends_on=(), ready_timeout=READY_TIMEOUT_SECONDS, log_dir=LOG_DIR, heartbeat_dir=HEARTBEAT_DIR):
+        self.name = name
+        self.command = [sys.executable, "-u", script, *args]
+        self.heartbeat_timeout = heartbeat_timeout
+        self.startup_grace = startup_grace
+        self.health = health
+        self.depends_on = list(depends_on)
+        self.ready_timeout = ready_timeout
+        self.heartbeat_path = os.path.join(heartbeat_dir, f"{name}.json")
+        self.logger = _child_logger(name, log_dir)
+        self.proc = None
+        self.started_at = None
+        self.last_seen = None
+        self.ready_at = None
+        self.first_tweet_at = None
+        self.waiting_since = None  # when it was due to start but held back by its dependencies
+        self.restarts = 0
+        self.failures = 0          # consecutive, drives the backoff
+        self.next_start = 0.0
+        self.last_reason = None
+        self.samples = deque()     # (time, counters) from this process's heartbeats
 
-def main():
-    # Clean start
-    if os.path.exists("watchdog_basic_log.txt"):
-        os.remove("watchdog_basic_log.txt")
+    @property
+    def running(self):
+        return self.proc is not None and self.proc.poll() is None
+
+    @property
+    def ready(self):
+        return self.running and self.ready_at is not None
+
+    # Names of the dependencies not ready yet
+    def blocked_by(self):
+        return [dep.name for dep in self.depends_on if not dep.ready]
+
+    def start(self):
+        if os.path.exists(self.heartbeat_path):
+            os.remove(self.heartbeat_path)
+        env = dict(os.environ, **{heartbeat.HEARTBEAT_ENV: self.heartbeat_path})
+        self.proc = subprocess.Popen(
+            self.command, cwd=BASE_DIR, env=env,
+            stdout=subprocess.PIPE, stderr=subprocess.STDOUT, stdin=subprocess.DEVNULL,
+            text=True, errors="replace", **_new_process_group())
+        threading.Thread(target=self._pump, args=(self.proc,), daemon=True).start()
+        self.started_at = self.last_seen = time.time()
+        self.ready_at = self.first_tweet_at = None
+        self.waiting_since = None
+        self.samples.clear()
+        log(f"Started {self.name} (pid {self.proc.pid}).")
+
+    def _pump(self, proc):
+        for line in proc.stdout:
+            self.logger.info(line.rstrip("\n"))
+
+    def stop(self):
+        if not self.running:
+            return
+        _signal_group(self.proc, signal.SIGTERM)
+        try:
+            self.proc.wait(STOP_GRACE_SECONDS)
+        except subprocess.TimeoutExpired:
+            _signal_group(self.proc, getattr(signal, "SIGKILL", signal.SIGTERM))
+            self.proc.wait()
 
-    scraper = start_process("scraper.py", "scraper.py")
-    time.sleep(10)  # Give scraper time to start
-    updater = start_process("updater.py", "updater.py")
+    # None if healthy, else why not
+    def check(self, now):
+        if self.proc.poll() is not None:
+            return f"exited with code {self.proc.returncode}"
+        if self.health is not None:
+            if self.health():
+                self.last_seen = now
+                self._marks({"ready": now})
+        else:
+            beat = heartbeat.read(self.heartbeat_path)
+            if beat and beat.get("pid") == self.proc.pid:
+                self.last_seen = max(self.last_seen, beat["time"])
+                self._sample(now, beat.get("counters", {}))
+                self._marks(beat.get("marks", {}))
+        limit = self.heartbeat_timeout
+        if self.last_seen == self.started_at:
+            limit = max(limit, self.startup_grace)  # still launching its browser
+        if now - self.last_seen > limit:
+            return f"no heartbeat for {now - self.last_seen:.0f}s"
+        if self.failures and now - self.started_at >= HEALTHY_AFTER_SECONDS:
+            self.failures = 0
+        return None
 
-    log("Both scraper and updater launched.")
+    def _marks(self, marks):
+        if self.ready_at is None and "ready" in marks:
+            self.ready_at = marks["ready"]
+            log(f"{self.name} ready after {self.ready_at - self.started_at:.1f}s.")
+        if self.first_tweet_at is None and "first_tweet" in marks:
+            self.first_tweet_at = marks["first_tweet"]
 
-    while True:
-        time.sleep(5)
+    def _sample(self, now, counters):
+        if self.samples and self.samples[-1][1] == counters:
+            return
+        self.samples.append((now, counters))
+        while len(self.samples) > 1 and now - self.samples[0][0] > THROUGHPUT_WINDOW_SECONDS:
+            self.samples.popleft()
 
-        if scraper.poll() is not None:
-            log("scraper.py died. Restarting...")
-            scraper = start_process("scraper.py", "scraper.py")
+    # Per-minute rate of each counter over the throughput window
+    def throughput(self, now):
+        if not self.samples:
+            return {}
+        first_time, first = self.samples[0]
+        _, last = self.samples[-1]
+        minutes = max(now - first_time, POLL_SECONDS) / 60
+        return {name: round((value - first.get(name, 0)) / minutes, 1) for name, value in last.items()}
+
+    def fail(self, reason, now):
+        self.last_reason = reason
+        self.stop()
+        delay = min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * 2 ** self.failures)
+        self.failures += 1
+        self.restarts += 1
+        self.next_start = now + delay
+        self.proc = None
+        log(f"{self.name} {reason}. Restarting in {delay}s (restart #{self.restarts}).")
+
+    def status(self, now):
+        if self.running:
+            state = "running" if self.ready_at is not None else "starting"
+        else:
+            state = "blocked" if self.waiting_since is not None else "waiting"
+        return {
+            "pid": self.proc.pid if self.running else None,
+            "state": state,
+            "blocked_by": self.blocked_by() if self.waiting_since is not None else [],
+            "uptime_s": round(now - self.started_at) if self.running else 0,
+            "heartbeat_age_s": round(now - self.last_seen) if self.running else None,
+            "restarts": self.restarts,
+            "consecutive_failures": self.failures,
+            "last_failure": self.last_reason,
+            "next_start_in_s": max(0, round(self.next_start - now)) if not self.running else None,
+            "counters": self.samples[-1][1] if self.samples else {},
+            "per_minute": self.throughput(now),
+            # Startup of the current process: seconds from launch to ready / first tweet
+            "ready_after_s": _since(self.started_at, self.ready_at) if self.running else None,
+            "first_tweet_after_s": _since(self.started_at, self.first_tweet_at) if self.running else None,
+        }
+
+class Supervisor:
+    def __init__(self, children, status_path=STATUS_FILE, poll_seconds=POLL_SECONDS):
+        self.children = children
+        self.status_path = status_path
+        self.poll_seconds = poll_seconds
+        self.stopping = False
+        self.started_at = None
+        self.first_tweet_at = None
+
+    def run(self, duration=None):
+        self.started_at = time.time()
+        deadline = self.started_at + duration if duration else None
+        signal.signal(signal.SIGTERM, lambda *_: setattr(self, "stopping", True))
+        try:
+            while not self.stopping and (deadline is None or time.time() < deadline):
+                self.tick(time.time())
+                waiting = any(child.waiting_since is not None for child in self.children)
+                time.sleep(min(self.poll_seconds, STARTUP_POLL_SECONDS) if waiting else self.poll_seconds)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            for child in reversed(self.children):
+                child.stop()
+            self.write_status(time.time())
+
+    # Children are checked in list order, so list dependencies first: a child
+    # whose dependency became ready this tick starts in the same tick
+    def tick(self, now):
+        for child in self.children:
+            if child.proc is None:
+                if now >= child.next_start and self._may_start(child, now):
+                    child.start()
+                continue
+            reason = child.check(now)
+            if reason:
+                child.fail(reason, now)
+            elif self.first_tweet_at is None and child.first_tweet_at is not None:
+                self.first_tweet_at = child.first_tweet_at
+                log(f"First tweet captured {self.first_tweet_at - self.started_at:.1f}s after startup.")
+        self.write_status(now)
+
+    # Hold a child back until its dependencies are ready, or until it has
+    # waited ready_timeout for them
+    def _may_start(self, child, now):
+        blocked_by = child.blocked_by()
+        if not blocked_by:
+            return True
+        if child.waiting_since is None:
+            child.waiting_since = now
+            log(f"{child.name} waiting for {', '.join(blocked_by)} to be ready.")
+        if now - child.waiting_since < child.ready_timeout:
+            return False
+        log(f"Starting {child.name} without {', '.join(blocked_by)} ready after {child.ready_timeout}s.")
+        return True
+
+    def write_status(self, now):
+        status = {
+            "time": datetime.datetime.now().isoformat(timespec="seconds"),
+            "startup": {
+                "uptime_s": round(now - self.started_at) if self.started_at else 0,
+                "first_tweet_after_s": _since(self.started_at, self.first_tweet_at),
+            },
+            "children": {child.name: child.status(now) for child in self.children},
+        }
+        tmp = f"{self.status_path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(status, f, indent=2)
+        os.replace(tmp, self.status_path)
+
+def _since(start, end):
+    return round(end - start, 1) if start is not None and end is not None else None
+
+def _child_logger(name, log_dir):
+    os.makedirs(log_dir, exist_ok=True)
+    logger = logging.getLogger(f"watchdog.{name}")
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    if not logger.handlers:
+        handler = RotatingFileHandler(os.path.join(log_dir, f"{name}.log"),
+                                      maxBytes=CHILD_LOG_BYTES, backupCount=CHILD_LOG_BACKUPS, encoding="utf-8")
+        handler.setFormatter(logging.Formatter("%(asctime)s %(message)s", "%Y-%m-%d %H:%M:%S"))
+        logger.addHandler(handler)
+    return logger
+
+# Children get their own process group so stopping one also takes down the
+# Playwright driver and Chromium it launched
+def _new_process_group():
+    if os.name == "posix":
+        return {"start_new_session": True}
+    return {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP}
+
+# Signal a child's whole process group. Windows has no group signals, and
+# terminate()/kill() would end only the Python process, leaving its driver
+# and Chromium running; taskkill /T ends the whole tree instead (forcefully,
+# as console processes ignore a polite taskkill).
+def _signal_group(proc, sig):
+    if os.name != "posix":
+        subprocess.run(["taskkill", "/T", "/F", "/PID", str(proc.pid)],
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        return
+    try:
+        os.killpg(proc.pid, sig)
+    except (ProcessLookupError, PermissionError):
+        pass
+
+def main():
+    # Clean start
+    if os.path.exists("watchdog_basic_log.txt"):
+        os.remove("watchdog_basic_log.txt")
+    os.makedirs(HEARTBEAT_DIR, exist_ok=True)
 
-        if updater.poll() is not None:
-            log("updater.py died. Restarting...")
-            updater = start_process("updater.py", "updater.py")
+    # The shared Chromium goes first so scraper and updater attach to it; the
+    # updater waits for the scraper's deck to show its first article. Each
+    # starts as soon as what it needs is ready (or after READY_TIMEOUT_SECONDS,
+    # falling back to its own browser if the host never answers).
+    host = Child("browser_host", "browser_host.py", heartbeat_timeout=60, startup_grace=60,
+                 health=lambda: host_info(timeout=5) is not None)
+    scraper = Child("scraper", "scraper.py", depends_on=[host])
+    updater = Child("updater", "updater.py", depends_on=[scraper])
+    Supervisor([host, scraper, updater]).run()
 
 if __name__ == "__main__":
     main()